@@ -0,0 +1,277 @@
+from array import array
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+
+UNREACHED = -1
+BLOCKED = -1
+CONTESTED = -2
+
+
+@dataclass(slots=True)
+class Window:
+    # The part of the board the scratch arrays cover: everything occupied plus
+    # a free border. Cells outside it are free and reach the window through the
+    # nearest border cell, so their values follow from that cell's.
+    max_x: int
+    max_y: int
+    x0: int
+    y0: int
+    width: int
+    height: int
+    blocked: bytearray = field(default_factory=bytearray, repr=False)
+
+    @classmethod
+    def around(cls, max_x: int, max_y: int, bodies, cells: list[int]) -> "Window":
+        inside = [
+            (x, y)
+            for body in bodies
+            for x, y in body
+            if 0 <= x < max_x and 0 <= y < max_y
+        ]
+        xs = [x for x, _ in inside] + [cell % max_x for cell in cells]
+        ys = [y for _, y in inside] + [cell // max_x for cell in cells]
+        if not xs:
+            return cls(max_x, max_y, 0, 0, 1, 1, bytearray(1))
+        x0, y0 = max(min(xs) - 1, 0), max(min(ys) - 1, 0)
+        width = min(max(xs) + 2, max_x) - x0
+        height = min(max(ys) + 2, max_y) - y0
+        blocked = bytearray(width * height)
+        for x, y in inside:
+            blocked[(y - y0) * width + x - x0] = 1
+        return cls(max_x, max_y, x0, y0, width, height, blocked)
+
+    def contains(self, cell: int) -> bool:
+        x, y = cell % self.max_x - self.x0, cell // self.max_x - self.y0
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def local(self, cell: int) -> int:
+        # The window cell nearest to a board cell.
+        x = min(max(cell % self.max_x - self.x0, 0), self.width - 1)
+        y = min(max(cell // self.max_x - self.y0, 0), self.height - 1)
+        return y * self.width + x
+
+    def offset(self, cell: int) -> int:
+        x, y = cell % self.max_x - self.x0, cell // self.max_x - self.y0
+        return max(-x, 0, x - self.width + 1) + max(-y, 0, y - self.height + 1)
+
+    def neighbours(self, cell: int) -> list[int]:
+        width = self.width
+        x = cell % width
+        found = []
+        if x > 0:
+            found.append(cell - 1)
+        if x < width - 1:
+            found.append(cell + 1)
+        if cell >= width:
+            found.append(cell - width)
+        if cell < len(self.blocked) - width:
+            found.append(cell + width)
+        return found
+
+    def border(self) -> Iterator[tuple[int, int]]:
+        # Window cells paired with how many outside cells lie nearest to them.
+        left, top = self.x0, self.y0
+        right = self.max_x - self.x0 - self.width
+        bottom = self.max_y - self.y0 - self.height
+        if not (left or right or top or bottom):
+            return
+        width, height = self.width, self.height
+        for y in range(height):
+            rows = 1 + (top if y == 0 else 0) + (bottom if y == height - 1 else 0)
+            for x in range(width) if rows > 1 else {0, width - 1}:
+                columns = 1 + (left if x == 0 else 0) + (right if x == width - 1 else 0)
+                if rows * columns > 1:
+                    yield y * width + x, rows * columns - 1
+
+
+class BoardField(Sequence):
+    # Per-cell values for the whole board, backed by window-sized storage.
+    __slots__ = ("values", "window", "grows")
+
+    def __init__(self, values, window: Window, grows: bool = False) -> None:
+        self.values = values
+        self.window = window
+        # Distances keep growing past the window; labels and flags do not.
+        self.grows = grows
+
+    def __getitem__(self, cell: int) -> int:
+        if not 0 <= cell < len(self):
+            raise IndexError(cell)
+        value = self.values[self.window.local(cell)]
+        if self.grows and value >= 0:
+            value += self.window.offset(cell)
+        return value
+
+    def __len__(self) -> int:
+        return self.window.max_x * self.window.max_y
+
+
+@dataclass(slots=True)
+class BoardAnalysis:
+    max_x: int
+    max_y: int
+    # Snapshot of every body, so the board is only rasterised when needed.
+    bodies: tuple[tuple[tuple[int, int], ...], ...]
+    heads: list[int]
+    food_cells: list[int]
+    version: int = 0
+    fields: dict[tuple[int, ...], BoardField] = field(default_factory=dict, repr=False)
+    labels: BoardField | None = field(default=None, repr=False)
+    sizes: list[int] | None = field(default=None, repr=False)
+    territory: list[int] | None = field(default=None, repr=False)
+    _window: Window | None = field(default=None, repr=False)
+
+    @classmethod
+    def of(cls, game, version: int = 0) -> "BoardAnalysis":
+        max_x, max_y = game.max_x, game.max_y
+        bodies = tuple(tuple(snake.positions) for snake in game.snakes)
+        heads = []
+        for body in bodies:
+            x, y = body[0]
+            heads.append(y * max_x + x if 0 <= x < max_x and 0 <= y < max_y else -1)
+        food_cells = sorted(y * max_x + x for x, y in game.foods)
+        return cls(max_x, max_y, bodies, heads, food_cells, version)
+
+    @property
+    def window(self) -> Window:
+        if self._window is None:
+            self._window = Window.around(
+                self.max_x, self.max_y, self.bodies, self.food_cells
+            )
+        return self._window
+
+    @property
+    def blocked(self) -> BoardField:
+        return BoardField(self.window.blocked, self.window)
+
+    def cell(self, position: tuple[int, int]) -> int | None:
+        x, y = position
+        if 0 <= x < self.max_x and 0 <= y < self.max_y:
+            return y * self.max_x + x
+        return None
+
+    def distance_field(self, sources: list[int]) -> BoardField:
+        # Sources may be blocked (heads); the search only expands into free cells.
+        key = tuple(sorted(set(cell for cell in sources if cell >= 0)))
+        distances = self.fields.get(key)
+        if distances is not None:
+            return distances
+        window = self.window
+        if not all(window.contains(cell) for cell in key):
+            # A far source widens this search only; the shared window stays small.
+            window = Window.around(
+                self.max_x, self.max_y, self.bodies, self.food_cells + list(key)
+            )
+        blocked = window.blocked
+        distances = array("i", [UNREACHED]) * len(blocked)
+        queue = array("i", (window.local(cell) for cell in key))
+        for cell in queue:
+            distances[cell] = 0
+        head = 0
+        while head < len(queue):
+            cell = queue[head]
+            head += 1
+            step = distances[cell] + 1
+            for neighbour in window.neighbours(cell):
+                if distances[neighbour] == UNREACHED and not blocked[neighbour]:
+                    distances[neighbour] = step
+                    queue.append(neighbour)
+        self.fields[key] = BoardField(distances, window, grows=True)
+        return self.fields[key]
+
+    def distances_from(self, position: tuple[int, int]) -> BoardField:
+        cell = self.cell(position)
+        return self.distance_field([] if cell is None else [cell])
+
+    def food_distances(self) -> BoardField:
+        return self.distance_field(self.food_cells)
+
+    def distance(self, start: tuple[int, int], end: tuple[int, int]) -> int:
+        cell = self.cell(end)
+        return UNREACHED if cell is None else self.distances_from(start)[cell]
+
+    def components(self) -> tuple[BoardField, list[int]]:
+        if self.labels is not None:
+            return self.labels, self.sizes
+        window = self.window
+        blocked = window.blocked
+        labels = array("i", [BLOCKED]) * len(blocked)
+        sizes = []
+        queue = array("i")
+        for start in range(len(blocked)):
+            if blocked[start] or labels[start] != BLOCKED:
+                continue
+            label = len(sizes)
+            labels[start] = label
+            del queue[:]
+            queue.append(start)
+            head = 0
+            while head < len(queue):
+                for neighbour in window.neighbours(queue[head]):
+                    if not blocked[neighbour] and labels[neighbour] == BLOCKED:
+                        labels[neighbour] = label
+                        queue.append(neighbour)
+                head += 1
+            sizes.append(len(queue))
+        for cell, outside in window.border():
+            sizes[labels[cell]] += outside
+        self.labels, self.sizes = BoardField(labels, window), sizes
+        return self.labels, sizes
+
+    def reachable_area(self, position: tuple[int, int]) -> int:
+        # Free cells reachable from position, summed over the distinct
+        # components it touches when the position itself is occupied.
+        cell = self.cell(position)
+        if cell is None:
+            return 0
+        labels, sizes = self.components()
+        if labels[cell] != BLOCKED:
+            return sizes[labels[cell]]
+        # Occupied cells lie inside the window, and so do their neighbours.
+        window = self.window
+        neighbours = window.neighbours(window.local(cell))
+        touched = {labels.values[n] for n in neighbours} - {BLOCKED}
+        return sum(sizes[label] for label in touched)
+
+    def voronoi(self) -> list[int]:
+        # Free cells each snake reaches strictly first, in game.snakes order.
+        if self.territory is not None:
+            return self.territory
+        window = self.window
+        blocked = window.blocked
+        owner = array("i", [BLOCKED]) * len(blocked)
+        queue = array("i")
+        for snake, cell in enumerate(self.heads):
+            if cell < 0:
+                continue
+            cell = window.local(cell)
+            if owner[cell] == BLOCKED:
+                owner[cell] = snake
+                queue.append(cell)
+            else:
+                owner[cell] = CONTESTED
+        territory = [0] * len(self.heads)
+        head = 0
+        while head < len(queue):
+            level_end = len(queue)
+            claims = {}
+            while head < level_end:
+                cell = queue[head]
+                head += 1
+                # Contested cells keep spreading so ties stay ties further out.
+                claimant = owner[cell]
+                for neighbour in window.neighbours(cell):
+                    if owner[neighbour] == BLOCKED and not blocked[neighbour]:
+                        if claims.setdefault(neighbour, claimant) != claimant:
+                            claims[neighbour] = CONTESTED
+            for cell, claimant in claims.items():
+                owner[cell] = claimant
+                queue.append(cell)
+                if claimant >= 0:
+                    territory[claimant] += 1
+        # Outside cells are closest to whoever owns their nearest border cell.
+        for cell, outside in window.border():
+            if owner[cell] >= 0:
+                territory[owner[cell]] += outside
+        self.territory = territory
+        return territory
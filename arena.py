@@ -0,0 +1,47 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from snake import Snake
+
+
+@dataclass
+class CellTable:
+    max_x: int
+    max_y: int
+    cells: list[tuple[int, int]] = field(default_factory=list, repr=False)
+
+    def __post_init__(self) -> None:
+        self.cells = [(x, y) for y in range(self.max_y) for x in range(self.max_x)]
+
+    def __deepcopy__(self, memo) -> "CellTable":
+        return self
+
+    def at(self, x: int, y: int) -> tuple[int, int]:
+        if 0 <= x < self.max_x and 0 <= y < self.max_y:
+            return self.cells[y * self.max_x + x]
+        return x, y
+
+    def intern(self, position: tuple[int, int]) -> tuple[int, int]:
+        return self.at(*position)
+
+
+@dataclass
+class SnakePool:
+    free: list[Snake] = field(default_factory=list, repr=False)
+    created: int = 0
+
+    def acquire(
+        self, positions: Iterable[tuple[int, int]], interner: CellTable | None = None
+    ) -> Snake:
+        if interner is not None:
+            positions = [interner.intern(position) for position in positions]
+        if self.free:
+            snake = self.free.pop()
+            snake.reset(positions)
+        else:
+            snake = Snake(positions)
+            self.created += 1
+        snake.interner = interner
+        return snake
+
+    def release(self, snake: Snake) -> None:
+        self.free.append(snake)
@@ -0,0 +1,144 @@
+from dataclasses import dataclass, field
+import numpy as np
+from snake import MOVE_OFFSETS, Snake
+from snakey_game import SnakeyGame
+
+DELTAS = np.array(MOVE_OFFSETS, dtype=np.int32)
+
+
+@dataclass
+class BatchSnakeyGame:
+    num_games: int
+    num_players: int
+    max_x: int
+    max_y: int
+    # Ring buffer length per body; growth past it is dropped.
+    capacity: int = 0
+    bodies: np.ndarray = field(default=None, repr=False)
+    starts: np.ndarray = field(default=None, repr=False)
+    lengths: np.ndarray = field(default=None, repr=False)
+    previous: np.ndarray = field(default=None, repr=False)
+    alive: np.ndarray = field(default=None, repr=False)
+    ranks: np.ndarray = field(default=None, repr=False)
+    done: np.ndarray = field(default=None, repr=False)
+    foods: np.ndarray = field(default=None, repr=False)
+    cells: np.ndarray = field(default=None, repr=False)
+    owners: np.ndarray = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        n, p = self.num_games, self.num_players
+        if not self.capacity:
+            self.capacity = self.max_x * self.max_y
+        self.bodies = np.zeros((n, p, self.capacity, 2), dtype=np.int32)
+        self.starts = np.zeros((n, p), dtype=np.int32)
+        self.lengths = np.zeros((n, p), dtype=np.int32)
+        self.previous = np.full((n, p, 2), -1, dtype=np.int32)
+        self.alive = np.zeros((n, p), dtype=bool)
+        self.ranks = np.zeros((n, p), dtype=np.int32)
+        self.done = np.zeros(n, dtype=bool)
+        self.foods = np.zeros((n, self.max_x, self.max_y), dtype=bool)
+        self.cells = np.zeros((n, p, self.max_x, self.max_y), dtype=np.uint16)
+        self.owners = np.zeros((n, self.max_x, self.max_y), dtype=np.int16)
+
+    @classmethod
+    def from_games(cls, games: list[SnakeyGame], capacity: int = 0):
+        first = games[0]
+        batch = cls(len(games), len(first.snakes), first.max_x, first.max_y, capacity)
+        for n, game in enumerate(games):
+            for p, snake in enumerate(game.snakes):
+                batch.place_snake(n, p, snake.positions)
+            for x, y in game.foods:
+                batch.foods[n, x, y] = True
+        batch.done = batch.alive.sum(axis=1) <= 1
+        return batch
+
+    def to_game(self, n: int) -> SnakeyGame:
+        game = SnakeyGame(self.max_x, self.max_y)
+        for p in np.flatnonzero(self.alive[n]):
+            game.add_snake(Snake(self.snake_positions(n, p)))
+        game.foods = {(int(x), int(y)) for x, y in np.argwhere(self.foods[n])}
+        return game
+
+    def spawn(self, rng: np.random.Generator, foods: int = 0) -> None:
+        count = self.num_players + foods
+        order = np.argsort(rng.random((self.num_games, self.max_x * self.max_y)))
+        xs, ys = np.divmod(order[:, :count], self.max_y)
+        for p in range(self.num_players):
+            for n in range(self.num_games):
+                self.place_snake(n, p, [(xs[n, p], ys[n, p])])
+        games = np.repeat(np.arange(self.num_games), foods)
+        self.foods[
+            games, xs[:, self.num_players :].ravel(), ys[:, self.num_players :].ravel()
+        ] = True
+        self.done = self.alive.sum(axis=1) <= 1
+
+    def place_snake(self, n: int, p: int, positions) -> None:
+        positions = np.asarray(list(positions), dtype=np.int32).reshape(-1, 2)
+        self.bodies[n, p, : len(positions)] = positions
+        self.starts[n, p] = 0
+        self.lengths[n, p] = len(positions)
+        self.alive[n, p] = True
+        for x, y in positions:
+            if not self.cells[n, p, x, y]:
+                self.owners[n, x, y] += 1
+            self.cells[n, p, x, y] += 1
+
+    def snake_positions(self, n: int, p: int) -> list[tuple[int, int]]:
+        slots = (self.starts[n, p] + np.arange(self.lengths[n, p])) % self.capacity
+        return [(int(x), int(y)) for x, y in self.bodies[n, p, slots]]
+
+    def step(self, moves: np.ndarray) -> np.ndarray:
+        n, p = np.nonzero(self.alive & ~self.done[:, None])
+        if not len(n):
+            return np.zeros_like(self.alive)
+        starts, lengths = self.starts[n, p], self.lengths[n, p]
+
+        heads = self.bodies[n, p, starts] + DELTAS[np.asarray(moves)[n, p]]
+        tails = self.bodies[n, p, (starts + lengths - 1) % self.capacity]
+        self.cells[n, p, tails[:, 0], tails[:, 1]] -= 1
+        freed = self.cells[n, p, tails[:, 0], tails[:, 1]] == 0
+        np.subtract.at(self.owners, (n[freed], tails[freed, 0], tails[freed, 1]), 1)
+        starts = (starts - 1) % self.capacity
+        self.starts[n, p] = starts
+        self.bodies[n, p, starts] = heads
+        self.previous[n, p] = tails
+
+        inside = (
+            (heads[:, 0] >= 0)
+            & (heads[:, 0] < self.max_x)
+            & (heads[:, 1] >= 0)
+            & (heads[:, 1] < self.max_y)
+        )
+        n_in, p_in, heads_in = n[inside], p[inside], heads[inside]
+        self._occupy(n_in, p_in, heads_in)
+
+        ate = self.foods[n_in, heads_in[:, 0], heads_in[:, 1]]
+        ate &= self.lengths[n_in, p_in] < self.capacity
+        n_ate, p_ate = n_in[ate], p_in[ate]
+        self.lengths[n_ate, p_ate] += 1
+        self._occupy(n_ate, p_ate, self.previous[n_ate, p_ate])
+        self.previous[n_ate, p_ate] = -1
+
+        dead = np.zeros_like(self.alive)
+        dead[n[~inside], p[~inside]] = True
+        contested = self.owners[n_in, heads_in[:, 0], heads_in[:, 1]] > 1
+        n_hit, heads_hit = n_in[contested], heads_in[contested]
+        hit = self.cells[n_hit, :, heads_hit[:, 0], heads_hit[:, 1]] > 0
+        rows, players = np.nonzero(hit)
+        dead[n_hit[rows], players] = True
+
+        self.ranks[dead] = np.broadcast_to(
+            self.alive.sum(axis=1, keepdims=True) + 1, dead.shape
+        )[dead]
+        n_dead, p_dead = np.nonzero(dead)
+        np.subtract.at(self.owners, n_dead, self.cells[n_dead, p_dead] > 0)
+        self.cells[n_dead, p_dead] = 0
+        self.alive &= ~dead
+        self.done |= self.alive.sum(axis=1) <= 1
+        return dead
+
+    def _occupy(self, n: np.ndarray, p: np.ndarray, positions: np.ndarray) -> None:
+        xs, ys = positions[:, 0], positions[:, 1]
+        claimed = self.cells[n, p, xs, ys] == 0
+        self.cells[n, p, xs, ys] += 1
+        np.add.at(self.owners, (n[claimed], xs[claimed], ys[claimed]), 1)
@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import argparse
+import gc
+import tracemalloc
+from time import perf_counter
+from scenarios import SurvivorPlayer
+from arena import CellTable, SnakePool
+from game_master import GameMaster
+from snakey_game import SnakeyGame
+
+
+def play(game_master: GameMaster, players: int, ticks: int) -> None:
+    game_master.game.add_food(5)
+    for i in range(players):
+        game_master.add_player(SurvivorPlayer(i))
+    for _ in range(ticks):
+        if len(game_master.active_players) <= 1:
+            break
+        game_master.tick()
+
+
+def fresh(size: int, players: int, ticks: int):
+    def run(seed: int) -> None:
+        game = SnakeyGame(size, size)
+        game.seed(seed)
+        play(GameMaster(game), players, ticks)
+
+    return run
+
+
+def arena(size: int, players: int, ticks: int):
+    game = SnakeyGame(size, size, cell_table=CellTable(size, size))
+    game_master = GameMaster(game, snake_pool=SnakePool())
+
+    def run(seed: int) -> None:
+        game_master.reset(seed=seed)
+        play(game_master, players, ticks)
+
+    return run
+
+
+def measure(run, games: int) -> dict:
+    run(0)
+    collections = sum(stat["collections"] for stat in gc.get_stats())
+    tracemalloc.start()
+    start = perf_counter()
+    for seed in range(1, games + 1):
+        run(seed)
+    seconds = perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "per_game": seconds / games,
+        "gc_collections": sum(stat["collections"] for stat in gc.get_stats())
+        - collections,
+        "peak_bytes": peak,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare fresh games with reset")
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--size", type=int, default=11)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--ticks", type=int, default=20)
+    args = parser.parse_args(argv)
+    for name, factory in (("fresh", fresh), ("arena", arena)):
+        result = measure(factory(args.size, args.players, args.ticks), args.games)
+        print(
+            f"{name:6} {result['per_game'] * 1e6:9.1f} us/game"
+            f" gc {result['gc_collections']:6}"
+            f" peak {result['peak_bytes'] / 1e3:8.1f} kB"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import pytest
+from scenarios import CASES, prepare, scenarios
+
+
+@pytest.mark.parametrize("scenario", scenarios(quick=True), ids=lambda s: s.key)
+@pytest.mark.parametrize("case", CASES)
+def test_tick_pipeline(benchmark, case, scenario):
+    make = prepare(case, scenario)
+    benchmark.pedantic(
+        lambda operation: operation(), setup=lambda: ((make(),), {}), rounds=20
+    )
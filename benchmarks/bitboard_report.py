@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import argparse
+import json
+import tracemalloc
+from copy import deepcopy
+from statistics import median
+from time import perf_counter
+from scenarios import Scenario, build_game_master
+from bitboard import BitboardSnakeyGame
+from snakey_game import SnakeyGame
+
+BACKENDS = {"list": SnakeyGame, "bitboard": BitboardSnakeyGame}
+SCENARIOS = (
+    Scenario(200, 50, 50),
+    Scenario(200, 100, 200),
+    Scenario(500, 200, 125),
+    Scenario(1000, 200, 250),
+)
+
+
+def timed(operation, repeats: int = 5) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = perf_counter()
+        operation()
+        timings.append(perf_counter() - start)
+    return median(timings)
+
+
+def measure(scenario: Scenario, game_class: type[SnakeyGame]) -> dict:
+    tracemalloc.start()
+    game_master = build_game_master(scenario, game_class=game_class)
+    _, peak = tracemalloc.get_traced_memory()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    game = game_master.game
+    return {
+        "memory_bytes": current,
+        "peak_bytes": peak,
+        "get_dead_snakes": timed(game.get_dead_snakes),
+        "count_empty_spaces": timed(game.count_empty_spaces),
+        "random_empty_space": timed(game.random_empty_space),
+        "add_food": timed(lambda: deepcopy(game).add_food(10), repeats=1),
+        "tick": timed(deepcopy(game_master).tick, repeats=1),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare board backends")
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+    report = {}
+    for scenario in SCENARIOS:
+        for name, game_class in BACKENDS.items():
+            result = measure(scenario, game_class)
+            report[f"{name}/{scenario.key}"] = result
+            print(
+                f"{name:9} {scenario.key:22}"
+                f" mem {result['memory_bytes'] / 1e6:8.2f} MB"
+                f" dead {result['get_dead_snakes'] * 1e6:9.1f} us"
+                f" count {result['count_empty_spaces'] * 1e6:9.1f} us"
+                f" sample {result['random_empty_space'] * 1e6:7.1f} us"
+                f" tick {result['tick'] * 1e3:7.2f} ms"
+            )
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
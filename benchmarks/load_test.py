@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import argparse
+import asyncio
+from scenarios import SurvivorPlayer
+from server import load_test
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the game host")
+    parser.add_argument("--games", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--size", type=int, default=11)
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--tick-rate", type=float)
+    parser.add_argument("--time-limit", type=float)
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(
+        load_test(
+            args.games,
+            SurvivorPlayer,
+            args.players,
+            args.size,
+            args.size,
+            args.ticks,
+            args.tick_rate,
+            args.time_limit,
+        )
+    )
+    print(f"{'games':>6} {'ticks':>8} {'ticks/s':>10} {'p99 ms':>9} {'late':>6}")
+    for result in results:
+        print(
+            f"{result.games:>6} {result.ticks:>8} {result.ticks_per_second:>10.1f} "
+            f"{result.p99_latency * 1e3:>9.2f} {result.late_ticks:>6}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import argparse
+import tracemalloc
+from scenarios import Scenario, build_game_master
+from compact import CompactGame
+
+SCENARIOS = (
+    Scenario(11, 4, 3),
+    Scenario(19, 8, 10),
+    Scenario(50, 20, 40),
+)
+
+
+def traced(build) -> tuple[int, object]:
+    tracemalloc.start()
+    built = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, built
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare game model memory")
+    parser.add_argument("--games", type=int, default=200)
+    args = parser.parse_args(argv)
+    for scenario in SCENARIOS:
+        dataclasses, masters = traced(
+            lambda: [build_game_master(scenario, seed) for seed in range(args.games)]
+        )
+        compact, _ = traced(
+            lambda: [CompactGame.from_game_master(master) for master in masters]
+        )
+        print(
+            f"{scenario.key:22}"
+            f" dataclass {dataclasses / args.games / 1e3:8.1f} kB/game"
+            f" compact {compact / args.games / 1e3:8.1f} kB/game"
+            f" ratio {dataclasses / compact:5.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
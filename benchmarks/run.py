@@ -0,0 +1,132 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import argparse
+import gc
+import json
+import platform
+from statistics import median
+from time import perf_counter
+from scenarios import CASES, Scenario, prepare, scenarios
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+RETRIES = 3
+BASELINE_RUNS = 3
+
+
+def measure(case: str, scenario: Scenario, repeats: int) -> float:
+    # The fastest run is the least disturbed sample, so it is kept rather
+    # than the median, which picks up scheduler and cache noise.
+    make = prepare(case, scenario)
+    make()()
+    timings = []
+    for _ in range(repeats):
+        operation = make()
+        # As in timeit, collections are kept out of the timed region.
+        gc.disable()
+        start = perf_counter()
+        operation()
+        timings.append(perf_counter() - start)
+        gc.enable()
+    return min(timings)
+
+
+def run(quick: bool, repeats: int, cases: list[str]) -> dict:
+    results = {}
+    for scenario in scenarios(quick):
+        for case in cases:
+            seconds = measure(case, scenario, repeats)
+            results[f"{case}/{scenario.key}"] = {
+                "case": case,
+                "size": scenario.size,
+                "snakes": scenario.snakes,
+                "length": scenario.length,
+                "seconds": seconds,
+            }
+            print(f"{case:20} {scenario.key:22} {seconds * 1e6:12.1f} us")
+    return {"python": platform.python_version(), "results": results}
+
+
+def slowdowns(current: dict, baseline: dict) -> dict[str, float]:
+    # Each case's slowdown is divided by the median slowdown of the whole
+    # run, so a faster or slower machine than the baseline's cancels out and
+    # only cases that moved relative to the rest of the suite stand out.
+    ratios = {
+        key: result["seconds"] / baseline["results"][key]["seconds"]
+        for key, result in current["results"].items()
+        if key in baseline["results"]
+    }
+    if not ratios:
+        return {}
+    machine = median(ratios.values())
+    return {key: ratio / machine for key, ratio in ratios.items()}
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    return [
+        f"{key}: {ratio:.2f}x slower than baseline"
+        for key, ratio in slowdowns(current, baseline).items()
+        if ratio > tolerance
+    ]
+
+
+def confirm(current: dict, baseline: dict, tolerance: float, repeats: int) -> None:
+    # Noise shows up as one slow measurement, a regression as every one, so
+    # flagged cases are measured again and keep their fastest time.
+    for _ in range(RETRIES):
+        flagged = [
+            key
+            for key, ratio in slowdowns(current, baseline).items()
+            if ratio > tolerance
+        ]
+        if not flagged:
+            return
+        for key in flagged:
+            result = current["results"][key]
+            scenario = Scenario(result["size"], result["snakes"], result["length"])
+            seconds = measure(result["case"], scenario, repeats)
+            result["seconds"] = min(result["seconds"], seconds)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the tick pipeline against a recorded baseline",
+        epilog="CI runs this as: python benchmarks/run.py --quick",
+    )
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--repeats", type=int, default=15)
+    parser.add_argument("--case", action="append", choices=CASES)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=2.0)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    current = run(args.quick, args.repeats, args.case or list(CASES))
+    if args.update_baseline:
+        # A lucky fast baseline would flag every later run, so the recorded
+        # time is the median over several runs.
+        runs = [current] + [
+            run(args.quick, args.repeats, args.case or list(CASES))
+            for _ in range(BASELINE_RUNS - 1)
+        ]
+        for key, result in current["results"].items():
+            result["seconds"] = median(r["results"][key]["seconds"] for r in runs)
+        args.baseline.write_text(json.dumps(current, indent=2))
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline")
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    confirm(current, baseline, args.tolerance, args.repeats)
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2))
+    regressions = compare(current, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from collections.abc import Callable
+from copy import deepcopy
+from dataclasses import dataclass
+from itertools import cycle
+from random import Random
+from game_master import GameMaster
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+
+SIZES = (10, 50, 200, 500)
+SNAKE_COUNTS = (2, 20, 200)
+QUICK_SIZES = (10, 50)
+QUICK_SNAKE_COUNTS = (2, 20)
+LOOP = (GameMove.UP, GameMove.RIGHT, GameMove.DOWN, GameMove.LEFT)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    size: int
+    snakes: int
+    length: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.size}x{self.size}/{self.snakes}s/{self.length}l"
+
+
+class SurvivorPlayer:
+    def __init__(self, id=None):
+        self.id = id
+
+    def move(self, game, snake) -> GameMove:
+        valid_moves = game.get_valid_moves(snake)
+        return valid_moves[0] if valid_moves else GameMove.UP
+
+
+def scenarios(quick: bool = False) -> list[Scenario]:
+    sizes = QUICK_SIZES if quick else SIZES
+    counts = QUICK_SNAKE_COUNTS if quick else SNAKE_COUNTS
+    found = []
+    for size in sizes:
+        for count in counts:
+            if count > size // 2:
+                continue
+            for length in sorted({1, max(size // 4, 1), size}):
+                found.append(Scenario(size, count, length))
+    return found
+
+
+def build_game_master(
+    scenario: Scenario, seed: int = 0, game_class: type[SnakeyGame] = SnakeyGame
+) -> GameMaster:
+    game = game_class(scenario.size, scenario.size, rng=Random(seed))
+    game_master = GameMaster(game)
+    spacing = scenario.size // scenario.snakes
+    for i in range(scenario.snakes):
+        y = i * spacing
+        positions = [(x, y) for x in reversed(range(scenario.length))]
+        game_master.add_player(SurvivorPlayer(i), Snake(positions))
+    game.add_food(scenario.size)
+    game.get_dead_snakes()
+    return game_master
+
+
+def prepare(case: str, scenario: Scenario) -> Callable[[], Callable[[], object]]:
+    template = build_game_master(scenario)
+
+    def fresh() -> GameMaster:
+        return deepcopy(template)
+
+    def tick():
+        game_master = fresh()
+        return game_master.tick
+
+    def dead_snakes():
+        return template.game.get_dead_snakes
+
+    def empty_spaces():
+        return template.game.update_empty_spaces
+
+    def valid_moves():
+        game = template.game
+        return lambda: [game.get_valid_moves(snake) for snake in game.snakes]
+
+    def add_food():
+        return fresh().game.add_food
+
+    def snake_move():
+        snake = Snake(list(template.game.snakes[0].positions))
+        moves = cycle(LOOP)
+        return lambda: snake.move(next(moves))
+
+    return {
+        "tick": tick,
+        "get_dead_snakes": dead_snakes,
+        "update_empty_spaces": empty_spaces,
+        "get_valid_moves": valid_moves,
+        "add_food": add_food,
+        "snake_move": snake_move,
+    }[case]
+
+
+CASES = (
+    "tick",
+    "get_dead_snakes",
+    "update_empty_spaces",
+    "get_valid_moves",
+    "add_food",
+    "snake_move",
+)
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import argparse
+import json
+from functools import partial
+from soak import MEGABYTE, SoakThresholds, random_game, soak
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Soak test long simulations")
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    parser.add_argument("--sample-every", type=int, default=50_000)
+    parser.add_argument("--warmup", type=int, default=10_000)
+    parser.add_argument("--size", type=int, default=11)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--rss-growth-mb", type=float, default=64)
+    parser.add_argument("--traced-growth-mb", type=float, default=16)
+    parser.add_argument("--latency-drift", type=float, default=2.0)
+    parser.add_argument("--no-trace", action="store_true")
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    report = soak(
+        args.ticks,
+        partial(random_game, size=args.size, players=args.players),
+        args.sample_every,
+        args.warmup,
+        SoakThresholds(
+            int(args.rss_growth_mb * MEGABYTE),
+            int(args.traced_growth_mb * MEGABYTE),
+            args.latency_drift,
+        ),
+        trace=not args.no_trace,
+    )
+    print(f"{'tick':>10} {'games':>7} {'rss MB':>9} {'traced MB':>10} {'mean us':>9}")
+    for sample in report.samples:
+        print(
+            f"{sample.tick:>10} {sample.games:>7} {sample.rss / MEGABYTE:>9.1f} "
+            f"{sample.traced / MEGABYTE:>10.2f} {sample.latency.mean * 1e6:>9.1f}"
+        )
+    for allocator in report.top_allocators:
+        print(allocator)
+    if args.output:
+        args.output.write_text(json.dumps(report.to_dict(), indent=2))
+    for failure in report.failures:
+        print(f"FAILED {failure}")
+    return 0 if report.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+from array import array
+from dataclasses import dataclass, field
+from occupancy_grid import OccupancyGrid
+from snakey_game import SnakeyGame
+
+REJECTION_TRIES = 64
+
+
+@dataclass
+class BitboardGrid(OccupancyGrid):
+    # Owner counts are 2-byte cells and the occupied set is one big int, which
+    # is far smaller than the list backend on large boards. Updating a big int
+    # copies it, so cells that change are only folded into occupied when it is
+    # read; moves and collision checks never touch it.
+    occupied: int = 0
+    filled: int = 0
+    dirty: set[int] = field(default_factory=set, repr=False)
+
+    def __post_init__(self) -> None:
+        if not self.owners:
+            self.owners = array("H", bytes(2 * self.max_x * self.max_y))
+
+    def __deepcopy__(self, memo) -> "BitboardGrid":
+        def rekey(key: int) -> int:
+            return id(memo[key]) if key in memo else key
+
+        copy = BitboardGrid(
+            self.max_x,
+            self.max_y,
+            array("H", self.owners),
+            set(self.shared),
+            {rekey(key): count for key, count in self.out_of_bounds.items()},
+            {rekey(key) for key in self.malformed},
+            self.occupied,
+            self.filled,
+            set(self.dirty),
+        )
+        memo[id(self)] = copy
+        return copy
+
+    def _claim(self, cell: int) -> bool:
+        if super()._claim(cell):
+            self.filled += 1
+            self.dirty.add(cell)
+            return True
+        return False
+
+    def _release(self, cell: int) -> bool:
+        if super()._release(cell):
+            self.filled -= 1
+            self.dirty.add(cell)
+            return True
+        return False
+
+    def occupied_board(self) -> int:
+        if self.dirty:
+            # One pass over a byte buffer instead of a big-int copy per cell.
+            added = bytearray((self.max_x * self.max_y + 7) // 8)
+            removed = bytearray(len(added))
+            for cell in self.dirty:
+                bits = added if self.owners[cell] else removed
+                bits[cell >> 3] |= 1 << (cell & 7)
+            self.occupied = (
+                self.occupied | int.from_bytes(added, "little")
+            ) & ~int.from_bytes(removed, "little")
+            self.dirty.clear()
+        return self.occupied
+
+
+@dataclass
+class BitboardSnakeyGame(SnakeyGame):
+    # Trades speed for memory: ticks run at about the list backend's pace in a
+    # tenth of the memory on large boards, but listing empty cells builds the
+    # bitboard first. SnakeyGame stays the default; pass this as game_class.
+    food_board: int = field(default=0, repr=False, compare=False)
+    empty_board: int | None = field(default=None, repr=False, compare=False)
+    # Foods on unoccupied cells, so counting empty cells needs no scan.
+    exposed_foods: int = field(default=0, repr=False, compare=False)
+
+    def reset(
+        self,
+        max_x: int | None = None,
+        max_y: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        super().reset(max_x, max_y, seed)
+        self.food_board = 0
+        self._stale()
+
+    def _new_occupancy(self) -> BitboardGrid:
+        return BitboardGrid(self.max_x, self.max_y)
+
+    def _cell(self, position: tuple[int, int]) -> int | None:
+        x, y = position
+        if 0 <= x < self.max_x and 0 <= y < self.max_y:
+            return y * self.max_x + x
+        return None
+
+    def get_empty_board(self) -> int:
+        if self.empty_spaces_changed:
+            self._rebuild_empty_spaces()
+        if self.empty_board is None:
+            full = (1 << self.max_x * self.max_y) - 1
+            occupied = self.get_occupancy().occupied_board()
+            self.empty_board = full & ~(occupied | self.food_board)
+        return self.empty_board
+
+    def update_empty_spaces(self) -> None:
+        occupancy = self.get_occupancy()
+        self.food_board = 0
+        self.exposed_foods = 0
+        for food in self.foods:
+            cell = self._cell(food)
+            if cell is not None:
+                self.food_board |= 1 << cell
+                self.exposed_foods += not occupancy.owners[cell]
+        self._stale()
+        self.empty_spaces_changed = False
+
+    def _stale(self) -> None:
+        self.empty_spaces = None
+        self.empty_board = None
+
+    def get_empty_spaces(self) -> list[tuple[int, int]]:
+        board = self.get_empty_board()
+        if self.empty_spaces is None:
+            bits = bin(board)[:1:-1]
+            self.empty_spaces = []
+            cell = bits.find("1")
+            while cell != -1:
+                self.empty_spaces.append((cell % self.max_x, cell // self.max_x))
+                cell = bits.find("1", cell + 1)
+        return self.empty_spaces
+
+    def count_empty_spaces(self) -> int:
+        if self.empty_spaces_changed:
+            self._rebuild_empty_spaces()
+        filled = self.get_occupancy().filled
+        return self.max_x * self.max_y - filled - self.exposed_foods
+
+    def random_empty_space(self) -> tuple[int, int]:
+        occupancy = self.get_occupancy()
+        owners, foods = occupancy.owners, self.foods
+        for _ in range(REJECTION_TRIES):
+            cell = self.rng.randrange(self.max_x * self.max_y)
+            position = cell % self.max_x, cell // self.max_x
+            if not owners[cell] and position not in foods:
+                return position
+        spaces = self.get_empty_spaces()
+        if not spaces:
+            raise IndexError("Cannot choose from an empty board")
+        return self.rng.choice(spaces)
+
+    def sample_empty_spaces(self, count: int) -> list[tuple[int, int]]:
+        spaces = self.get_empty_spaces()
+        return self.rng.sample(spaces, k=min(count, len(spaces)))
+
+    def _take_spaces(self, positions: list[tuple[int, int]]) -> None:
+        if positions:
+            self._stale()
+            self.exposed_foods -= sum(position in self.foods for position in positions)
+
+    def _free_spaces(self, positions: list[tuple[int, int]]) -> None:
+        if positions:
+            self._stale()
+            self.exposed_foods += sum(position in self.foods for position in positions)
+
+    def add_food(self, count: int = 1) -> None:
+        for _ in range(min(count, self.count_empty_spaces())):
+            food = self.random_empty_space()
+            self.foods.add(food)
+            self._index_foods([food])
+            self.food_board |= 1 << self._cell(food)
+            self.exposed_foods += 1
+            self._stale()
+
+    def consume_food(self, position: tuple[int, int]) -> bool:
+        cell = self._cell(position)
+        exposed = cell is not None and not self.get_occupancy().owners[cell]
+        if not super().consume_food(position):
+            return False
+        if cell is not None:
+            self.food_board &= ~(1 << cell)
+            self.exposed_foods -= exposed
+        self._stale()
+        return True
@@ -0,0 +1,11 @@
+from bots.board import SearchBoard
+from bots.evaluation import flood_fill, voronoi
+from bots.search import (
+    FloodFillPlayer,
+    SearchBudgetExceeded,
+    SearchPlayer,
+    SearchStats,
+    evaluate,
+)
+from bots.transposition import TranspositionTable
+from bots.zobrist import ZobristKeys
@@ -0,0 +1,116 @@
+from collections import deque
+from dataclasses import dataclass, field
+from snake import MOVE_OFFSETS
+from bots.zobrist import ZobristKeys
+
+EMPTY = 0
+OUTSIDE = -1
+
+
+@dataclass
+class SearchBoard:
+    width: int
+    height: int
+    bodies: list[deque[int]]
+    foods: set[int] = field(default_factory=set)
+    zobrist: ZobristKeys | None = field(default=None, repr=False)
+    alive: list[bool] = field(default_factory=list)
+    cells: bytearray = field(default_factory=bytearray, repr=False)
+    counts: bytearray = field(default_factory=bytearray, repr=False)
+    hash: int = 0
+
+    def __post_init__(self) -> None:
+        self.bodies = [deque(body) for body in self.bodies]
+        self.alive = [True] * len(self.bodies)
+        if self.zobrist is None:
+            self.zobrist = ZobristKeys(self.width * self.height, len(self.bodies))
+        self.cells = bytearray(self.width * self.height)
+        self.counts = bytearray(self.width * self.height)
+        self.hash = 0
+        for player, body in enumerate(self.bodies):
+            for cell in body:
+                self._set(cell, player)
+            if body:
+                self.hash ^= self.zobrist.heads[body[0]][player]
+
+    @classmethod
+    def from_game(cls, game, snake, zobrist: ZobristKeys | None = None):
+        snakes = list(game.snakes)
+        root = next((i for i, other in enumerate(snakes) if other is snake), None)
+        if root is None:
+            root = next(
+                i
+                for i, other in enumerate(snakes)
+                if other.get_head() == snake.get_head()
+            )
+        snakes.insert(0, snakes.pop(root))
+        width = game.max_x
+        bodies = [[y * width + x for x, y in other.get_positions()] for other in snakes]
+        foods = {y * width + x for x, y in game.foods}
+        return cls(width, game.max_y, bodies, foods, zobrist)
+
+    def _set(self, cell: int, player: int) -> None:
+        self.counts[cell] += 1
+        if self.counts[cell] == 1:
+            self.cells[cell] = player + 1
+            self.hash ^= self.zobrist.bodies[cell][player]
+
+    def _clear(self, cell: int, player: int) -> None:
+        self.counts[cell] -= 1
+        if self.counts[cell] == 0:
+            self.cells[cell] = EMPTY
+            self.hash ^= self.zobrist.bodies[cell][player]
+
+    def target(self, player: int, move: int) -> int:
+        head = self.bodies[player][0]
+        dx, dy = MOVE_OFFSETS[move]
+        x, y = head % self.width + dx, head // self.width + dy
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return OUTSIDE
+
+    def is_safe(self, player: int, move: int) -> bool:
+        cell = self.target(player, move)
+        if cell == OUTSIDE:
+            return False
+        # Like SnakeyGame.get_valid_move_mask, a snake may overlap itself.
+        return self.cells[cell] in (EMPTY, player + 1)
+
+    def safe_moves(self, player: int) -> list[int]:
+        return [move for move in range(len(MOVE_OFFSETS)) if self.is_safe(player, move)]
+
+    def make(self, player: int, move: int) -> tuple:
+        body = self.bodies[player]
+        if not self.is_safe(player, move):
+            for cell in body:
+                self._clear(cell, player)
+            self.hash ^= self.zobrist.heads[body[0]][player]
+            self.alive[player] = False
+            return player, None, None
+        cell = self.target(player, move)
+        heads = self.zobrist.heads
+        self.hash ^= heads[body[0]][player] ^ heads[cell][player]
+        tail = None
+        if cell not in self.foods:
+            tail = body.pop()
+            self._clear(tail, player)
+        body.appendleft(cell)
+        self._set(cell, player)
+        return player, cell, tail
+
+    def unmake(self, undo: tuple) -> None:
+        player, cell, tail = undo
+        body = self.bodies[player]
+        if cell is None:
+            self.alive[player] = True
+            for cell in body:
+                self._set(cell, player)
+            self.hash ^= self.zobrist.heads[body[0]][player]
+            return
+        body.popleft()
+        self._clear(cell, player)
+        if tail is not None:
+            body.append(tail)
+            self._set(tail, player)
+        heads = self.zobrist.heads
+        self.hash ^= heads[cell][player] ^ heads[body[0]][player]
@@ -0,0 +1,59 @@
+from array import array
+from bots.board import SearchBoard, EMPTY
+
+
+def neighbours(board: SearchBoard, cell: int) -> list[int]:
+    x, y = cell % board.width, cell // board.width
+    found = []
+    if x > 0:
+        found.append(cell - 1)
+    if x < board.width - 1:
+        found.append(cell + 1)
+    if y > 0:
+        found.append(cell - board.width)
+    if y < board.height - 1:
+        found.append(cell + board.width)
+    return found
+
+
+def flood_fill(board: SearchBoard, start: int, limit: int | None = None) -> int:
+    seen = bytearray(len(board.cells))
+    queue = array("i", [start])
+    seen[start] = 1
+    head = 0
+    while head < len(queue) and (limit is None or head < limit):
+        for cell in neighbours(board, queue[head]):
+            if not seen[cell] and board.cells[cell] == EMPTY:
+                seen[cell] = 1
+                queue.append(cell)
+        head += 1
+    return len(queue) - 1
+
+
+def voronoi(board: SearchBoard) -> list[int]:
+    owner = array("b", [-1]) * len(board.cells)
+    queue = array("i")
+    for player, body in enumerate(board.bodies):
+        if board.alive[player]:
+            queue.append(body[0])
+            owner[body[0]] = player
+    territory = [0] * len(board.bodies)
+    head = 0
+    while head < len(queue):
+        level_end = len(queue)
+        claims = {}
+        while head < level_end:
+            cell = queue[head]
+            head += 1
+            for neighbour in neighbours(board, cell):
+                if owner[neighbour] == -1 and board.cells[neighbour] == EMPTY:
+                    claimant = owner[cell]
+                    previous = claims.setdefault(neighbour, claimant)
+                    if previous != claimant:
+                        claims[neighbour] = -2
+        for cell, claimant in claims.items():
+            owner[cell] = claimant
+            if claimant >= 0:
+                territory[claimant] += 1
+                queue.append(cell)
+    return territory
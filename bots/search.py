@@ -0,0 +1,196 @@
+from dataclasses import dataclass, field
+from time import perf_counter
+from uuid import UUID
+from snake import MOVES, GameMove
+from bots.board import SearchBoard
+from bots.evaluation import flood_fill, voronoi
+from bots.transposition import EXACT, LOWER, UPPER, TranspositionTable
+from bots.zobrist import ZobristKeys
+
+WIN = 1_000_000.0
+LENGTH_WEIGHT = 0.5
+# Wall clock is only consulted every this many nodes.
+CLOCK_INTERVAL = 256
+
+
+class SearchBudgetExceeded(Exception):
+    pass
+
+
+@dataclass
+class SearchStats:
+    nodes: int = 0
+    depth: int = 0
+    elapsed: float = 0.0
+    table_hits: int = 0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    def add(self, other: "SearchStats") -> None:
+        self.nodes += other.nodes
+        self.depth = max(self.depth, other.depth)
+        self.elapsed += other.elapsed
+        self.table_hits += other.table_hits
+
+
+def evaluate(board: SearchBoard) -> float:
+    territory = voronoi(board)
+    others = [p for p in range(1, len(board.bodies)) if board.alive[p]]
+    if not others:
+        return float(territory[0])
+    rival = max(others, key=lambda p: territory[p])
+    length = len(board.bodies[0]) - max(len(board.bodies[p]) for p in others)
+    return territory[0] - territory[rival] + LENGTH_WEIGHT * length
+
+
+@dataclass
+class FloodFillPlayer:
+    id: int | UUID | None = None
+
+    def move(self, game, snake) -> GameMove:
+        board = SearchBoard.from_game(game, snake)
+        best, best_space = 0, -1
+        for move in board.safe_moves(0):
+            undo = board.make(0, move)
+            space = flood_fill(board, board.bodies[0][0])
+            board.unmake(undo)
+            if space > best_space:
+                best, best_space = move, space
+        return MOVES[best]
+
+
+@dataclass
+class SearchPlayer:
+    id: int | UUID | None = None
+    # Depth is counted in rounds; each round is one move by every live snake.
+    max_depth: int = 8
+    time_limit: float | None = 0.05
+    max_nodes: int | None = None
+    table: TranspositionTable = field(default_factory=TranspositionTable, repr=False)
+    stats: SearchStats = field(default_factory=SearchStats)
+    total: SearchStats = field(default_factory=SearchStats)
+
+    def __post_init__(self) -> None:
+        self._zobrist: dict[tuple[int, int], ZobristKeys] = {}
+
+    def move(self, game, snake) -> GameMove:
+        shape = (game.max_x * game.max_y, len(game.snakes))
+        if shape not in self._zobrist:
+            self._zobrist[shape] = ZobristKeys(*shape)
+        board = SearchBoard.from_game(game, snake, self._zobrist[shape])
+        return MOVES[self.search(board)]
+
+    def search(self, board: SearchBoard) -> int:
+        self.stats = SearchStats()
+        start = perf_counter()
+        self._deadline = start + self.time_limit if self.time_limit else None
+        hits = self.table.hits
+        moves = board.safe_moves(0)
+        best = moves[0] if moves else 0
+        if len(moves) > 1:
+            for depth in range(1, self.max_depth + 1):
+                try:
+                    value, move = self._alphabeta(
+                        board, 0, depth * len(board.bodies), -2 * WIN, 2 * WIN, 0
+                    )
+                except SearchBudgetExceeded:
+                    break
+                best = move
+                self.stats.depth = depth
+                if abs(value) >= WIN - depth * len(board.bodies):
+                    break
+        self.stats.elapsed = perf_counter() - start
+        self.stats.table_hits = self.table.hits - hits
+        self.total.add(self.stats)
+        return best
+
+    def _visit(self) -> None:
+        self.stats.nodes += 1
+        if self.max_nodes is not None and self.stats.nodes > self.max_nodes:
+            raise SearchBudgetExceeded
+        if (
+            self._deadline is not None
+            and self.stats.nodes % CLOCK_INTERVAL == 0
+            and perf_counter() > self._deadline
+        ):
+            raise SearchBudgetExceeded
+
+    def _next(self, board: SearchBoard, player: int) -> int:
+        count = len(board.bodies)
+        for step in range(1, count + 1):
+            following = (player + step) % count
+            if board.alive[following]:
+                return following
+        return player
+
+    def _alphabeta(
+        self,
+        board: SearchBoard,
+        player: int,
+        depth: int,
+        alpha: float,
+        beta: float,
+        ply: int,
+    ) -> tuple[float, int]:
+        self._visit()
+        if not board.alive[0]:
+            return ply - WIN, 0
+        if not any(board.alive[1:]):
+            return WIN - ply, 0
+        if depth <= 0:
+            return evaluate(board), 0
+
+        key = board.hash ^ board.zobrist.turns[player]
+        entry = self.table.get(key)
+        moves = board.safe_moves(player) or [0]
+        if entry is not None:
+            if entry.depth >= depth:
+                if entry.flag == EXACT:
+                    return entry.value, entry.move
+                if entry.flag == LOWER:
+                    alpha = max(alpha, entry.value)
+                else:
+                    beta = min(beta, entry.value)
+                if alpha >= beta:
+                    return entry.value, entry.move
+            if entry.move in moves:
+                moves.remove(entry.move)
+                moves.insert(0, entry.move)
+
+        lower, upper = alpha, beta
+        maximizing = player == 0
+        best_value = -2 * WIN if maximizing else 2 * WIN
+        best_move = moves[0]
+        following = self._next(board, player)
+        for move in moves:
+            undo = board.make(player, move)
+            try:
+                value, _ = self._alphabeta(
+                    board, following, depth - 1, alpha, beta, ply + 1
+                )
+            finally:
+                board.unmake(undo)
+            if (
+                maximizing
+                and value > best_value
+                or not maximizing
+                and value < best_value
+            ):
+                best_value, best_move = value, move
+            if maximizing:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+        if best_value <= lower:
+            flag = UPPER
+        elif best_value >= upper:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.put(key, depth, best_value, flag, best_move)
+        return best_value, best_move
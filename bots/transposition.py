@@ -0,0 +1,49 @@
+from dataclasses import dataclass, field
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+@dataclass(slots=True)
+class Entry:
+    key: int
+    depth: int
+    value: float
+    flag: int
+    move: int
+
+
+@dataclass
+class TranspositionTable:
+    # Rounded up to a power of two so slots are picked with a mask.
+    size: int = 1 << 16
+    entries: list[Entry | None] = field(default_factory=list, repr=False)
+    hits: int = 0
+    stores: int = 0
+
+    def __post_init__(self) -> None:
+        self.size = 1 << max(self.size - 1, 1).bit_length()
+        self.entries = [None] * self.size
+
+    def __len__(self) -> int:
+        return sum(entry is not None for entry in self.entries)
+
+    def get(self, key: int) -> Entry | None:
+        entry = self.entries[key & (self.size - 1)]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def put(self, key: int, depth: int, value: float, flag: int, move: int) -> None:
+        slot = key & (self.size - 1)
+        entry = self.entries[slot]
+        # Keep deeper results for the same position; anything else is evicted.
+        if entry is not None and entry.key == key and entry.depth > depth:
+            return
+        self.entries[slot] = Entry(key, depth, value, flag, move)
+        self.stores += 1
+
+    def clear(self) -> None:
+        self.entries = [None] * self.size
@@ -0,0 +1,24 @@
+from dataclasses import dataclass, field
+from random import Random
+
+
+@dataclass
+class ZobristKeys:
+    cells: int
+    players: int
+    seed: int = 0
+    bodies: list[list[int]] = field(default_factory=list, repr=False)
+    turns: list[int] = field(default_factory=list, repr=False)
+    heads: list[list[int]] = field(default_factory=list, repr=False)
+
+    def __post_init__(self) -> None:
+        rng = Random(self.seed)
+        self.bodies = [
+            [rng.getrandbits(64) for _ in range(self.players)]
+            for _ in range(self.cells)
+        ]
+        self.turns = [rng.getrandbits(64) for _ in range(self.players)]
+        self.heads = [
+            [rng.getrandbits(64) for _ in range(self.players)]
+            for _ in range(self.cells)
+        ]
@@ -0,0 +1,197 @@
+from array import array
+from dataclasses import dataclass, field
+from uuid import UUID
+from snake import MOVE_DELTAS, GameMove, Snake
+from snakey_game import SnakeyGame
+
+OUTSIDE = -1
+NO_CELL = -2
+INITIAL_CAPACITY = 8
+
+
+@dataclass(slots=True)
+class CompactSnake:
+    game: "CompactGame" = field(repr=False)
+    slot: int
+
+    @property
+    def positions(self) -> list[tuple[int, int]]:
+        return [self.game.position(cell) for cell in self.game.cells_of(self.slot)]
+
+    @property
+    def previous_position(self) -> tuple[int, int] | None:
+        cell = self.game.previous[self.slot]
+        return None if cell == NO_CELL else self.game.position(cell)
+
+    def get_length(self) -> int:
+        return self.game.lengths[self.slot]
+
+    def get_head(self) -> tuple[int, int]:
+        return self.game.position(self.game.head(self.slot))
+
+    def get_positions(self) -> list[tuple[int, int]]:
+        return self.positions
+
+    def occupies(self, position: tuple[int, int]) -> bool:
+        return self.game.cell(*position) in self.game.cells_of(self.slot)
+
+
+@dataclass(slots=True)
+class CompactGame:
+    max_x: int
+    max_y: int
+    # Ring buffer length per snake, doubled for every snake when one outgrows it.
+    capacity: int = INITIAL_CAPACITY
+    ids: list[int | UUID] = field(default_factory=list)
+    bodies: array = field(default_factory=lambda: array("i"), repr=False)
+    starts: array = field(default_factory=lambda: array("i"), repr=False)
+    lengths: array = field(default_factory=lambda: array("i"), repr=False)
+    previous: array = field(default_factory=lambda: array("i"), repr=False)
+    alive: bytearray = field(default_factory=bytearray, repr=False)
+    counts: array = field(default_factory=lambda: array("H"), repr=False)
+    food_cells: set[int] = field(default_factory=set, repr=False)
+    scratch: array = field(default_factory=lambda: array("H"), repr=False)
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = array("H", bytes(2 * self.max_x * self.max_y))
+            self.scratch = array("H", bytes(2 * self.max_x * self.max_y))
+
+    @classmethod
+    def from_game(
+        cls, game: SnakeyGame, ids: list[int | UUID] | None = None
+    ) -> "CompactGame":
+        compact = cls(game.max_x, game.max_y)
+        for i, snake in enumerate(game.snakes):
+            compact.add_snake(snake.positions, ids[i] if ids else i)
+        compact.food_cells = {compact.cell(*food) for food in game.foods}
+        return compact
+
+    @classmethod
+    def from_game_master(cls, game_master) -> "CompactGame":
+        game = game_master.game
+        compact = cls(game.max_x, game.max_y)
+        for player in game_master.active_players:
+            snake = game_master.players_snakes[player.id]
+            compact.add_snake(snake.positions, player.id)
+        compact.food_cells = {compact.cell(*food) for food in game.foods}
+        return compact
+
+    def to_game(self) -> SnakeyGame:
+        game = SnakeyGame(self.max_x, self.max_y, foods=self.foods)
+        for snake in self.snakes:
+            game.add_snake(Snake(snake.positions))
+        return game
+
+    def cell(self, x: int, y: int) -> int:
+        if 0 <= x < self.max_x and 0 <= y < self.max_y:
+            return y * self.max_x + x
+        return OUTSIDE
+
+    def position(self, cell: int) -> tuple[int, int]:
+        return cell % self.max_x, cell // self.max_x
+
+    @property
+    def snakes(self) -> list[CompactSnake]:
+        return [
+            CompactSnake(self, slot)
+            for slot in range(len(self.ids))
+            if self.alive[slot]
+        ]
+
+    @property
+    def foods(self) -> set[tuple[int, int]]:
+        return {self.position(cell) for cell in self.food_cells}
+
+    def slot_of(self, id: int | UUID) -> int:
+        return self.ids.index(id)
+
+    def head(self, slot: int) -> int:
+        return self.bodies[slot * self.capacity + self.starts[slot]]
+
+    def cells_of(self, slot: int) -> list[int]:
+        base, start = slot * self.capacity, self.starts[slot]
+        return [
+            self.bodies[base + (start + i) % self.capacity]
+            for i in range(self.lengths[slot])
+        ]
+
+    def add_snake(self, positions, id: int | UUID | None = None) -> int:
+        cells = [self.cell(x, y) for x, y in positions]
+        if OUTSIDE in cells:
+            raise ValueError("Compact snakes must start inside the board")
+        while len(cells) > self.capacity:
+            self._grow_capacity()
+        slot = len(self.ids)
+        self.ids.append(slot if id is None else id)
+        self.bodies.extend(cells)
+        self.bodies.extend([0] * (self.capacity - len(cells)))
+        self.starts.append(0)
+        self.lengths.append(len(cells))
+        self.previous.append(NO_CELL)
+        self.alive.append(1)
+        for cell in cells:
+            self.counts[cell] += 1
+        return slot
+
+    def _grow_capacity(self) -> None:
+        capacity = self.capacity * 2
+        bodies = array("i", bytes(4 * capacity * len(self.ids)))
+        for slot in range(len(self.ids)):
+            for i, cell in enumerate(self.cells_of(slot)):
+                bodies[slot * capacity + i] = cell
+            self.starts[slot] = 0
+        self.bodies, self.capacity = bodies, capacity
+
+    def move_snake(self, slot: int, move: GameMove) -> None:
+        dx, dy = MOVE_DELTAS[move]
+        head = self.head(slot)
+        x, y = head % self.max_x + dx, head // self.max_x + dy
+        cell = OUTSIDE if head == OUTSIDE else self.cell(x, y)
+        base, start = slot * self.capacity, (self.starts[slot] - 1) % self.capacity
+        tail = self.bodies[base + (start + self.lengths[slot]) % self.capacity]
+        self.bodies[base + start] = cell
+        self.starts[slot] = start
+        if cell != OUTSIDE:
+            self.counts[cell] += 1
+        if tail != OUTSIDE:
+            self.counts[tail] -= 1
+        self.previous[slot] = tail
+
+    def grow_snake(self, slot: int) -> None:
+        tail = self.previous[slot]
+        if tail == NO_CELL:
+            return
+        if self.lengths[slot] == self.capacity:
+            self._grow_capacity()
+        base, start = slot * self.capacity, self.starts[slot]
+        self.bodies[base + (start + self.lengths[slot]) % self.capacity] = tail
+        self.lengths[slot] += 1
+        if tail != OUTSIDE:
+            self.counts[tail] += 1
+        self.previous[slot] = NO_CELL
+
+    def remove_snake(self, slot: int) -> None:
+        for cell in self.cells_of(slot):
+            if cell != OUTSIDE:
+                self.counts[cell] -= 1
+        self.alive[slot] = 0
+
+    def get_dead_snakes(self) -> list[int]:
+        dead = []
+        counts, scratch = self.counts, self.scratch
+        for slot in range(len(self.ids)):
+            if not self.alive[slot]:
+                continue
+            cells = self.cells_of(slot)
+            if OUTSIDE in cells:
+                dead.append(slot)
+                continue
+            for cell in cells:
+                scratch[cell] += 1
+            # Any occurrence not accounted for by this snake belongs to another.
+            if any(counts[cell] > scratch[cell] for cell in cells):
+                dead.append(slot)
+            for cell in cells:
+                scratch[cell] = 0
+        return dead
@@ -0,0 +1,191 @@
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from struct import Struct
+from uuid import UUID
+from game_master import GameMaster
+from snake import Snake
+from snakey_game import SnakeyGame
+
+HEADER = Struct("<IHHHHH")
+STEP = Struct("<HhhB")
+JOINED = Struct("<HHH")
+SLOT = Struct("<H")
+POSITION = Struct("<hh")
+
+
+@dataclass
+class SnakeStep:
+    slot: int
+    head: tuple[int, int]
+    grew: bool = False
+
+
+@dataclass
+class Joined:
+    slot: int
+    id: str
+    positions: list[tuple[int, int]]
+
+
+@dataclass
+class TickDelta:
+    tick: int
+    steps: list[SnakeStep] = field(default_factory=list)
+    joined: list[Joined] = field(default_factory=list)
+    eliminated: list[int] = field(default_factory=list)
+    eaten: list[tuple[int, int]] = field(default_factory=list)
+    spawned: list[tuple[int, int]] = field(default_factory=list)
+
+    def to_bytes(self) -> bytes:
+        parts = [
+            HEADER.pack(
+                self.tick,
+                len(self.steps),
+                len(self.joined),
+                len(self.eliminated),
+                len(self.eaten),
+                len(self.spawned),
+            )
+        ]
+        parts.extend(STEP.pack(s.slot, *s.head, s.grew) for s in self.steps)
+        for joined in self.joined:
+            name = joined.id.encode()
+            parts.append(JOINED.pack(joined.slot, len(name), len(joined.positions)))
+            parts.append(name)
+            parts.extend(POSITION.pack(*position) for position in joined.positions)
+        parts.extend(SLOT.pack(slot) for slot in self.eliminated)
+        parts.extend(POSITION.pack(*food) for food in self.eaten)
+        parts.extend(POSITION.pack(*food) for food in self.spawned)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TickDelta":
+        tick, steps, joined, eliminated, eaten, spawned = HEADER.unpack_from(data)
+        offset = HEADER.size
+        delta = cls(tick)
+        for _ in range(steps):
+            slot, x, y, grew = STEP.unpack_from(data, offset)
+            delta.steps.append(SnakeStep(slot, (x, y), bool(grew)))
+            offset += STEP.size
+        for _ in range(joined):
+            slot, name_length, length = JOINED.unpack_from(data, offset)
+            offset += JOINED.size
+            name = bytes(data[offset : offset + name_length]).decode()
+            offset += name_length
+            positions = [
+                POSITION.unpack_from(data, offset + i * POSITION.size)
+                for i in range(length)
+            ]
+            offset += length * POSITION.size
+            delta.joined.append(Joined(slot, name, positions))
+        for _ in range(eliminated):
+            delta.eliminated.append(SLOT.unpack_from(data, offset)[0])
+            offset += SLOT.size
+        for foods in (delta.eaten, delta.spawned):
+            for _ in range(eaten if foods is delta.eaten else spawned):
+                foods.append(POSITION.unpack_from(data, offset))
+                offset += POSITION.size
+        return delta
+
+
+@dataclass
+class DeltaRecorder:
+    slots: dict[int | UUID, int] = field(default_factory=dict)
+    alive: set[int | UUID] = field(default_factory=set)
+    foods: set[tuple[int, int]] = field(default_factory=set)
+    tick: int = 0
+    listeners: list[Callable[[TickDelta], None]] = field(default_factory=list)
+    last: TickDelta | None = None
+
+    @classmethod
+    def attach(cls, game_master: GameMaster) -> "DeltaRecorder":
+        # Deltas are diffed against the game as it stands when attached.
+        recorder = cls(foods=set(game_master.game.foods))
+        for player in game_master.active_players:
+            recorder._slot(player.id)
+            recorder.alive.add(player.id)
+        game_master.observers.append(recorder)
+        return recorder
+
+    def keyframe(self, game_master: GameMaster) -> TickDelta:
+        # Everything a new client needs; does not advance the recorder, so
+        # later deltas still join players and diff foods against the last tick.
+        delta = TickDelta(self.tick)
+        for player in game_master.active_players:
+            delta.joined.append(self._joined(game_master, player.id))
+        delta.spawned = sorted(game_master.game.foods)
+        return delta
+
+    def _slot(self, id: int | UUID) -> int:
+        # Slots are stable per player, so assigning one early is harmless.
+        if id not in self.slots:
+            self.slots[id] = len(self.slots)
+        return self.slots[id]
+
+    def _joined(self, game_master: GameMaster, id: int | UUID) -> Joined:
+        positions = list(game_master.players_snakes[id].positions)
+        return Joined(self._slot(id), str(id), positions)
+
+    def on_tick(self, game_master: GameMaster) -> None:
+        self.tick += 1
+        delta = TickDelta(self.tick)
+        active = set()
+        for player in game_master.active_players:
+            active.add(player.id)
+            if player.id not in self.alive:
+                delta.joined.append(self._joined(game_master, player.id))
+                continue
+            snake = game_master.players_snakes[player.id]
+            delta.steps.append(
+                SnakeStep(
+                    self.slots[player.id],
+                    snake.positions[0],
+                    snake.previous_position is None,
+                )
+            )
+        delta.eliminated = sorted(self.slots[id] for id in self.alive - active)
+        self.alive = active
+        foods = game_master.game.foods
+        if foods != self.foods:
+            delta.eaten = [food for food in self.foods if food not in foods]
+            delta.spawned = [food for food in foods if food not in self.foods]
+            self.foods = set(foods)
+        self.last = delta
+        for listener in self.listeners:
+            listener(delta)
+
+
+@dataclass
+class ClientState:
+    max_x: int
+    max_y: int
+    tick: int = 0
+    bodies: dict[int, deque[tuple[int, int]]] = field(default_factory=dict)
+    ids: dict[int, str] = field(default_factory=dict)
+    foods: set[tuple[int, int]] = field(default_factory=set)
+
+    def apply(self, delta: TickDelta) -> list[tuple[int, int]]:
+        vacated = []
+        for step in delta.steps:
+            body = self.bodies[step.slot]
+            body.appendleft(step.head)
+            if not step.grew:
+                vacated.append(body.pop())
+        for joined in delta.joined:
+            self.bodies[joined.slot] = deque(joined.positions)
+            self.ids[joined.slot] = joined.id
+        for slot in delta.eliminated:
+            del self.bodies[slot]
+        self.foods.difference_update(delta.eaten)
+        self.foods.update(delta.spawned)
+        self.tick = delta.tick
+        return vacated
+
+    def to_game(self) -> tuple[SnakeyGame, dict[int, Snake]]:
+        game = SnakeyGame(self.max_x, self.max_y, foods=set(self.foods))
+        snakes = {}
+        for slot, body in self.bodies.items():
+            snakes[slot] = Snake(body)
+            game.add_snake(snakes[slot])
+        return game, snakes
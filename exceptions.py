@@ -1,2 +1,6 @@
 class InvalidPlayerException(Exception):
     ...
+
+
+class NotEnoughSpaceException(Exception):
+    ...
@@ -0,0 +1,137 @@
+from dataclasses import dataclass, field
+from typing import Protocol
+
+
+@dataclass
+class FoodIndex:
+    bucket_size: int = 8
+    buckets: dict[tuple[int, int], set[tuple[int, int]]] = field(default_factory=dict)
+    size: int = 0
+    # Bucket coordinate bounds, so empty rings past them end the search.
+    low: tuple[int, int] = (0, 0)
+    high: tuple[int, int] = (0, 0)
+
+    def _bucket(self, position: tuple[int, int]) -> tuple[int, int]:
+        return position[0] // self.bucket_size, position[1] // self.bucket_size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, position: tuple[int, int]) -> None:
+        key = self._bucket(position)
+        bucket = self.buckets.setdefault(key, set())
+        if position not in bucket:
+            if not self.size:
+                self.low = self.high = key
+            else:
+                self.low = min(self.low[0], key[0]), min(self.low[1], key[1])
+                self.high = max(self.high[0], key[0]), max(self.high[1], key[1])
+            bucket.add(position)
+            self.size += 1
+
+    def remove(self, position: tuple[int, int]) -> None:
+        key = self._bucket(position)
+        bucket = self.buckets.get(key)
+        if bucket and position in bucket:
+            bucket.remove(position)
+            self.size -= 1
+            if not bucket:
+                del self.buckets[key]
+
+    def _ring(self, center: tuple[int, int], radius: int):
+        cx, cy = center
+        if radius == 0:
+            yield center
+            return
+        for dx in range(-radius, radius + 1):
+            yield cx + dx, cy - radius
+            yield cx + dx, cy + radius
+        for dy in range(-radius + 1, radius):
+            yield cx - radius, cy + dy
+            yield cx + radius, cy + dy
+
+    def nearest(self, position: tuple[int, int], k: int = 1) -> list[tuple[int, int]]:
+        if not self.size or k <= 0:
+            return []
+        x, y = position
+        center = self._bucket(position)
+        reach = max(
+            abs(center[0] - self.low[0]),
+            abs(center[0] - self.high[0]),
+            abs(center[1] - self.low[1]),
+            abs(center[1] - self.high[1]),
+        )
+        found = []
+        for radius in range(reach + 1):
+            for key in self._ring(center, radius):
+                for food in self.buckets.get(key, ()):
+                    found.append((abs(food[0] - x) + abs(food[1] - y), food))
+            # Anything in a further ring is more than radius buckets away.
+            if len(found) >= k:
+                found.sort()
+                if found[k - 1][0] <= radius * self.bucket_size:
+                    break
+        found.sort()
+        return [food for _, food in found[:k]]
+
+    def within(self, position: tuple[int, int], radius: int) -> list[tuple[int, int]]:
+        x, y = position
+        low = self._bucket((x - radius, y - radius))
+        high = self._bucket((x + radius, y + radius))
+        return [
+            food
+            for bx in range(max(low[0], self.low[0]), min(high[0], self.high[0]) + 1)
+            for by in range(max(low[1], self.low[1]), min(high[1], self.high[1]) + 1)
+            for food in self.buckets.get((bx, by), ())
+            if abs(food[0] - x) + abs(food[1] - y) <= radius
+        ]
+
+
+class SpawnPolicy(Protocol):
+    def spawn_count(self, game) -> int: ...
+
+
+@dataclass
+class FixedCount:
+    count: int
+
+    def spawn_count(self, game) -> int:
+        return max(self.count - len(game.foods), 0)
+
+
+@dataclass
+class SpawnRate:
+    # Foods per tick; fractions carry over to later ticks.
+    rate: float
+    carry: float = 0.0
+
+    def spawn_count(self, game) -> int:
+        self.carry += self.rate
+        count = int(self.carry)
+        self.carry -= count
+        return count
+
+
+@dataclass
+class MaxDensity:
+    density: float
+    policy: SpawnPolicy | None = None
+
+    def spawn_count(self, game) -> int:
+        room = int(self.density * game.max_x * game.max_y) - len(game.foods)
+        wanted = room if self.policy is None else self.policy.spawn_count(game)
+        return max(min(wanted, room), 0)
+
+
+@dataclass
+class FoodManager:
+    policy: SpawnPolicy
+    consume: bool = True
+
+    def update(self, game, eaten: list[tuple[int, int]]) -> None:
+        if self.consume:
+            for position in eaten:
+                game.consume_food(position)
+        count = self.policy.spawn_count(game)
+        if count:
+            game.add_food(count)
@@ -0,0 +1,45 @@
+from dataclasses import dataclass, field
+from random import Random
+import random
+
+
+@dataclass(slots=True)
+class FreeCells:
+    cells: list[tuple[int, int]] = field(default_factory=list)
+    indices: dict[tuple[int, int], int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.indices = {cell: i for i, cell in enumerate(self.cells)}
+
+    def reset(self, cells) -> None:
+        self.cells.clear()
+        self.indices.clear()
+        for cell in cells:
+            self.indices[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __contains__(self, cell: tuple[int, int]) -> bool:
+        return cell in self.indices
+
+    def add(self, cell: tuple[int, int]) -> None:
+        if cell not in self.indices:
+            self.indices[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def remove(self, cell: tuple[int, int]) -> None:
+        index = self.indices.pop(cell, None)
+        if index is None:
+            return
+        last = self.cells.pop()
+        if index < len(self.cells):
+            self.cells[index] = last
+            self.indices[last] = index
+
+    def choice(self, rng: Random = random) -> tuple[int, int]:
+        return self.cells[rng.randrange(len(self.cells))]
+
+    def sample(self, count: int, rng: Random = random) -> list[tuple[int, int]]:
+        return rng.sample(self.cells, k=min(count, len(self.cells)))
@@ -1,22 +1,44 @@
-from random import choice
 from copy import deepcopy
 from dataclasses import dataclass, field
+from time import perf_counter
 from uuid import UUID, uuid4
 from snakey_game import SnakeyGame
-from snake import Snake
+from snake import GameMove, Snake
 from player import Player
+from observer import TickObserver
+from scheduler import Decision, MoveScheduler
+from instrumentation import Instrumentation
+from food import FoodManager
+from arena import SnakePool
+from spawning import SpawnStrategy, UniformSpawn
+from termination import TerminationRule
+from views import GameSnapshot, GameView
 from exceptions import InvalidPlayerException
 from itertools import count
 from consts import UNIQUE_KEY_RETRY
 
 
-@dataclass
+@dataclass(slots=True)
 class GameMaster:
     game: SnakeyGame
     active_players: list[Player] = field(default_factory=list)
     players_snakes: dict[int | UUID, Snake] = field(default_factory=dict)
     players_dict: dict[int | UUID, Player] = field(default_factory=dict)
     rankings: dict[int | UUID, int] = field(default_factory=dict)
+    paranoid: bool = False
+    last_moves: dict[int | UUID, GameMove | None] = field(default_factory=dict)
+    observers: list[TickObserver] = field(default_factory=list)
+    scheduler: MoveScheduler | None = None
+    instrumentation: Instrumentation | None = None
+    food: FoodManager | None = None
+    snake_pool: SnakePool | None = None
+    termination: list[TerminationRule] = field(default_factory=list)
+    ticks: int = 0
+    last_meal: int = 0
+    # Identity-keyed lookup so finding dead players costs O(dead).
+    _owners: dict[int, Player] = field(default_factory=dict, repr=False, compare=False)
+    # Snakes taken from snake_pool; only these are handed back on reset.
+    _pooled: list[Snake] = field(default_factory=list, repr=False, compare=False)
 
     def add_player(self, player: Player, snake: Snake = None) -> None:
         counter = count()
@@ -30,55 +52,203 @@ class GameMaster:
             snake = self._generate_snake()
         self.players_dict[player.id] = player
         self.players_snakes[player.id] = snake
+        self._owners[id(snake)] = player
         self.active_players.append(player)
-        self.game.snakes.append(snake)
+        self.game.add_snake(snake)
+
+    def add_players(
+        self, players: list[Player], strategy: SpawnStrategy | None = None
+    ) -> None:
+        strategy = strategy or UniformSpawn()
+        positions = strategy.positions(self.game, len(players))
+        for player, position in zip(players, positions):
+            self.add_player(player, self._snake_at(position))
 
     def _generate_snake(self) -> Snake:
-        return Snake(positions=[choice(self.game.empty_spaces)])
+        return self._snake_at(self.game.random_empty_space())
+
+    def _snake_at(self, position: tuple[int, int]) -> Snake:
+        if self.snake_pool is not None:
+            snake = self.snake_pool.acquire([position], self.game.cell_table)
+            self._pooled.append(snake)
+            return snake
+        return Snake(positions=[position])
 
     def play_game(self) -> None:
-        while len(self.active_players) > 1:
+        while not self.is_over():
             self.tick()
 
+    def is_over(self) -> bool:
+        return len(self.active_players) <= 1 or any(
+            rule.should_stop(self) for rule in self.termination
+        )
+
     def tick(self) -> None:
+        self.ticks += 1
+        if self.instrumentation is not None:
+            self._instrumented_tick(self.instrumentation)
+            return
         self._move_snakes()
         self._ate_food_check()
         self._clean_kills()
+        for observer in self.observers:
+            observer.on_tick(self)
+
+    def _instrumented_tick(self, instrumentation: Instrumentation) -> None:
+        instrumentation.begin_tick()
+        self.game.instrumentation = instrumentation
+        players = len(self.active_players)
+        start = mark = perf_counter()
+        self._move_snakes()
+        mark = instrumentation.observe("move_snakes", mark)
+        self._ate_food_check()
+        mark = instrumentation.observe("ate_food_check", mark)
+        self._clean_kills()
+        mark = instrumentation.observe("clean_kills", mark)
+        for observer in self.observers:
+            observer.on_tick(self)
+        instrumentation.observe("observers", mark)
+        instrumentation.observe("tick", start)
+        instrumentation.count("moves", len(self.last_moves))
+        instrumentation.count(
+            "player_errors", sum(move is None for move in self.last_moves.values())
+        )
+        instrumentation.count("eliminations", players - len(self.active_players))
+        instrumentation.end_tick()
 
     def _clean_kills(self) -> None:
         dead_snakes = self.game.get_dead_snakes()
         self._clean_out_snakes(dead_snakes)
 
     def _clean_out_snakes(self, snakes_to_clean: list[Snake]) -> None:
-        if snakes_to_clean:
-            dead_players = []
-            for id, snake in self.players_snakes.items():
-                if snake in snakes_to_clean:
-                    dead_players.append(self.players_dict[id])
-                    self.game.snakes.remove(snake)
-            rank = len(self.active_players) + 1
-            for player in dead_players:
-                self.rankings[player.id] = rank
-                self.active_players.remove(player)
-            self.game.update_empty_spaces()
+        if not snakes_to_clean:
+            return
+        dead_players = {}
+        for snake in snakes_to_clean:
+            player = self._owner_of(snake)
+            if player is not None and player.id not in dead_players:
+                dead_players[player.id] = player
+                self.game.remove_snake(snake)
+        rank = len(self.active_players) + 1
+        for player in dead_players.values():
+            self.rankings[player.id] = rank
+            self._owners.pop(id(self.players_snakes[player.id]), None)
+        # One pass per tick with deaths; survivors keep the order they move in.
+        self.active_players[:] = [
+            player for player in self.active_players if player.id not in dead_players
+        ]
+
+    def _owner_of(self, snake: Snake) -> Player | None:
+        player = self._owners.get(id(snake))
+        if player is None or self.players_snakes.get(player.id) is not snake:
+            self._owners = {
+                id(self.players_snakes[player.id]): player
+                for player in self.active_players
+            }
+            player = self._owners.get(id(snake))
+        return player
 
     def _move_snakes(self) -> None:
-        for player in self.active_players:
+        self.last_moves = {}
+        if self.scheduler is not None:
+            self._move_snakes_concurrently()
+            return
+        view = None if self.paranoid else GameView.of(self.game)
+        instrumentation = self.instrumentation
+        for player in list(self.active_players):
             snake = self.players_snakes[player.id]
+            start = perf_counter() if instrumentation is not None else 0.0
             try:
-                move = player.move(deepcopy(self.game), deepcopy(snake))
+                move = player.move(*self._player_arguments(player, view))
             except Exception as e:
+                self.last_moves[player.id] = None
                 self._clean_out_snakes([self.players_snakes[player.id]])
-            snake.move(move)
+                continue
+            finally:
+                if instrumentation is not None:
+                    instrumentation.observe_player(player.id, perf_counter() - start)
+            self.last_moves[player.id] = move
+            self.game.move_snake(snake, move)
+
+    async def tick_async(self) -> None:
+        self.ticks += 1
+        self.last_moves = {}
+        players = list(self.active_players)
+        arguments = self._concurrent_arguments(players)
+        decisions = await self.scheduler.decide_async(players, arguments)
+        self._apply_decisions(players, decisions)
+        self._ate_food_check()
+        self._clean_kills()
+        for observer in self.observers:
+            observer.on_tick(self)
+
+    def _move_snakes_concurrently(self) -> None:
+        players = list(self.active_players)
+        arguments = self._concurrent_arguments(players)
+        self._apply_decisions(players, self.scheduler.decide(players, arguments))
+
+    def _apply_decisions(
+        self, players: list[Player], decisions: dict[int | UUID, Decision]
+    ) -> None:
+        failed = []
+        for player in players:
+            snake = self.players_snakes[player.id]
+            move = decisions[player.id].move
+            if self.instrumentation is not None:
+                self.instrumentation.observe_player(
+                    player.id, decisions[player.id].latency
+                )
+            self.last_moves[player.id] = move
+            if move is None:
+                failed.append(snake)
+            else:
+                self.game.move_snake(snake, move)
+        self._clean_out_snakes(failed)
+
+    def _concurrent_arguments(self, players: list[Player]) -> list[tuple]:
+        if self.paranoid:
+            return [self._player_arguments(player, None) for player in players]
+        # Bots run in parallel and a timed out one keeps running into later
+        # ticks, so they share a snapshot that is never mutated afterwards.
+        snapshot = GameSnapshot.of(self.game)
+        return [
+            (snapshot, snapshot.view_of(self.players_snakes[player.id]))
+            for player in players
+        ]
+
+    def _player_arguments(self, player: Player, view: GameView | None) -> tuple:
+        snake = self.players_snakes[player.id]
+        if view is None:
+            return deepcopy(self.game), deepcopy(snake)
+        return view, view.view_of(snake)
 
     def _ate_food_check(self) -> None:
+        eaten = []
         for snake in self.game.snakes:
             if snake.get_head() in self.game.foods:
-                snake.add_size()
-
-    def reset(self) -> None:
-        self.game = None
-        self.active_players = []
-        self.players_dict = {}
-        self.players_snakes = {}
-        self.rankings = {}
+                self.game.grow_snake(snake)
+                eaten.append(snake.get_head())
+        if eaten:
+            self.last_meal = self.ticks
+        if self.food is not None:
+            self.food.update(self.game, eaten)
+
+    def reset(
+        self,
+        max_x: int | None = None,
+        max_y: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        if self.game is not None:
+            self.game.reset(max_x, max_y, seed)
+        if self.snake_pool is not None:
+            for snake in self._pooled:
+                self.snake_pool.release(snake)
+        self._pooled.clear()
+        self.active_players.clear()
+        self.players_dict.clear()
+        self.players_snakes.clear()
+        self.rankings.clear()
+        self.last_moves.clear()
+        self._owners.clear()
+        self.ticks = self.last_meal = 0
@@ -0,0 +1,245 @@
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from uuid import UUID
+import numpy as np
+from game_master import GameMaster
+from snake import MOVES
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+FLUSH_ROWS = 65_536
+SURVIVED = 0
+# Causes of death, stored as small integers in the games table.
+ALIVE = 0
+ERROR = 1
+WALL = 2
+COLLISION = 3
+CAUSES = ("alive", "error", "wall", "collision")
+NO_MOVE = -1
+MOVE_CODES = {move: code for code, move in enumerate(MOVES)}
+
+TICK_COLUMNS = {
+    "game": "q",
+    "tick": "q",
+    "player": "q",
+    "length": "i",
+    "head_x": "i",
+    "head_y": "i",
+    "move": "b",
+}
+GAME_COLUMNS = {
+    "game": "q",
+    "player": "q",
+    "rank": "i",
+    "length": "i",
+    "ticks": "q",
+    "food_eaten": "i",
+    "cause": "b",
+}
+
+
+@dataclass
+class ColumnBuffer:
+    name: str
+    types: dict[str, str]
+    columns: dict[str, array] = field(default_factory=dict)
+    rows: int = 0
+    parts: int = 0
+
+    def __post_init__(self) -> None:
+        self.columns = {column: array(kind) for column, kind in self.types.items()}
+
+    def append(self, *values) -> None:
+        for column, value in zip(self.columns.values(), values):
+            column.append(value)
+        self.rows += 1
+
+    def drain(self) -> dict[str, np.ndarray]:
+        # Copies into numpy, then empties the buffers so memory stays bounded.
+        drained = {
+            name: np.frombuffer(column, dtype=column.typecode).copy()
+            for name, column in self.columns.items()
+        }
+        for column in self.columns.values():
+            del column[:]
+        self.rows = 0
+        return drained
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+def write_part(path: Path, columns: dict[str, np.ndarray]) -> Path:
+    if path.suffix == ".parquet":
+        if pq is None:
+            raise ImportError("Writing parquet requires pyarrow")
+        pq.write_table(pa.table(columns), path)
+    else:
+        np.savez_compressed(path, **columns)
+    return path
+
+
+def read_part(path: Path) -> dict[str, np.ndarray]:
+    if path.suffix == ".parquet":
+        if pq is None:
+            raise ImportError("Reading parquet requires pyarrow")
+        data = pq.read_table(path).to_pydict()
+        return {name: np.asarray(values) for name, values in data.items()}
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def read_parts(directory: Path, table: str) -> dict[str, np.ndarray]:
+    parts = [
+        read_part(path)
+        for path in sorted(Path(directory).glob(f"{table}[-.]*"))
+        if path.suffix in (".parquet", ".npz")
+    ]
+    if not parts:
+        return {}
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+@dataclass
+class HistoryRecorder:
+    directory: Path
+    format: str = "parquet" if pq is not None else "npz"
+    flush_rows: int = FLUSH_ROWS
+    game: int = 0
+    # Player ids are written as dense integers, keyed here by str(id). Only the
+    # current game's players are kept, so an id that plays again gets a new
+    # number; the players table maps every number back to its id.
+    players: dict[str, int] = field(default_factory=dict)
+    next_player: int = 0
+    new_players: list[str] = field(default_factory=list, repr=False)
+    player_parts: int = 0
+    ticks: ColumnBuffer = field(
+        default_factory=lambda: ColumnBuffer("ticks", TICK_COLUMNS)
+    )
+    games: ColumnBuffer = field(
+        default_factory=lambda: ColumnBuffer("games", GAME_COLUMNS)
+    )
+    lengths: dict[int | UUID, int] = field(default_factory=dict, repr=False)
+    eaten: dict[int | UUID, int] = field(default_factory=dict, repr=False)
+    causes: dict[int | UUID, int] = field(default_factory=dict, repr=False)
+    died: dict[int | UUID, int] = field(default_factory=dict, repr=False)
+    written: list[Path] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.directory = Path(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Continue numbering after existing parts so reruns append.
+        for buffer in (self.ticks, self.games):
+            buffer.parts = len(list(self.directory.glob(f"{buffer.name}-*")))
+        players = sorted(self.directory.glob("players-*"))
+        self.player_parts = len(players)
+        if players:
+            last = read_part(players[-1])["player"]
+            self.next_player = int(last.max()) + 1 if len(last) else 0
+        games = sorted(self.directory.glob("games-*"))
+        if games:
+            last = read_part(games[-1])["game"]
+            self.game = int(last.max()) + 1 if len(last) else 0
+
+    @classmethod
+    def attach(
+        cls, game_master: GameMaster, directory: Path, **kwargs
+    ) -> "HistoryRecorder":
+        recorder = cls(directory, **kwargs)
+        game_master.observers.append(recorder)
+        return recorder
+
+    def _player(self, id: int | UUID) -> int:
+        key = str(id)
+        if key not in self.players:
+            self.players[key] = self.next_player
+            self.next_player += 1
+            self.new_players.append(key)
+        return self.players[key]
+
+    def on_tick(self, game_master: GameMaster) -> None:
+        for id, snake in game_master.players_snakes.items():
+            if id in self.causes:
+                continue
+            length = snake.get_length()
+            if length > self.lengths.get(id, length):
+                self.eaten[id] = self.eaten.get(id, 0) + 1
+            self.lengths[id] = length
+            move = game_master.last_moves.get(id)
+            if id in game_master.rankings:
+                self.causes[id] = self._cause(game_master, id)
+                self.died[id] = game_master.ticks
+            x, y = snake.get_head()
+            self.ticks.append(
+                self.game,
+                game_master.ticks,
+                self._player(id),
+                length,
+                x,
+                y,
+                MOVE_CODES.get(move, NO_MOVE),
+            )
+        if game_master.is_over():
+            self.end_game(game_master)
+        elif self.ticks.rows >= self.flush_rows:
+            self.flush_table(self.ticks)
+
+    def _cause(self, game_master: GameMaster, id: int | UUID) -> int:
+        if id in game_master.last_moves and game_master.last_moves[id] is None:
+            return ERROR
+        game = game_master.game
+        x, y = game_master.players_snakes[id].get_head()
+        if not (0 <= x < game.max_x and 0 <= y < game.max_y):
+            return WALL
+        return COLLISION
+
+    def end_game(self, game_master: GameMaster) -> None:
+        for id, snake in game_master.players_snakes.items():
+            self.games.append(
+                self.game,
+                self._player(id),
+                game_master.rankings.get(id, SURVIVED),
+                snake.get_length(),
+                self.died.get(id, game_master.ticks),
+                self.eaten.get(id, 0),
+                self.causes.get(id, ALIVE),
+            )
+        self.game += 1
+        self.players.clear()
+        self.lengths.clear()
+        self.eaten.clear()
+        self.causes.clear()
+        self.died.clear()
+        if self.games.rows >= self.flush_rows or self.ticks.rows >= self.flush_rows:
+            self.flush()
+
+    def flush_table(self, buffer: ColumnBuffer) -> Path | None:
+        if not buffer.rows:
+            return None
+        path = self.directory / f"{buffer.name}-{buffer.parts:05d}.{self.format}"
+        buffer.parts += 1
+        self.written.append(write_part(path, buffer.drain()))
+        return path
+
+    def flush(self) -> None:
+        self.flush_table(self.ticks)
+        self.flush_table(self.games)
+        if self.new_players:
+            first = self.next_player - len(self.new_players)
+            path = self.directory / f"players-{self.player_parts:05d}.{self.format}"
+            self.player_parts += 1
+            columns = {
+                "player": np.arange(first, self.next_player, dtype=np.int64),
+                "id": np.array(self.new_players, dtype=str),
+            }
+            self.written.append(write_part(path, columns))
+            self.new_players.clear()
+
+    def close(self) -> None:
+        self.flush()
@@ -0,0 +1,164 @@
+from bisect import bisect_left
+from cProfile import Profile
+from dataclasses import dataclass, field
+from io import StringIO
+from pathlib import Path
+from pstats import Stats
+from time import perf_counter
+import json
+import tracemalloc
+
+# Upper bounds in seconds, doubling from one microsecond to about 16 seconds.
+BUCKETS = tuple(1e-6 * 2**i for i in range(25))
+PROFILE_LINES = 25
+
+
+@dataclass
+class Histogram:
+    counts: list[int] = field(default_factory=lambda: [0] * (len(BUCKETS) + 1))
+    total: float = 0.0
+    count: int = 0
+    max: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank and seen:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": self.counts,
+        }
+
+
+@dataclass
+class Instrumentation:
+    profile_ticks: set[int] = field(default_factory=set)
+    trace_ticks: set[int] = field(default_factory=set)
+    ticks: int = 0
+    counters: dict[str, int] = field(default_factory=dict)
+    phases: dict[str, Histogram] = field(default_factory=dict)
+    players: dict[str, Histogram] = field(default_factory=dict)
+    profiles: dict[int, str] = field(default_factory=dict, repr=False)
+    allocations: dict[int, list[str]] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        self._profile = None
+        self._tracing = False
+
+    def __deepcopy__(self, memo) -> "Instrumentation":
+        # Shared by the game snapshots handed to players, never copied.
+        return self
+
+    def begin_tick(self) -> None:
+        if self.ticks in self.trace_ticks:
+            self._tracing = not tracemalloc.is_tracing()
+            if self._tracing:
+                tracemalloc.start()
+            tracemalloc.clear_traces()
+        if self.ticks in self.profile_ticks:
+            self._profile = Profile()
+            self._profile.enable()
+
+    def end_tick(self) -> None:
+        if self._profile is not None:
+            self._profile.disable()
+            out = StringIO()
+            Stats(self._profile, stream=out).sort_stats("cumulative").print_stats(
+                PROFILE_LINES
+            )
+            self.profiles[self.ticks] = out.getvalue()
+            self._profile = None
+        if self.ticks in self.trace_ticks:
+            snapshot = tracemalloc.take_snapshot()
+            self.allocations[self.ticks] = [
+                str(stat) for stat in snapshot.statistics("lineno")[:PROFILE_LINES]
+            ]
+            if self._tracing:
+                tracemalloc.stop()
+                self._tracing = False
+        self.ticks += 1
+
+    def observe(self, phase: str, since: float) -> float:
+        now = perf_counter()
+        if phase not in self.phases:
+            self.phases[phase] = Histogram()
+        self.phases[phase].observe(now - since)
+        return now
+
+    def observe_player(self, player_id, latency: float) -> None:
+        key = str(player_id)
+        if key not in self.players:
+            self.players[key] = Histogram()
+        self.players[key].observe(latency)
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def to_dict(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "counters": dict(self.counters),
+            "phases": {name: h.to_dict() for name, h in self.phases.items()},
+            "players": {name: h.to_dict() for name, h in self.players.items()},
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = "snakey") -> str:
+        lines = [
+            f"# TYPE {prefix}_ticks_total counter",
+            f"{prefix}_ticks_total {self.ticks}",
+            f"# TYPE {prefix}_events_total counter",
+        ]
+        lines.extend(
+            f'{prefix}_events_total{{event="{name}"}} {value}'
+            for name, value in self.counters.items()
+        )
+        for metric, label, histograms in (
+            ("phase_seconds", "phase", self.phases),
+            ("player_move_seconds", "player", self.players),
+        ):
+            name = f"{prefix}_{metric}"
+            lines.append(f"# TYPE {name} histogram")
+            for key, histogram in histograms.items():
+                cumulative = 0
+                for bound, count in zip(BUCKETS, histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f'{name}_bucket{{{label}="{key}",le="{bound:g}"}} {cumulative}'
+                    )
+                lines.append(
+                    f'{name}_bucket{{{label}="{key}",le="+Inf"}} {histogram.count}'
+                )
+                lines.append(f'{name}_sum{{{label}="{key}"}} {histogram.total}')
+                lines.append(f'{name}_count{{{label}="{key}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str | Path) -> None:
+        path = Path(path)
+        if path.suffix == ".json":
+            path.write_text(self.to_json())
+        else:
+            path.write_text(self.to_prometheus())
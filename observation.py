@@ -0,0 +1,201 @@
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from uuid import UUID
+import numpy as np
+from game_master import GameMaster
+from snake import MOVE_OFFSETS, MOVES, GameMove
+
+OWN_HEAD = 0
+OWN_BODY = 1
+ENEMY_HEADS = 2
+ENEMY_BODIES = 3
+FOOD = 4
+# Ticks until a body cell is vacated, as a fraction of that snake's length.
+TAIL_DISTANCE = 5
+# Cells outside the board; only non-zero when cropping near an edge.
+WALLS = 6
+CHANNELS = 7
+SYMMETRIES = 8
+
+
+@dataclass
+class ObservationEncoder:
+    max_x: int
+    max_y: int
+    # Half width of the egocentric window centred on the snake's head.
+    crop: int | None = None
+    planes: np.ndarray = field(default=None, repr=False)
+    output: np.ndarray = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        pad = self.crop or 0
+        self.planes = np.zeros(
+            (CHANNELS, self.max_x + 2 * pad, self.max_y + 2 * pad), dtype=np.float32
+        )
+        self.planes[WALLS] = 1.0
+        self.planes[WALLS, pad : pad + self.max_x, pad : pad + self.max_y] = 0.0
+        self.output = self.empty()
+        self._flat = self.planes.reshape(CHANNELS, -1)
+        # How many snakes cover each padded cell, shared by every player.
+        self._bodies = np.zeros(self._flat.shape[1], dtype=np.float32)
+        self._heads = np.zeros_like(self._bodies)
+        self._cells = {}
+        self._game = None
+        self._version = None
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        if self.crop is None:
+            return CHANNELS, self.max_x, self.max_y
+        return CHANNELS, 2 * self.crop + 1, 2 * self.crop + 1
+
+    def empty(self, *batch: int) -> np.ndarray:
+        return np.zeros(batch + self.shape, dtype=np.float32)
+
+    def _indices(self, positions) -> tuple[np.ndarray, np.ndarray]:
+        # Flat padded indices of the on-board positions, and their order.
+        pad = self.crop or 0
+        xy = np.array(positions, dtype=np.intp).reshape(-1, 2)
+        x, y = xy[:, 0], xy[:, 1]
+        inside = np.flatnonzero(
+            (x >= 0) & (x < self.max_x) & (y >= 0) & (y < self.max_y)
+        )
+        cells = (x[inside] + pad) * self.planes.shape[2] + y[inside] + pad
+        return cells, inside
+
+    def _snake_cells(self, snake) -> tuple[np.ndarray, np.ndarray, int]:
+        cells, order = self._indices(snake.positions)
+        head = int(cells[0]) if len(order) and order[0] == 0 else -1
+        # A self-overlapping cell keeps its position nearest the head.
+        cells, first = np.unique(cells, return_index=True)
+        return cells, order[first], head
+
+    def _prepare(self, game) -> None:
+        self._game, self._version = game, game.version
+        flat = self._flat
+        flat[FOOD].fill(0.0)
+        flat[TAIL_DISTANCE].fill(0.0)
+        self._bodies.fill(0.0)
+        self._heads.fill(0.0)
+        self._cells.clear()
+        if game.foods:
+            flat[FOOD, self._indices(list(game.foods))[0]] = 1.0
+        for other in game.snakes:
+            cells, order, head = self._snake_cells(other)
+            length = len(other.positions)
+            flat[TAIL_DISTANCE, cells] = (length - order) / length
+            self._bodies[cells] += 1.0
+            if head >= 0:
+                self._heads[head] += 1.0
+            self._cells[id(other)] = cells, head
+
+    def encode(self, game, snake, out: np.ndarray | None = None) -> np.ndarray:
+        if game is not self._game or game.version != self._version:
+            self._prepare(game)
+        flat = self._flat
+        enemies = flat[ENEMY_HEADS : ENEMY_BODIES + 1]
+        enemies[0] = self._heads
+        enemies[1] = self._bodies
+        own = self._cells.get(id(snake))
+        if own is None:
+            body, _, head = self._snake_cells(snake)
+        else:
+            body, head = own
+            flat[ENEMY_BODIES, body] -= 1.0
+            if head >= 0:
+                flat[ENEMY_HEADS, head] -= 1.0
+        np.minimum(enemies, 1.0, out=enemies)
+        flat[OWN_BODY].fill(0.0)
+        flat[OWN_BODY, body] = 1.0
+        flat[OWN_HEAD].fill(0.0)
+        if head >= 0:
+            flat[OWN_HEAD, head] = 1.0
+        if out is None:
+            out = self.output
+        if self.crop is None:
+            np.copyto(out, self.planes)
+        else:
+            x, y = snake.positions[0]
+            x = min(max(x, 0), self.max_x - 1)
+            y = min(max(y, 0), self.max_y - 1)
+            size = 2 * self.crop + 1
+            np.copyto(out, self.planes[:, x : x + size, y : y + size])
+        return out
+
+
+def symmetry(observation: np.ndarray, transform: int) -> np.ndarray:
+    rotated = np.rot90(observation, transform % 4, axes=(-2, -1))
+    return rotated[..., ::-1] if transform >= 4 else rotated
+
+
+def _move_table(transform: int) -> tuple[GameMove, ...]:
+    table = []
+    for dx, dy in MOVE_OFFSETS:
+        grid = np.zeros((3, 3))
+        grid[1 + dx, 1 + dy] = 1
+        ((x, y),) = np.argwhere(symmetry(grid, transform))
+        table.append(MOVES[MOVE_OFFSETS.index((x - 1, y - 1))])
+    return tuple(table)
+
+
+SYMMETRY_MOVES = tuple(
+    {move: moved for move, moved in zip(MOVES, _move_table(t))}
+    for t in range(SYMMETRIES)
+)
+
+
+def augment(
+    observation: np.ndarray, move: GameMove
+) -> Iterator[tuple[np.ndarray, GameMove]]:
+    for transform in range(SYMMETRIES):
+        yield symmetry(observation, transform), SYMMETRY_MOVES[transform][move]
+
+
+@dataclass(frozen=True)
+class Transition:
+    player: int | UUID
+    observation: np.ndarray = field(repr=False)
+    action: GameMove | None
+    reward: float
+    done: bool
+
+
+def default_reward(game_master: GameMaster, player_id: int | UUID) -> float:
+    if player_id in game_master.rankings:
+        return -1.0
+    if len(game_master.active_players) == 1:
+        return 1.0
+    return 0.0
+
+
+def transitions(
+    game_master: GameMaster,
+    encoder: ObservationEncoder,
+    max_ticks: int | None = None,
+    reward: Callable[[GameMaster, int | UUID], float] = default_reward,
+    copy: bool = False,
+) -> Iterator[Transition]:
+    # Without copy, each player's observation buffer is reused every tick.
+    buffers = {}
+    ticks = 0
+    while len(game_master.active_players) > 1 and (
+        max_ticks is None or ticks < max_ticks
+    ):
+        players = list(game_master.active_players)
+        for player in players:
+            if player.id not in buffers:
+                buffers[player.id] = encoder.empty()
+            snake = game_master.players_snakes[player.id]
+            encoder.encode(game_master.game, snake, buffers[player.id])
+        game_master.tick()
+        ticks += 1
+        finished = len(game_master.active_players) <= 1
+        for player in players:
+            observation = buffers[player.id]
+            yield Transition(
+                player.id,
+                observation.copy() if copy else observation,
+                game_master.last_moves.get(player.id),
+                reward(game_master, player.id),
+                finished or player.id in game_master.rankings,
+            )
@@ -0,0 +1,5 @@
+from typing import Protocol
+
+
+class TickObserver(Protocol):
+    def on_tick(self, game_master) -> None: ...
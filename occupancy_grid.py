@@ -0,0 +1,137 @@
+from dataclasses import dataclass, field
+from snake import Snake
+
+
+@dataclass(slots=True)
+class OccupancyGrid:
+    max_x: int
+    max_y: int
+    owners: list[int] = field(default_factory=list)
+    shared: set[int] = field(default_factory=set)
+    out_of_bounds: dict[int, int] = field(default_factory=dict)
+    malformed: set[int] = field(default_factory=set)
+
+    def __post_init__(self) -> None:
+        if not self.owners:
+            self.owners = [0] * (self.max_x * self.max_y)
+
+    def __deepcopy__(self, memo) -> "OccupancyGrid":
+        def rekey(key: int) -> int:
+            return id(memo[key]) if key in memo else key
+
+        copy = OccupancyGrid(
+            self.max_x,
+            self.max_y,
+            self.owners[:],
+            set(self.shared),
+            {rekey(key): count for key, count in self.out_of_bounds.items()},
+            {rekey(key) for key in self.malformed},
+        )
+        memo[id(self)] = copy
+        return copy
+
+    def index(self, position: tuple[int, int]) -> int | None:
+        x, y = position
+        if 0 <= x < self.max_x and 0 <= y < self.max_y:
+            return y * self.max_x + x
+        return None
+
+    def position(self, cell: int) -> tuple[int, int]:
+        return cell % self.max_x, cell // self.max_x
+
+    def add_snake(self, snake: Snake) -> list[tuple[int, int]]:
+        key = id(snake)
+        self.out_of_bounds[key] = 0
+        if not snake.is_valid():
+            self.malformed.add(key)
+        taken = []
+        for position, count in snake.cells.items():
+            cell = self.index(position)
+            if cell is None:
+                self.out_of_bounds[key] += count
+            elif self._claim(cell):
+                taken.append(position)
+        return taken
+
+    def remove_snake(self, snake: Snake) -> list[tuple[int, int]]:
+        key = id(snake)
+        del self.out_of_bounds[key]
+        self.malformed.discard(key)
+        released = []
+        for position in snake.cells:
+            cell = self.index(position)
+            if cell is not None and self._release(cell):
+                released.append(position)
+        return released
+
+    def move_snake(
+        self, snake: Snake
+    ) -> tuple[tuple[int, int] | None, tuple[int, int] | None]:
+        head, tail = snake.get_head(), snake.previous_position
+        self._check_form(snake, 0, 1)
+        if head == tail:
+            return None, None
+        return self._occupy(snake, head), self._vacate(snake, tail)
+
+    def grow_snake(
+        self, snake: Snake, position: tuple[int, int]
+    ) -> tuple[int, int] | None:
+        self._check_form(snake, -1, -2)
+        return self._occupy(snake, position)
+
+    def _check_form(self, snake: Snake, end: int, neighbour: int) -> None:
+        # Only the changed end can break a valid snake; a malformed one may
+        # become valid once its gap has moved through, so recheck it whole.
+        key = id(snake)
+        if key in self.malformed:
+            if snake.is_valid():
+                self.malformed.discard(key)
+        elif snake.get_length() > 1:
+            (x1, y1), (x2, y2) = snake.positions[end], snake.positions[neighbour]
+            if abs(x1 - x2) + abs(y1 - y2) != 1:
+                self.malformed.add(key)
+
+    def _occupy(
+        self, snake: Snake, position: tuple[int, int]
+    ) -> tuple[int, int] | None:
+        cell = self.index(position)
+        if cell is None:
+            self.out_of_bounds[id(snake)] += 1
+        elif snake.cells[position] == 1 and self._claim(cell):
+            return position
+        return None
+
+    def _vacate(
+        self, snake: Snake, position: tuple[int, int]
+    ) -> tuple[int, int] | None:
+        cell = self.index(position)
+        if cell is None:
+            self.out_of_bounds[id(snake)] -= 1
+        elif position not in snake.cells and self._release(cell):
+            return position
+        return None
+
+    def _claim(self, cell: int) -> bool:
+        self.owners[cell] += 1
+        if self.owners[cell] == 2:
+            self.shared.add(cell)
+        return self.owners[cell] == 1
+
+    def _release(self, cell: int) -> bool:
+        self.owners[cell] -= 1
+        if self.owners[cell] == 1:
+            self.shared.discard(cell)
+        return self.owners[cell] == 0
+
+    def is_occupied(self, position: tuple[int, int]) -> bool:
+        cell = self.index(position)
+        return cell is not None and self.owners[cell] > 0
+
+    def is_settled(self, snake: Snake) -> bool:
+        return id(snake) in self.out_of_bounds and not self.is_dead(snake)
+
+    def is_dead(self, snake: Snake) -> bool:
+        key = id(snake)
+        if key in self.malformed or self.out_of_bounds[key]:
+            return True
+        return any(self.position(cell) in snake.cells for cell in self.shared)
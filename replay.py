@@ -0,0 +1,199 @@
+from collections.abc import Callable
+from copy import deepcopy
+from dataclasses import dataclass, field
+from pathlib import Path
+from struct import Struct
+from game_master import GameMaster
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+
+MAGIC = b"SNKR"
+VERSION = 1
+HEADER = Struct("<4sBHHQHH")
+COUNT = Struct("<H")
+POSITION = Struct("<hh")
+NO_MOVE = 0
+RAISED = 0xFF
+
+
+class ReplayedException(Exception):
+    pass
+
+
+@dataclass
+class ReplayRecorder:
+    seed: int
+    max_x: int
+    max_y: int
+    players: list = field(default_factory=list)
+    snakes: list[list[tuple[int, int]]] = field(default_factory=list)
+    foods: list[tuple[int, int]] = field(default_factory=list)
+    moves: bytearray = field(default_factory=bytearray)
+
+    @classmethod
+    def attach(cls, game_master: GameMaster, seed: int) -> "ReplayRecorder":
+        game = game_master.game
+        game.seed(seed)
+        game.update_empty_spaces()
+        recorder = cls(seed, game.max_x, game.max_y)
+        for id in game_master.players_dict:
+            recorder.players.append(id)
+            recorder.snakes.append(list(game_master.players_snakes[id].positions))
+        recorder.foods = sorted(game.foods)
+        game_master.observers.append(recorder)
+        return recorder
+
+    def on_tick(self, game_master: GameMaster) -> None:
+        for id in self.players:
+            if id not in game_master.last_moves:
+                self.moves.append(NO_MOVE)
+            elif game_master.last_moves[id] is None:
+                self.moves.append(RAISED)
+            else:
+                self.moves.append(game_master.last_moves[id].value)
+
+    def to_bytes(self) -> bytes:
+        return Replay(
+            self.seed,
+            self.max_x,
+            self.max_y,
+            self.snakes,
+            self.foods,
+            bytes(self.moves),
+        ).to_bytes()
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_bytes(self.to_bytes())
+
+
+@dataclass
+class ReplayClock:
+    tick: int = 0
+
+
+@dataclass
+class ReplayPlayer:
+    id: int
+    replay: "Replay"
+    clock: ReplayClock
+
+    def move(self, game, snake) -> GameMove:
+        code = self.replay.move_code(self.clock.tick, self.id)
+        if code == RAISED:
+            raise ReplayedException(
+                f"player {self.id} raised at tick {self.clock.tick}"
+            )
+        if code == NO_MOVE:
+            raise ReplayedException(
+                f"no move for player {self.id} at {self.clock.tick}"
+            )
+        return GameMove(code)
+
+
+@dataclass
+class Replay:
+    seed: int
+    max_x: int
+    max_y: int
+    snakes: list[list[tuple[int, int]]]
+    foods: list[tuple[int, int]]
+    moves: bytes
+    checkpoint_interval: int = 256
+    setup: Callable[[GameMaster], None] | None = field(
+        default=None, repr=False, compare=False
+    )
+    checkpoints: dict[int, tuple[GameMaster, ReplayClock]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    def __deepcopy__(self, memo) -> "Replay":
+        return self
+
+    def __len__(self) -> int:
+        return len(self.moves) // len(self.snakes) if self.snakes else 0
+
+    def move_code(self, tick: int, player: int) -> int:
+        return self.moves[tick * len(self.snakes) + player]
+
+    def moves_at(self, tick: int) -> list[GameMove | None]:
+        codes = (self.move_code(tick, player) for player in range(len(self.snakes)))
+        return [None if code in (NO_MOVE, RAISED) else GameMove(code) for code in codes]
+
+    def to_bytes(self) -> bytes:
+        parts = [
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                self.max_x,
+                self.max_y,
+                self.seed,
+                len(self.snakes),
+                len(self.foods),
+            )
+        ]
+        for positions in self.snakes:
+            parts.append(COUNT.pack(len(positions)))
+            parts.extend(POSITION.pack(*position) for position in positions)
+        parts.extend(POSITION.pack(*food) for food in self.foods)
+        parts.append(self.moves)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        magic, version, max_x, max_y, seed, num_snakes, num_foods = HEADER.unpack_from(
+            data
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a snakey replay")
+        offset = HEADER.size
+        snakes = []
+        for _ in range(num_snakes):
+            (length,) = COUNT.unpack_from(data, offset)
+            offset += COUNT.size
+            snakes.append(
+                [
+                    POSITION.unpack_from(data, offset + i * POSITION.size)
+                    for i in range(length)
+                ]
+            )
+            offset += length * POSITION.size
+        foods = [
+            POSITION.unpack_from(data, offset + i * POSITION.size)
+            for i in range(num_foods)
+        ]
+        offset += num_foods * POSITION.size
+        return cls(seed, max_x, max_y, snakes, foods, bytes(data[offset:]))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Replay":
+        return cls.from_bytes(Path(path).read_bytes())
+
+    def _initial(self) -> tuple[GameMaster, ReplayClock]:
+        clock = ReplayClock()
+        game = SnakeyGame(self.max_x, self.max_y, foods=set(self.foods))
+        game_master = GameMaster(game)
+        for i, positions in enumerate(self.snakes):
+            game_master.add_player(ReplayPlayer(i, self, clock), Snake(positions))
+        game.seed(self.seed)
+        game.update_empty_spaces()
+        if self.setup:
+            self.setup(game_master)
+        return game_master, clock
+
+    def game_master_at(self, tick: int) -> GameMaster:
+        if not 0 <= tick <= len(self):
+            raise IndexError(f"tick {tick} outside replay of {len(self)} ticks")
+        start = max((t for t in self.checkpoints if t <= tick), default=None)
+        if start is None:
+            start, state = 0, self._initial()
+        else:
+            state = self.checkpoints[start]
+        game_master, clock = deepcopy(state)
+        for clock.tick in range(start, tick):
+            if clock.tick and clock.tick % self.checkpoint_interval == 0:
+                self.checkpoints.setdefault(clock.tick, deepcopy((game_master, clock)))
+            game_master.tick()
+        return game_master
+
+    def game_at(self, tick: int) -> SnakeyGame:
+        return self.game_master_at(tick).game
@@ -0,0 +1,93 @@
+import asyncio
+import inspect
+from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from time import perf_counter
+from uuid import UUID
+from player import Player
+from snake import GameMove
+
+# Recent decisions kept per player, so long runs use bounded memory.
+LATENCY_WINDOW = 1024
+
+
+@dataclass
+class Decision:
+    move: GameMove | None
+    latency: float
+    timed_out: bool = False
+    error: BaseException | None = None
+
+
+@dataclass
+class MoveScheduler:
+    time_limit: float | None = None
+    fallback: GameMove | None = None
+    max_workers: int | None = None
+    executor: Executor | None = None
+    latencies: dict[int | UUID, deque[float]] = field(default_factory=dict)
+    # Sync calls still holding a worker after timing out, by player id.
+    running: dict[int | UUID, Future] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        self._loop = None
+        self._owns_executor = self.executor is None
+
+    def decide(
+        self, players: Sequence[Player], arguments: Sequence[tuple]
+    ) -> dict[int | UUID, Decision]:
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self.decide_async(players, arguments))
+
+    async def decide_async(
+        self, players: Sequence[Player], arguments: Sequence[tuple]
+    ) -> dict[int | UUID, Decision]:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(self.max_workers)
+        decisions = await asyncio.gather(
+            *(self._decide(player, *args) for player, args in zip(players, arguments))
+        )
+        results = {}
+        for player, decision in zip(players, decisions):
+            if player.id not in self.latencies:
+                self.latencies[player.id] = deque(maxlen=LATENCY_WINDOW)
+            self.latencies[player.id].append(decision.latency)
+            results[player.id] = decision
+        return results
+
+    async def _decide(self, player: Player, game, snake) -> Decision:
+        start = perf_counter()
+        if inspect.iscoroutinefunction(player.move):
+            pending = player.move(game, snake)
+        else:
+            # Threads cannot be interrupted, so a bot whose timed out call is
+            # still running is not dispatched again; it keeps the fallback
+            # until that call returns instead of piling up in the pool.
+            previous = self.running.get(player.id)
+            if previous is not None:
+                if not previous.done():
+                    # Counted as a full timeout, since the bot is still slow.
+                    return Decision(self.fallback, self.time_limit, timed_out=True)
+                del self.running[player.id]
+            future = self.executor.submit(player.move, game, snake)
+            pending = asyncio.wrap_future(future)
+        try:
+            move = await asyncio.wait_for(pending, self.time_limit)
+        except asyncio.TimeoutError:
+            if not inspect.iscoroutinefunction(player.move):
+                self.running[player.id] = future
+            return Decision(self.fallback, perf_counter() - start, timed_out=True)
+        except Exception as e:
+            return Decision(None, perf_counter() - start, error=e)
+        return Decision(move, perf_counter() - start)
+
+    def close(self) -> None:
+        if self._owns_executor and self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        if self._loop is not None:
+            self._loop.close()
+            self._loop = None
@@ -0,0 +1,249 @@
+import asyncio
+import inspect
+import json
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from time import perf_counter
+from uuid import UUID
+from game_master import GameMaster
+from player import Player
+from scheduler import LATENCY_WINDOW, MoveScheduler
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+
+
+@dataclass
+class HostedGame:
+    game_id: int
+    game_master: GameMaster
+    max_ticks: int | None = None
+    ticks: int = 0
+    # Ticks that finished after their slot; the schedule skips ahead instead
+    # of bursting to catch up.
+    late_ticks: int = 0
+    finished: bool = False
+    latencies: deque[float] = field(
+        default_factory=lambda: deque(maxlen=LATENCY_WINDOW), repr=False
+    )
+    # Set when the host made the game's scheduler, so it also closes it.
+    scheduler: MoveScheduler | None = field(default=None, repr=False)
+
+    @property
+    def running(self) -> bool:
+        return len(self.game_master.active_players) > 1 and (
+            self.max_ticks is None or self.ticks < self.max_ticks
+        )
+
+
+@dataclass
+class GameHost:
+    # Ticks per second for every game; None runs games as fast as possible.
+    tick_rate: float | None = 10.0
+    # Bounds how many games may be waiting on bots at once.
+    max_concurrent_ticks: int | None = None
+    # Settings for each game's scheduler. Games share its thread pool but not
+    # its per-player state, since player ids repeat across games.
+    scheduler: MoveScheduler = field(default_factory=MoveScheduler)
+    games: dict[int, HostedGame] = field(default_factory=dict)
+
+    def add_game(
+        self, game_master: GameMaster, max_ticks: int | None = None
+    ) -> HostedGame:
+        hosted = HostedGame(len(self.games), game_master, max_ticks)
+        if game_master.scheduler is None:
+            if self.scheduler.executor is None:
+                self.scheduler.executor = ThreadPoolExecutor(self.scheduler.max_workers)
+            hosted.scheduler = MoveScheduler(
+                self.scheduler.time_limit,
+                self.scheduler.fallback,
+                executor=self.scheduler.executor,
+            )
+            game_master.scheduler = hosted.scheduler
+        self.games[hosted.game_id] = hosted
+        return hosted
+
+    async def run(self) -> None:
+        limit = self.max_concurrent_ticks or len(self.games) or 1
+        self._slots = asyncio.Semaphore(limit)
+        await asyncio.gather(
+            *(self._run_game(hosted) for hosted in self.games.values())
+        )
+
+    async def _run_game(self, hosted: HostedGame) -> None:
+        loop = asyncio.get_running_loop()
+        period = 1 / self.tick_rate if self.tick_rate else 0.0
+        due = loop.time()
+        while hosted.running:
+            start = perf_counter()
+            async with self._slots:
+                await hosted.game_master.tick_async()
+            hosted.latencies.append(perf_counter() - start)
+            hosted.ticks += 1
+            due += period
+            delay = due - loop.time()
+            if delay < 0:
+                if period:
+                    hosted.late_ticks += 1
+                due = loop.time()
+            # Always yield so every game gets a turn between our ticks.
+            await asyncio.sleep(max(delay, 0))
+        hosted.finished = True
+
+    def latencies(self) -> list[float]:
+        return [
+            latency for hosted in self.games.values() for latency in hosted.latencies
+        ]
+
+    def close(self) -> None:
+        for hosted in self.games.values():
+            if hosted.scheduler is not None:
+                hosted.scheduler.close()
+        self.scheduler.close()
+
+
+def encode_state(game, snake) -> dict:
+    snakes = list(game.snakes)
+    you = next((i for i, other in enumerate(snakes) if other is snake), None)
+    if you is None:
+        heads = [other.get_head() for other in snakes]
+        you = heads.index(snake.get_head())
+    return {
+        "max_x": game.max_x,
+        "max_y": game.max_y,
+        "snakes": [[list(position) for position in s.positions] for s in snakes],
+        "foods": [list(food) for food in game.foods],
+        "you": you,
+    }
+
+
+def decode_state(state: dict) -> tuple[SnakeyGame, Snake]:
+    game = SnakeyGame(
+        state["max_x"],
+        state["max_y"],
+        foods={tuple(food) for food in state["foods"]},
+    )
+    for positions in state["snakes"]:
+        game.add_snake(Snake([tuple(position) for position in positions]))
+    return game, game.snakes[state["you"]]
+
+
+@dataclass
+class RemotePlayer:
+    id: int | UUID
+    reader: asyncio.StreamReader = field(repr=False)
+    writer: asyncio.StreamWriter = field(repr=False)
+
+    def __post_init__(self) -> None:
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def connect(cls, id: int | UUID, host: str, port: int) -> "RemotePlayer":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(id, reader, writer)
+
+    async def move(self, game, snake) -> GameMove:
+        request = json.dumps(encode_state(game, snake)).encode() + b"\n"
+        async with self._lock:
+            self.writer.write(request)
+            await self.writer.drain()
+            line = await self.reader.readline()
+        if not line:
+            raise ConnectionError(f"remote player {self.id} disconnected")
+        reply = json.loads(line)
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return GameMove[reply["move"]]
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def serve_player(
+    player: Player, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        while line := await reader.readline():
+            game, snake = decode_state(json.loads(line))
+            try:
+                if inspect.iscoroutinefunction(player.move):
+                    move = await player.move(game, snake)
+                else:
+                    # Off the event loop, so a slow bot only holds up its own
+                    # connection.
+                    move = await loop.run_in_executor(None, player.move, game, snake)
+                reply = {"move": move.name}
+            except Exception as e:
+                reply = {"error": repr(e)}
+            writer.write(json.dumps(reply).encode() + b"\n")
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def start_player_server(
+    factory: Callable[[], Player], host: str = "127.0.0.1", port: int = 0
+) -> asyncio.Server:
+    async def handle(reader, writer) -> None:
+        await serve_player(factory(), reader, writer)
+
+    return await asyncio.start_server(handle, host, port)
+
+
+@dataclass
+class LoadResult:
+    games: int
+    ticks: int
+    seconds: float
+    late_ticks: int
+    p99_latency: float
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.ticks / self.seconds if self.seconds else 0.0
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+async def load_test(
+    game_counts: list[int],
+    factory: Callable[[], Player],
+    players_per_game: int = 4,
+    max_x: int = 11,
+    max_y: int = 11,
+    ticks: int = 100,
+    tick_rate: float | None = None,
+    time_limit: float | None = None,
+) -> list[LoadResult]:
+    results = []
+    for count in game_counts:
+        host = GameHost(tick_rate, scheduler=MoveScheduler(time_limit))
+        for _ in range(count):
+            game_master = GameMaster(SnakeyGame(max_x, max_y))
+            for i in range(players_per_game):
+                player = factory()
+                player.id = i
+                game_master.add_player(player)
+            host.add_game(game_master, ticks)
+        start = perf_counter()
+        await host.run()
+        seconds = perf_counter() - start
+        host.close()
+        results.append(
+            LoadResult(
+                count,
+                sum(hosted.ticks for hosted in host.games.values()),
+                seconds,
+                sum(hosted.late_ticks for hosted in host.games.values()),
+                percentile(host.latencies(), 0.99),
+            )
+        )
+    return results
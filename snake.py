@@ -1,5 +1,11 @@
+from collections import Counter, deque
 from dataclasses import dataclass, field
 from enum import Enum, auto
+from itertools import islice
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from arena import CellTable
 
 
 class GameMove(Enum):
@@ -9,10 +15,33 @@ class GameMove(Enum):
     RIGHT = auto()
 
 
-@dataclass
+MOVE_DELTAS = {
+    GameMove.UP: (1, 0),
+    GameMove.DOWN: (-1, 0),
+    GameMove.LEFT: (0, -1),
+    GameMove.RIGHT: (0, 1),
+}
+MOVES = tuple(GameMove)
+MOVE_OFFSETS = tuple(MOVE_DELTAS[move] for move in MOVES)
+
+
+@dataclass(slots=True)
 class Snake:
-    positions: list[tuple[int, int]]
+    positions: deque[tuple[int, int]]
     previous_position: tuple[int, int] = None
+    cells: Counter = field(default_factory=Counter, repr=False, compare=False)
+    interner: "CellTable | None" = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.positions = deque(self.positions)
+        self.cells = Counter(self.positions)
+
+    def reset(self, positions) -> None:
+        self.positions.clear()
+        self.positions.extend(positions)
+        self.cells.clear()
+        self.cells.update(self.positions)
+        self.previous_position = None
 
     def get_length(self) -> int:
         return len(self.positions)
@@ -21,38 +50,37 @@ class Snake:
         return self.positions[0]
 
     def get_positions(self) -> list[tuple[int, int]]:
-        return self.positions
+        return list(self.positions)
+
+    def occupies(self, position: tuple[int, int]) -> bool:
+        return position in self.cells
+
+    def is_self_colliding(self) -> bool:
+        return len(self.cells) < len(self.positions)
 
     def add_size(self) -> None:
         if self.previous_position:
             self.positions.append(self.previous_position)
+            self.cells[self.previous_position] += 1
             self.previous_position = None
 
     def move(self, move: GameMove) -> None:
-        match move:
-            case GameMove.UP:
-                self.positions.insert(
-                    0, (self.positions[0][0] + 1, self.positions[0][1])
-                )
-            case GameMove.DOWN:
-                self.positions.insert(
-                    0, (self.positions[0][0] - 1, self.positions[0][1])
-                )
-            case GameMove.LEFT:
-                self.positions.insert(
-                    0, (self.positions[0][0], self.positions[0][1] - 1)
-                )
-            case GameMove.RIGHT:
-                self.positions.insert(
-                    0, (self.positions[0][0], self.positions[0][1] + 1)
-                )
-        self.previous_position = self.positions[-1]
-        self.positions = self.positions[:-1]
+        dx, dy = MOVE_DELTAS[move]
+        x, y = self.positions[0]
+        if self.interner is None:
+            head = (x + dx, y + dy)
+        else:
+            head = self.interner.at(x + dx, y + dy)
+        self.positions.appendleft(head)
+        self.cells[head] += 1
+        tail = self.positions.pop()
+        self.cells[tail] -= 1
+        if not self.cells[tail]:
+            del self.cells[tail]
+        self.previous_position = tail
 
     def is_valid(self) -> bool:
-        for i in range(len(self.positions) - 1):
-            x1, y1 = self.positions[i]
-            x2, y2 = self.positions[i + 1]
+        for (x1, y1), (x2, y2) in zip(self.positions, islice(self.positions, 1, None)):
             if not abs(x1 - x2) + abs(y1 - y2) == 1:
                 return False
         return True
@@ -1,11 +1,18 @@
 from dataclasses import dataclass, field
 from itertools import product, combinations
-from random import sample
-from snake import GameMove, Snake
+from snake import MOVE_OFFSETS, MOVES, GameMove, Snake
 from copy import deepcopy
+from occupancy_grid import OccupancyGrid
+from free_cells import FreeCells
+from food import FoodIndex
+from arena import CellTable
+from analysis import BoardAnalysis
+from instrumentation import Instrumentation
+from random import Random
+from time import perf_counter
 
 
-@dataclass
+@dataclass(slots=True)
 class SnakeyGame:
     max_x: int
     max_y: int
@@ -13,27 +20,214 @@ class SnakeyGame:
     empty_spaces_changed: bool = True
     snakes: list[Snake] = field(default_factory=list)
     foods: set[tuple[int, int]] = field(default_factory=set)
+    occupancy: OccupancyGrid | None = field(default=None, repr=False, compare=False)
+    free_cells: FreeCells = field(default_factory=FreeCells, repr=False, compare=False)
+    rng: Random = field(default_factory=Random, repr=False, compare=False)
+    food_index: FoodIndex | None = field(default=None, repr=False, compare=False)
+    cell_table: CellTable | None = field(default=None, repr=False, compare=False)
+    # Index of each snake in snakes by id(); rebuilt whenever it is stale.
+    snake_slots: dict[int, int] = field(default_factory=dict, repr=False, compare=False)
+    # Bumped by every mutation; the shared analysis is rebuilt when it lags.
+    version: int = field(default=0, repr=False, compare=False)
+    analysis_cache: BoardAnalysis | None = field(
+        default=None, repr=False, compare=False
+    )
+    # Set by an instrumented GameMaster to time lazy free-cell rebuilds.
+    instrumentation: Instrumentation | None = field(
+        default=None, repr=False, compare=False
+    )
+
+    def seed(self, seed: int) -> None:
+        self.rng.seed(seed)
+
+    def reset(
+        self,
+        max_x: int | None = None,
+        max_y: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        max_x, max_y = max_x or self.max_x, max_y or self.max_y
+        if (max_x, max_y) != (self.max_x, self.max_y):
+            self.max_x, self.max_y = max_x, max_y
+            self.occupancy = None
+            if self.cell_table is not None:
+                self.cell_table = CellTable(max_x, max_y)
+        elif self.occupancy is not None:
+            # Releasing every snake zeroes the grid without reallocating it.
+            for snake in self.snakes:
+                self.occupancy.remove_snake(snake)
+        self.snakes.clear()
+        self.snake_slots.clear()
+        self.foods.clear()
+        self.food_index = None
+        self.empty_spaces_changed = True
+        self.version += 1
+        if seed is not None:
+            self.seed(seed)
+
+    def _all_cells(self):
+        if self.cell_table is None:
+            return product(range(self.max_x), range(self.max_y))
+        at = self.cell_table.at
+        return (at(x, y) for x in range(self.max_x) for y in range(self.max_y))
 
     def update_empty_spaces(self) -> None:
-        snake_positions = {
-            position for snake in self.snakes for position in snake.get_positions()
-        }
-        self.empty_spaces = [
+        occupancy = self.get_occupancy()
+        self.free_cells.reset(
             x
-            for x in product(range(self.max_x), range(self.max_y))
-            if x not in snake_positions and x not in self.foods
-        ]
+            for x in self._all_cells()
+            if not occupancy.is_occupied(x) and x not in self.foods
+        )
+        self.empty_spaces = self.free_cells.cells
         self.empty_spaces_changed = False
 
+    def _rebuild_empty_spaces(self) -> None:
+        if self.instrumentation is None:
+            self.update_empty_spaces()
+            return
+        start = perf_counter()
+        self.update_empty_spaces()
+        self.instrumentation.observe("update_empty_spaces", start)
+
     def get_empty_spaces(self) -> list[tuple[int, int]]:
         if self.empty_spaces_changed:
-            self.update_empty_spaces()
+            self._rebuild_empty_spaces()
         return self.empty_spaces
 
+    def random_empty_space(self) -> tuple[int, int]:
+        self.get_empty_spaces()
+        return self.free_cells.choice(self.rng)
+
+    def sample_empty_spaces(self, count: int) -> list[tuple[int, int]]:
+        self.get_empty_spaces()
+        return self.free_cells.sample(count, self.rng)
+
+    def _take_spaces(self, positions: list[tuple[int, int]]) -> None:
+        if not self.empty_spaces_changed:
+            for position in positions:
+                self.free_cells.remove(position)
+
+    def _free_spaces(self, positions: list[tuple[int, int]]) -> None:
+        if not self.empty_spaces_changed:
+            for position in positions:
+                if position not in self.foods:
+                    self.free_cells.add(position)
+
+    def get_occupancy(self) -> OccupancyGrid:
+        if self.occupancy is None:
+            self.occupancy = self._new_occupancy()
+            for snake in self.snakes:
+                self.occupancy.add_snake(snake)
+        return self.occupancy
+
+    def _new_occupancy(self) -> OccupancyGrid:
+        return OccupancyGrid(self.max_x, self.max_y)
+
+    def count_empty_spaces(self) -> int:
+        return len(self.get_empty_spaces())
+
+    def invalidate_occupancy(self) -> None:
+        self.version += 1
+        self.occupancy = None
+        self.food_index = None
+        self.empty_spaces_changed = True
+
+    def get_food_index(self) -> FoodIndex:
+        if self.food_index is None:
+            self.food_index = FoodIndex()
+            for food in self.foods:
+                self.food_index.add(food)
+        return self.food_index
+
+    def _index_foods(self, foods: list[tuple[int, int]]) -> None:
+        self.version += 1
+        if self.food_index is not None:
+            for food in foods:
+                self.food_index.add(food)
+
+    def nearest_foods(
+        self, position: tuple[int, int], k: int = 1
+    ) -> list[tuple[int, int]]:
+        return self.get_food_index().nearest(position, k)
+
+    def foods_within(
+        self, position: tuple[int, int], radius: int
+    ) -> list[tuple[int, int]]:
+        return self.get_food_index().within(position, radius)
+
+    def consume_food(self, position: tuple[int, int]) -> bool:
+        if position not in self.foods:
+            return False
+        self.foods.remove(position)
+        self.version += 1
+        if self.food_index is not None:
+            self.food_index.remove(position)
+        if not self.get_occupancy().is_occupied(position):
+            self._free_spaces([position])
+        return True
+
+    def add_snake(self, snake: Snake) -> None:
+        occupancy = self.get_occupancy()
+        self.version += 1
+        self.snake_slots[id(snake)] = len(self.snakes)
+        self.snakes.append(snake)
+        self._take_spaces(occupancy.add_snake(snake))
+
+    def _slot_of(self, snake: Snake) -> int:
+        index = self.snake_slots.get(id(snake))
+        if (
+            index is None
+            or index >= len(self.snakes)
+            or self.snakes[index] is not snake
+        ):
+            self.snake_slots = {id(other): i for i, other in enumerate(self.snakes)}
+            index = self.snake_slots[id(snake)]
+        return index
+
+    def remove_snake(self, snake: Snake) -> None:
+        index = self._slot_of(snake)
+        self.version += 1
+        last = self.snakes.pop()
+        del self.snake_slots[id(snake)]
+        if last is not snake:
+            self.snakes[index] = last
+            self.snake_slots[id(last)] = index
+        self._free_spaces(self.get_occupancy().remove_snake(snake))
+
+    def move_snake(self, snake: Snake, move: GameMove) -> None:
+        occupancy = self.get_occupancy()
+        self.version += 1
+        snake.move(move)
+        taken, freed = occupancy.move_snake(snake)
+        if taken:
+            self._take_spaces([taken])
+        if freed:
+            self._free_spaces([freed])
+
+    def grow_snake(self, snake: Snake) -> None:
+        occupancy = self.get_occupancy()
+        position = snake.previous_position
+        self.version += 1
+        snake.add_size()
+        if position and (taken := occupancy.grow_snake(snake, position)):
+            self._take_spaces([taken])
+
+    def analysis(self) -> BoardAnalysis:
+        cache = self.analysis_cache
+        if cache is None or cache.version != self.version:
+            cache = self.analysis_cache = BoardAnalysis.of(self, self.version)
+        return cache
+
     def get_dead_snakes(self) -> list[Snake]:
-        return [snake for snake in self.snakes if not self.is_valid_snake(snake)]
+        occupancy = self.get_occupancy()
+        return [snake for snake in self.snakes if occupancy.is_dead(snake)]
 
     def is_valid_snake(self, snake: Snake) -> bool:
+        return self._is_valid_among(
+            snake, [other for other in self.snakes if other is not snake]
+        )
+
+    def _is_valid_among(self, snake: Snake, others: list[Snake]) -> bool:
         return (
             snake.is_valid()
             and all(
@@ -41,31 +235,49 @@ class SnakeyGame:
                 for square in snake.positions
             )
             and all(
-                square not in snake.positions
-                for snake2 in self.snakes
-                if snake2 is not snake
-                for square in snake2.positions
+                square not in snake.cells
+                for snake2 in others
+                for square in snake2.cells
             )
         )
 
     def is_valid_state(self) -> bool:
         return len(self.get_dead_snakes()) == 0
 
-    def get_valid_moves(self, original_snake: Snake) -> list[GameMove]:
-        valid_moves = []
-        self.snakes.remove(original_snake)
-        for move in GameMove:
+    def get_valid_moves(self, snake: Snake) -> list[GameMove]:
+        mask = self.get_valid_move_mask(snake)
+        return [move for i, move in enumerate(MOVES) if mask >> i & 1]
+
+    def get_valid_move_masks(self) -> list[int]:
+        return [self.get_valid_move_mask(snake) for snake in self.snakes]
+
+    def get_valid_move_mask(self, snake: Snake) -> int:
+        occupancy = self.get_occupancy()
+        if not occupancy.is_settled(snake):
+            return self._scan_valid_move_mask(snake)
+        owners, max_x, max_y = occupancy.owners, self.max_x, self.max_y
+        x, y = snake.get_head()
+        mask = 0
+        for i, (dx, dy) in enumerate(MOVE_OFFSETS):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < max_x and 0 <= ny < max_y:
+                taken = owners[ny * max_x + nx]
+                if not taken or (taken == 1 and (nx, ny) in snake.cells):
+                    mask |= 1 << i
+        return mask
+
+    def _scan_valid_move_mask(self, original_snake: Snake) -> int:
+        others = [other for other in self.snakes if other is not original_snake]
+        mask = 0
+        for i, move in enumerate(MOVES):
             snake = deepcopy(original_snake)
             snake.move(move)
-            self.snakes.append(snake)
-            if self.is_valid_snake(snake):
-                valid_moves.append(move)
-            self.snakes.remove(snake)
-        self.snakes.append(original_snake)
-        return valid_moves
+            if self._is_valid_among(snake, others):
+                mask |= 1 << i
+        return mask
 
     def add_food(self, count: int = 1) -> None:
-        empty_spaces = self.get_empty_spaces()
-        new_foods = sample(empty_spaces, k=min(count, len(empty_spaces)))
+        new_foods = self.sample_empty_spaces(count)
         self.foods.update(new_foods)
-        self.empty_spaces = [x for x in self.empty_spaces if x not in new_foods]
+        self._index_foods(new_foods)
+        self._take_spaces(new_foods)
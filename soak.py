@@ -0,0 +1,198 @@
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from random import Random
+from time import perf_counter
+import os
+import tracemalloc
+from game_master import GameMaster
+from food import FixedCount, FoodManager
+from instrumentation import Histogram
+from snake import GameMove, MOVES
+from snakey_game import SnakeyGame
+from termination import TickLimit
+
+TOP_ALLOCATORS = 10
+MEGABYTE = 2**20
+
+
+@dataclass
+class RandomPlayer:
+    id: int
+    rng: Random = field(default_factory=Random)
+
+    def move(self, game, snake) -> GameMove:
+        valid_moves = game.get_valid_moves(snake)
+        return self.rng.choice(valid_moves or MOVES)
+
+
+@dataclass
+class ScriptedPlayer:
+    id: int
+    moves: list[GameMove]
+    turn: int = 0
+
+    def move(self, game, snake) -> GameMove:
+        move = self.moves[self.turn % len(self.moves)]
+        self.turn += 1
+        return move
+
+
+@dataclass
+class SoakThresholds:
+    # Growth is measured against the first sample taken after warmup.
+    rss_growth: int = 64 * MEGABYTE
+    traced_growth: int = 16 * MEGABYTE
+    latency_drift: float = 2.0
+
+
+@dataclass
+class SoakSample:
+    tick: int
+    games: int
+    seconds: float
+    rss: int
+    traced: int
+    latency: Histogram
+
+    def to_dict(self) -> dict:
+        return {
+            "tick": self.tick,
+            "games": self.games,
+            "seconds": self.seconds,
+            "rss": self.rss,
+            "traced": self.traced,
+            "mean_latency": self.latency.mean,
+            "p99_latency": self.latency.quantile(0.99),
+        }
+
+
+@dataclass
+class SoakReport:
+    ticks: int = 0
+    games: int = 0
+    samples: list[SoakSample] = field(default_factory=list)
+    top_allocators: list[str] = field(default_factory=list)
+    failures: list[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.failures
+
+    @property
+    def latency_drift(self) -> float:
+        if len(self.samples) < 2 or not self.samples[0].latency.mean:
+            return 1.0
+        return self.samples[-1].latency.mean / self.samples[0].latency.mean
+
+    def growth(self, metric: str) -> int:
+        if not self.samples:
+            return 0
+        return getattr(self.samples[-1], metric) - getattr(self.samples[0], metric)
+
+    def to_dict(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "games": self.games,
+            "passed": self.passed,
+            "failures": self.failures,
+            "latency_drift": self.latency_drift,
+            "samples": [sample.to_dict() for sample in self.samples],
+            "top_allocators": self.top_allocators,
+        }
+
+
+def rss_bytes() -> int:
+    try:
+        pages = Path("/proc/self/statm").read_text().split()[1]
+        return int(pages) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        # Peak rather than current RSS, which still catches steady growth.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def random_game(seed: int, size: int = 11, players: int = 4) -> GameMaster:
+    rng = Random(seed)
+    game_master = GameMaster(
+        SnakeyGame(size, size, rng=Random(seed)),
+        food=FoodManager(FixedCount(players)),
+        # Random players can circle forever, so cap each game's length.
+        termination=[TickLimit(4 * size * size)],
+    )
+    for i in range(players):
+        game_master.add_player(RandomPlayer(i, Random(rng.random())))
+    game_master.game.add_food(players)
+    return game_master
+
+
+def soak(
+    ticks: int,
+    factory: Callable[[int], GameMaster] = random_game,
+    sample_every: int = 10_000,
+    warmup: int = 0,
+    thresholds: SoakThresholds | None = None,
+    trace: bool = True,
+) -> SoakReport:
+    thresholds = thresholds or SoakThresholds()
+    report = SoakReport()
+    tracing = trace and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    baseline = None
+    window = Histogram()
+    game_master = factory(report.games)
+    start = perf_counter()
+    try:
+        for tick in range(1, warmup + ticks + 1):
+            if game_master.is_over():
+                report.games += 1
+                game_master = factory(report.games)
+            begin = perf_counter()
+            game_master.tick()
+            window.observe(perf_counter() - begin)
+            if tick < warmup or (tick - warmup) % sample_every:
+                continue
+            # The first sample lands at the end of warmup and is the baseline.
+            traced = tracemalloc.get_traced_memory()[0] if trace else 0
+            report.samples.append(
+                SoakSample(
+                    tick - warmup,
+                    report.games,
+                    perf_counter() - start,
+                    rss_bytes(),
+                    traced,
+                    window,
+                )
+            )
+            window = Histogram()
+            if trace and baseline is None:
+                baseline = tracemalloc.take_snapshot()
+        report.ticks = ticks
+        if trace and baseline is not None:
+            growth = tracemalloc.take_snapshot().compare_to(baseline, "lineno")
+            report.top_allocators = [str(stat) for stat in growth[:TOP_ALLOCATORS]]
+    finally:
+        if tracing:
+            tracemalloc.stop()
+    check(report, thresholds)
+    return report
+
+
+def check(report: SoakReport, thresholds: SoakThresholds) -> None:
+    if report.growth("rss") > thresholds.rss_growth:
+        report.failures.append(
+            f"RSS grew {report.growth('rss') / MEGABYTE:.1f} MB"
+            f" (limit {thresholds.rss_growth / MEGABYTE:.1f} MB)"
+        )
+    if report.growth("traced") > thresholds.traced_growth:
+        report.failures.append(
+            f"Traced memory grew {report.growth('traced') / MEGABYTE:.1f} MB"
+            f" (limit {thresholds.traced_growth / MEGABYTE:.1f} MB)"
+        )
+    if report.latency_drift > thresholds.latency_drift:
+        report.failures.append(
+            f"Tick latency drifted {report.latency_drift:.2f}x"
+            f" (limit {thresholds.latency_drift:.2f}x)"
+        )
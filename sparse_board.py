@@ -0,0 +1,178 @@
+from array import array
+from dataclasses import dataclass, field
+from occupancy_grid import OccupancyGrid
+from snakey_game import SnakeyGame
+
+CHUNK_SIZE = 64
+REJECTION_TRIES = 64
+
+
+@dataclass
+class ChunkedOwners:
+    max_x: int
+    max_y: int
+    chunk_size: int = CHUNK_SIZE
+    chunks: dict[tuple[int, int], array] = field(default_factory=dict, repr=False)
+    # Occupied cells per stored chunk; a chunk is dropped when this reaches zero.
+    counts: dict[tuple[int, int], int] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return self.max_x * self.max_y
+
+    def __deepcopy__(self, memo) -> "ChunkedOwners":
+        return ChunkedOwners(
+            self.max_x,
+            self.max_y,
+            self.chunk_size,
+            {key: array("H", chunk) for key, chunk in self.chunks.items()},
+            dict(self.counts),
+        )
+
+    def _locate(self, cell: int) -> tuple[tuple[int, int], int]:
+        size = self.chunk_size
+        x, y = cell % self.max_x, cell // self.max_x
+        return (x // size, y // size), (y % size) * size + x % size
+
+    def __getitem__(self, cell: int) -> int:
+        key, offset = self._locate(cell)
+        chunk = self.chunks.get(key)
+        return chunk[offset] if chunk is not None else 0
+
+    def __setitem__(self, cell: int, value: int) -> None:
+        key, offset = self._locate(cell)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            if not value:
+                return
+            chunk = self.chunks[key] = array("H", bytes(2 * self.chunk_size**2))
+            self.counts[key] = 0
+        previous = chunk[offset]
+        chunk[offset] = value
+        if not previous and value:
+            self.counts[key] += 1
+        elif previous and not value:
+            self.counts[key] -= 1
+            if not self.counts[key]:
+                del self.chunks[key]
+                del self.counts[key]
+
+    def occupied(self) -> int:
+        return sum(self.counts.values())
+
+
+@dataclass
+class SparseGrid(OccupancyGrid):
+    chunk_size: int = CHUNK_SIZE
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.owners, ChunkedOwners):
+            self.owners = ChunkedOwners(self.max_x, self.max_y, self.chunk_size)
+
+    def __deepcopy__(self, memo) -> "SparseGrid":
+        def rekey(key: int) -> int:
+            return id(memo[key]) if key in memo else key
+
+        copy = SparseGrid(
+            self.max_x,
+            self.max_y,
+            self.owners.__deepcopy__(memo),
+            set(self.shared),
+            {rekey(key): count for key, count in self.out_of_bounds.items()},
+            {rekey(key) for key in self.malformed},
+            self.chunk_size,
+        )
+        memo[id(self)] = copy
+        return copy
+
+
+@dataclass
+class SparseSnakeyGame(SnakeyGame):
+    empty_spaces_changed: bool = False
+    chunk_size: int = CHUNK_SIZE
+
+    def _new_occupancy(self) -> SparseGrid:
+        return SparseGrid(self.max_x, self.max_y, chunk_size=self.chunk_size)
+
+    def update_empty_spaces(self) -> None:
+        self.empty_spaces_changed = False
+
+    def get_empty_spaces(self) -> list[tuple[int, int]]:
+        # Materialising is proportional to the board area; prefer the samplers.
+        occupancy = self.get_occupancy()
+        return [
+            (x, y)
+            for y in range(self.max_y)
+            for x in range(self.max_x)
+            if not occupancy.is_occupied((x, y)) and (x, y) not in self.foods
+        ]
+
+    def count_empty_spaces(self) -> int:
+        occupancy = self.get_occupancy()
+        covered = sum(not occupancy.is_occupied(food) for food in self.foods)
+        return self.max_x * self.max_y - occupancy.owners.occupied() - covered
+
+    def _is_free(self, x: int, y: int) -> bool:
+        return (
+            not self.get_occupancy().owners[y * self.max_x + x]
+            and (x, y) not in self.foods
+        )
+
+    def random_empty_space(self) -> tuple[int, int]:
+        for _ in range(REJECTION_TRIES):
+            x, y = self.rng.randrange(self.max_x), self.rng.randrange(self.max_y)
+            if self._is_free(x, y):
+                return x, y
+        return self._weighted_empty_space()
+
+    def _weighted_empty_space(self) -> tuple[int, int]:
+        size = self.chunk_size
+        owners = self.get_occupancy().owners
+        foods = {}
+        for x, y in self.foods:
+            if not owners[y * self.max_x + x]:
+                foods[x // size, y // size] = foods.get((x // size, y // size), 0) + 1
+        chunks = []
+        total = 0
+        for cy in range(0, self.max_y, size):
+            for cx in range(0, self.max_x, size):
+                key = cx // size, cy // size
+                area = min(size, self.max_x - cx) * min(size, self.max_y - cy)
+                free = area - owners.counts.get(key, 0) - foods.get(key, 0)
+                if free:
+                    chunks.append((free, cx, cy))
+                    total += free
+        if not total:
+            raise IndexError("Cannot choose from an empty board")
+        pick = self.rng.randrange(total)
+        for free, cx, cy in chunks:
+            if pick < free:
+                break
+            pick -= free
+        for y in range(cy, min(cy + size, self.max_y)):
+            for x in range(cx, min(cx + size, self.max_x)):
+                if self._is_free(x, y):
+                    if not pick:
+                        return x, y
+                    pick -= 1
+        raise IndexError("Free cell counts out of sync")
+
+    def sample_empty_spaces(self, count: int) -> list[tuple[int, int]]:
+        chosen = {}
+        for _ in range(min(count, self.count_empty_spaces())):
+            position = self.random_empty_space()
+            while position in chosen:
+                position = self.random_empty_space()
+            chosen[position] = None
+        return list(chosen)
+
+    def _take_spaces(self, positions: list[tuple[int, int]]) -> None:
+        pass
+
+    def _free_spaces(self, positions: list[tuple[int, int]]) -> None:
+        pass
+
+    def add_food(self, count: int = 1) -> None:
+        for _ in range(min(count, self.count_empty_spaces())):
+            food = self.random_empty_space()
+            self.foods.add(food)
+            self._index_foods([food])
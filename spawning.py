@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from math import dist
+from typing import Protocol
+from exceptions import NotEnoughSpaceException
+from snakey_game import SnakeyGame
+
+
+class SpawnStrategy(Protocol):
+    def positions(self, game: SnakeyGame, count: int) -> list[tuple[int, int]]: ...
+
+
+def _check_space(game: SnakeyGame, count: int) -> None:
+    if count > game.count_empty_spaces():
+        raise NotEnoughSpaceException(
+            f"Cannot spawn {count} snakes on {game.count_empty_spaces()} free cells"
+        )
+
+
+@dataclass
+class UniformSpawn:
+    def positions(self, game: SnakeyGame, count: int) -> list[tuple[int, int]]:
+        _check_space(game, count)
+        return game.sample_empty_spaces(count)
+
+
+@dataclass
+class PoissonDiscSpawn:
+    min_distance: float = 3.0
+    attempts: int = 30
+
+    def positions(self, game: SnakeyGame, count: int) -> list[tuple[int, int]]:
+        _check_space(game, count)
+        size = max(int(self.min_distance), 1)
+        buckets: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        chosen = []
+        for candidate in game.sample_empty_spaces(
+            min(count * self.attempts, game.count_empty_spaces())
+        ):
+            if len(chosen) == count:
+                break
+            bx, by = candidate[0] // size, candidate[1] // size
+            reach = int(self.min_distance // size) + 1
+            if all(
+                dist(candidate, other) >= self.min_distance
+                for dx in range(-reach, reach + 1)
+                for dy in range(-reach, reach + 1)
+                for other in buckets.get((bx + dx, by + dy), ())
+            ):
+                chosen.append(candidate)
+                buckets.setdefault((bx, by), []).append(candidate)
+        # Too crowded for the spacing; top up with any other free cells.
+        if len(chosen) < count:
+            taken = set(chosen)
+            for candidate in game.sample_empty_spaces(count + len(chosen)):
+                if candidate not in taken and len(chosen) < count:
+                    chosen.append(candidate)
+                    taken.add(candidate)
+        return chosen
+
+
+@dataclass
+class SymmetricSpawn:
+    margin: int = 1
+
+    def _ring(self, game: SnakeyGame) -> list[tuple[int, int]]:
+        low_x, low_y = self.margin, self.margin
+        high_x, high_y = game.max_x - 1 - self.margin, game.max_y - 1 - self.margin
+        if low_x > high_x or low_y > high_y:
+            low_x, low_y, high_x, high_y = 0, 0, game.max_x - 1, game.max_y - 1
+        if low_x == high_x or low_y == high_y:
+            return [
+                (x, y)
+                for x in range(low_x, high_x + 1)
+                for y in range(low_y, high_y + 1)
+            ]
+        ring = [(x, low_y) for x in range(low_x, high_x)]
+        ring += [(high_x, y) for y in range(low_y, high_y)]
+        ring += [(x, high_y) for x in range(high_x, low_x, -1)]
+        ring += [(low_x, y) for y in range(high_y, low_y, -1)]
+        return ring
+
+    def positions(self, game: SnakeyGame, count: int) -> list[tuple[int, int]]:
+        _check_space(game, count)
+        ring = self._ring(game)
+        occupancy = game.get_occupancy()
+        chosen = []
+        taken = set()
+        for i in range(count):
+            start = i * len(ring) // count
+            for step in range(len(ring)):
+                position = ring[(start + step) % len(ring)]
+                if (
+                    position not in taken
+                    and position not in game.foods
+                    and not occupancy.is_occupied(position)
+                ):
+                    chosen.append(position)
+                    taken.add(position)
+                    break
+        if len(chosen) < count:
+            extra = [p for p in game.sample_empty_spaces(count) if p not in taken]
+            chosen += extra[: count - len(chosen)]
+        return chosen
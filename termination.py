@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from typing import Protocol
+
+
+class TerminationRule(Protocol):
+    def should_stop(self, game_master) -> bool: ...
+
+
+@dataclass
+class TickLimit:
+    max_ticks: int
+
+    def should_stop(self, game_master) -> bool:
+        return game_master.ticks >= self.max_ticks
+
+
+@dataclass
+class FoodTimeout:
+    # Stop once no snake has eaten for this many ticks.
+    ticks: int
+
+    def should_stop(self, game_master) -> bool:
+        return game_master.ticks - game_master.last_meal >= self.ticks
+
+
+@dataclass
+class LastStanding:
+    players: int
+
+    def should_stop(self, game_master) -> bool:
+        return len(game_master.active_players) <= self.players
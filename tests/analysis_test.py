@@ -0,0 +1,173 @@
+import sys
+
+sys.path.append("../snakey")
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import composite, integers, lists, sampled_from
+from analysis import UNREACHED
+from game_master import GameMaster
+from scheduler import MoveScheduler
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+from sparse_board import SparseSnakeyGame
+from views import GameView
+
+
+@composite
+def get_games(draw):
+    max_x = draw(integers(min_value=2, max_value=8))
+    max_y = draw(integers(min_value=2, max_value=8))
+    game = SnakeyGame(max_x, max_y)
+    for _ in range(draw(integers(min_value=1, max_value=4))):
+        snake = Snake([(draw(integers(0, max_x - 1)), draw(integers(0, max_y - 1)))])
+        for move in draw(lists(sampled_from(list(GameMove)), max_size=12)):
+            snake.move(move)
+            if not game._is_valid_among(snake, game.snakes):
+                break
+            snake.add_size()
+        else:
+            if game._is_valid_among(snake, game.snakes):
+                game.add_snake(Snake(snake.positions))
+    return game
+
+
+def brute_distances(game: SnakeyGame, start: tuple[int, int]) -> dict:
+    blocked = {cell for snake in game.snakes for cell in snake.cells}
+    distances, frontier = {start: 0}, [start]
+    while frontier:
+        x, y = frontier.pop(0)
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            cell = x + dx, y + dy
+            if (
+                0 <= cell[0] < game.max_x
+                and 0 <= cell[1] < game.max_y
+                and cell not in blocked
+                and cell not in distances
+            ):
+                distances[cell] = distances[(x, y)] + 1
+                frontier.append(cell)
+    return distances
+
+
+@given(get_games())
+def test_distances_match_brute_force(game: SnakeyGame):
+    analysis = game.analysis()
+    for snake in game.snakes:
+        expected = brute_distances(game, snake.get_head())
+        field = analysis.distances_from(snake.get_head())
+        for x in range(game.max_x):
+            for y in range(game.max_y):
+                assert field[y * game.max_x + x] == expected.get((x, y), UNREACHED)
+        assert analysis.reachable_area(snake.get_head()) == len(expected) - 1
+
+
+@given(get_games())
+def test_components_partition_free_cells(game: SnakeyGame):
+    labels, sizes = game.analysis().components()
+    assert sum(sizes) == game.max_x * game.max_y - len(
+        {cell for snake in game.snakes for cell in snake.cells}
+    )
+    assert all(sizes[label] for label in labels if label >= 0)
+
+
+@given(get_games())
+def test_voronoi_claims_strictly_closer_cells(game: SnakeyGame):
+    analysis = game.analysis()
+    fields = [analysis.distances_from(snake.get_head()) for snake in game.snakes]
+    expected = [0] * len(game.snakes)
+    for cell in range(game.max_x * game.max_y):
+        if analysis.blocked[cell]:
+            continue
+        reach = [(field[cell], i) for i, field in enumerate(fields) if field[cell] > 0]
+        reach.sort()
+        if reach and (len(reach) == 1 or reach[0][0] < reach[1][0]):
+            expected[reach[0][1]] += 1
+    assert analysis.voronoi() == expected
+
+
+@pytest.mark.parametrize(
+    "foods, position, distance",
+    [({(4, 4)}, (0, 0), 8), ({(4, 4), (1, 0)}, (0, 0), 1), (set(), (0, 0), -1)],
+)
+def test_food_distances(foods, position, distance):
+    game = SnakeyGame(5, 5, foods=set(foods))
+    assert game.analysis().food_distances()[0] == distance
+
+
+def test_sparse_board_analysis_stays_near_the_snakes():
+    size = 10_000
+    game = SparseSnakeyGame(size, size, foods={(5003, 5000)})
+    game.add_snake(Snake([(5000, 5000), (5000, 5001), (5000, 5002)]))
+    game.add_snake(Snake([(5006, 5000)]))
+    analysis = game.analysis()
+    assert len(analysis.window.blocked) <= 10 * 10
+    assert analysis.reachable_area((0, 0)) == size * size - 4
+    assert analysis.distance((5000, 5000), (5000, 0)) == 5000
+    assert analysis.distance((5000, 5000), (5000, 9999)) == 4999 + 2
+    assert analysis.food_distances()[0] == 5003 + 5000
+    left, right = analysis.voronoi()
+    assert left > size * size // 3 and right > size * size // 3
+
+
+def test_analysis_is_cached_until_mutation():
+    game = SnakeyGame(5, 5)
+    snake = Snake([(0, 0)])
+    game.add_snake(snake)
+    analysis = game.analysis()
+    assert GameView.of(game).analysis() is analysis
+    assert analysis.distances_from((0, 0)) is analysis.distances_from((0, 0))
+    game.move_snake(snake, GameMove.UP)
+    assert game.analysis() is not analysis
+    assert game.analysis().distance((1, 0), (4, 4)) == 7
+
+
+def test_scheduled_players_share_one_analysis_per_tick():
+    class AnalysingPlayer:
+        def __init__(self, id):
+            self.id = id
+            self.seen = []
+
+        def move(self, game, snake):
+            self.seen.append(game.analysis())
+            return GameMove.RIGHT
+
+    gm = GameMaster(SnakeyGame(10, 10), scheduler=MoveScheduler())
+    players = [AnalysingPlayer(i) for i in range(3)]
+    for i, player in enumerate(players):
+        gm.add_player(player, Snake([(i * 3, 0)]))
+    gm.tick()
+    gm.tick()
+    gm.scheduler.close()
+    first, second, third = (player.seen for player in players)
+    assert first[0] is second[0] is third[0]
+    assert first[1] is second[1] is third[1]
+    assert first[0] is not first[1]
+    assert first[0].heads == [0, 3, 6]
+
+
+def test_view_analysis_is_lazy_and_matches_the_view():
+    class LatePlayer:
+        def __init__(self, id):
+            self.id = id
+            self.curious = id == 2
+            self.seen = None
+
+        def move(self, game, snake):
+            if self.curious:
+                heads = [other.get_head() for other in game.snakes]
+                self.seen = game.analysis(), heads
+            return GameMove.RIGHT
+
+    gm = GameMaster(SnakeyGame(10, 10))
+    players = [LatePlayer(i) for i in range(3)]
+    for i, player in enumerate(players):
+        gm.add_player(player, Snake([(i * 3, 0)]))
+    gm.tick()
+    seen, heads = players[2].seen
+    assert seen.heads == [y * 10 + x for x, y in heads] == [10, 13, 6]
+    assert seen.blocked[10] == 1
+    players[2].curious = False
+    gm.game.analysis_cache = None
+    gm.tick()
+    assert gm.game.analysis_cache is None
@@ -0,0 +1,98 @@
+import sys
+
+sys.path.append("../snakey")
+from random import Random
+import pytest
+from arena import CellTable, SnakePool
+from bitboard import BitboardSnakeyGame
+from game_master import GameMaster
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+from sparse_board import SparseSnakeyGame
+
+
+class CarefulPlayer:
+    def __init__(self, id=None):
+        self.id = id
+
+    def move(self, game, snake) -> GameMove:
+        valid_moves = game.get_valid_moves(snake)
+        return valid_moves[-1] if valid_moves else GameMove.UP
+
+
+def play(game_master: GameMaster, players: int, foods: int = 3) -> list:
+    game_master.game.add_food(foods)
+    for i in range(players):
+        game_master.add_player(CarefulPlayer(i))
+    for _ in range(20):
+        if len(game_master.active_players) <= 1:
+            break
+        game_master.tick()
+    return [
+        (id, list(snake.positions)) for id, snake in game_master.players_snakes.items()
+    ]
+
+
+@pytest.mark.parametrize(
+    "game_class", [SnakeyGame, BitboardSnakeyGame, SparseSnakeyGame]
+)
+def test_reset_matches_fresh_game(game_class):
+    game = game_class(7, 7, cell_table=CellTable(7, 7))
+    game_master = GameMaster(game, snake_pool=SnakePool())
+    play(game_master, 4)
+    for seed, size in ((5, 7), (6, 9), (7, 9)):
+        game_master.reset(size, size, seed)
+        reused = play(game_master, 4)
+        fresh = play(GameMaster(game_class(size, size, rng=Random(seed))), 4)
+        assert reused == fresh
+        assert game_master.game is game
+
+
+def test_reset_reuses_grid_pool_and_cells():
+    game = SnakeyGame(6, 6, cell_table=CellTable(6, 6))
+    pool = SnakePool()
+    game_master = GameMaster(game, snake_pool=pool)
+    play(game_master, 3)
+    grid, free_cells = game.get_occupancy(), game.free_cells
+    snakes = {id(snake) for snake in game_master.players_snakes.values()}
+    game_master.reset(seed=1)
+    assert not any(grid.owners) and not grid.shared and not grid.out_of_bounds
+    assert not game.snakes and not game.foods and not game_master.rankings
+    play(game_master, 3)
+    assert game.get_occupancy() is grid and game.free_cells is free_cells
+    assert {id(snake) for snake in game_master.players_snakes.values()} == snakes
+    assert pool.created == 3
+    for snake in game_master.players_snakes.values():
+        for position in snake.positions:
+            if 0 <= position[0] < 6 and 0 <= position[1] < 6:
+                assert position is game.cell_table.intern(position)
+
+
+def test_reset_releases_only_pooled_snakes():
+    pool = SnakePool()
+    game_master = GameMaster(SnakeyGame(6, 6), snake_pool=pool)
+    own = Snake([(0, 0)])
+    game_master.add_player(CarefulPlayer(0), own)
+    game_master.add_player(CarefulPlayer(1))
+    pooled = game_master.players_snakes[1]
+    game_master.reset()
+    assert pool.free == [pooled]
+    game_master.add_player(CarefulPlayer(0))
+    assert game_master.players_snakes[0] is pooled
+    assert own.positions[0] == (0, 0)
+
+
+def test_snake_reset_keeps_buffers():
+    snake = Snake([(0, 0), (0, 1)])
+    snake.move(GameMove.UP)
+    positions, cells = snake.positions, snake.cells
+    snake.reset([(3, 3)])
+    assert snake.positions is positions and snake.cells is cells
+    assert snake == Snake([(3, 3)])
+    assert dict(snake.cells) == {(3, 3): 1}
+
+
+def test_cell_table_interns_only_inside_board():
+    table = CellTable(3, 2)
+    assert table.at(2, 1) is table.at(2, 1)
+    assert table.at(3, 0) == (3, 0)
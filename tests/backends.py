@@ -0,0 +1,66 @@
+from copy import deepcopy
+from hypothesis.strategies import composite, integers, lists, sampled_from, sets, tuples
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+
+
+@composite
+def get_games(draw, game_class):
+    # The same random board on the list backend and on game_class.
+    max_x = draw(integers(min_value=1, max_value=8))
+    max_y = draw(integers(min_value=1, max_value=8))
+    snakes = []
+    for _ in range(draw(integers(min_value=0, max_value=5))):
+        positions = [
+            (
+                draw(integers(min_value=-1, max_value=max_x)),
+                draw(integers(min_value=-1, max_value=max_y)),
+            )
+        ]
+        for move in draw(lists(sampled_from(list(GameMove)), max_size=5)):
+            snake = Snake([positions[-1]])
+            snake.move(move)
+            positions.append(snake.get_head())
+        snakes.append(positions)
+    foods = draw(
+        sets(tuples(integers(0, max_x - 1), integers(0, max_y - 1)), max_size=4)
+    )
+    scalar = SnakeyGame(max_x, max_y, foods=set(foods))
+    other = game_class(max_x, max_y, foods=set(foods))
+    for positions in snakes:
+        scalar.add_snake(Snake(positions))
+        other.add_snake(Snake(positions))
+    return scalar, other
+
+
+def assert_same(scalar: SnakeyGame, other: SnakeyGame):
+    def dead(game):
+        return [game.snakes.index(snake) for snake in game.get_dead_snakes()]
+
+    assert dead(other) == dead(scalar)
+    assert other.count_empty_spaces() == scalar.count_empty_spaces()
+    assert set(other.get_empty_spaces()) == set(scalar.get_empty_spaces())
+    assert other.get_valid_move_masks() == scalar.get_valid_move_masks()
+
+
+def assert_plays_alike(games: tuple[SnakeyGame, SnakeyGame], moves: list[GameMove]):
+    scalar, other = games
+    assert_same(scalar, other)
+    for i, move in enumerate(moves):
+        if not scalar.snakes:
+            break
+        index = i % len(scalar.snakes)
+        for game in games:
+            game.move_snake(game.snakes[index], move)
+            if i % 4 == 1:
+                game.consume_food(game.snakes[index].get_head())
+            if i % 3 == 0:
+                game.grow_snake(game.snakes[index])
+            if i % 5 == 4:
+                game.remove_snake(game.snakes[index])
+        assert_same(scalar, other)
+        for game in games:
+            for snake in game.get_dead_snakes():
+                game.remove_snake(snake)
+        assert_same(scalar, other)
+    assert_same(*deepcopy(games))
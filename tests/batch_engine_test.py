@@ -0,0 +1,75 @@
+import sys
+
+sys.path.append("../snakey")
+import numpy as np
+import pytest
+from batch_engine import BatchSnakeyGame
+from game_master import GameMaster
+from snake import MOVES, GameMove, Snake
+from snakey_game import SnakeyGame
+
+
+class ScriptedPlayer:
+    def __init__(self, id, script):
+        self.id = id
+        self.script = script
+
+    def move(self, game, snake) -> GameMove:
+        return MOVES[self.script.pop(0)]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_BatchSnakeyGame_matches_GameMaster(seed):
+    rng = np.random.default_rng(seed)
+    num_games, num_players, ticks = 40, 4, 40
+    batch = BatchSnakeyGame(num_games, num_players, 6, 5)
+    batch.spawn(rng, foods=8)
+    moves = rng.integers(0, len(MOVES), size=(ticks, num_games, num_players))
+
+    masters = []
+    for n in range(num_games):
+        game = batch.to_game(n)
+        game_master = GameMaster(SnakeyGame(game.max_x, game.max_y, foods=game.foods))
+        for p, snake in enumerate(game.snakes):
+            script = [int(move) for move in moves[:, n, p]]
+            game_master.add_player(ScriptedPlayer(p, script), snake)
+        masters.append(game_master)
+
+    for tick in range(ticks):
+        batch.step(moves[tick])
+        for n, game_master in enumerate(masters):
+            if len(game_master.active_players) > 1:
+                game_master.tick()
+            active = {player.id for player in game_master.active_players}
+            assert batch.done[n] == (len(active) <= 1)
+            for p in range(num_players):
+                assert batch.alive[n, p] == (p in active)
+                assert batch.ranks[n, p] == game_master.rankings.get(p, 0)
+                if p in active:
+                    snake = game_master.players_snakes[p]
+                    assert batch.snake_positions(n, p) == list(snake.positions)
+
+
+def test_BatchSnakeyGame_head_on_collision_kills_both():
+    game = SnakeyGame(5, 1, snakes=[Snake([(0, 0)]), Snake([(2, 0)])])
+    batch = BatchSnakeyGame.from_games([game])
+    up, down = MOVES.index(GameMove.UP), MOVES.index(GameMove.DOWN)
+
+    dead = batch.step(np.array([[up, down]]))
+
+    assert dead.tolist() == [[True, True]]
+    assert batch.done.tolist() == [True]
+    assert batch.ranks.tolist() == [[3, 3]]
+    assert not batch.owners.any()
+
+
+def test_BatchSnakeyGame_grows_on_food():
+    game = SnakeyGame(5, 5, snakes=[Snake([(0, 0)]), Snake([(4, 4)])], foods={(1, 0)})
+    batch = BatchSnakeyGame.from_games([game])
+    up = MOVES.index(GameMove.UP)
+    left = MOVES.index(GameMove.LEFT)
+
+    batch.step(np.array([[up, left]]))
+
+    assert batch.snake_positions(0, 0) == [(1, 0), (0, 0)]
+    assert batch.snake_positions(0, 1) == [(4, 3)]
@@ -0,0 +1,29 @@
+import sys
+
+sys.path.append("../snakey")
+sys.path.append("benchmarks")
+import pytest
+from run import compare, slowdowns
+
+
+def results(**seconds) -> dict:
+    return {"results": {key: {"seconds": value} for key, value in seconds.items()}}
+
+
+@pytest.mark.parametrize("machine", [0.25, 1.0, 4.0])
+def test_machine_speed_cancels_out(machine: float):
+    baseline = results(a=1.0, b=2.0, c=3.0)
+    current = results(a=1.0 * machine, b=2.0 * machine, c=3.0 * machine)
+    assert slowdowns(current, baseline) == pytest.approx({"a": 1, "b": 1, "c": 1})
+    assert compare(current, baseline, 1.5) == []
+
+
+@pytest.mark.parametrize("machine", [0.5, 1.0, 3.0])
+def test_relative_regression_is_flagged(machine: float):
+    baseline = results(a=1.0, b=2.0, c=3.0)
+    current = results(a=1.0 * machine, b=2.0 * machine, c=9.0 * machine)
+    assert compare(current, baseline, 1.5) == ["c: 3.00x slower than baseline"]
+
+
+def test_cases_missing_from_baseline_are_ignored():
+    assert compare(results(a=5.0), results(b=1.0), 1.5) == []
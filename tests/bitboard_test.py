@@ -0,0 +1,35 @@
+import sys
+
+sys.path.append("../snakey")
+from random import Random
+from backends import assert_plays_alike, get_games
+from bitboard import BitboardSnakeyGame
+from snake import GameMove, Snake
+from hypothesis import given
+from hypothesis.strategies import lists, integers, sampled_from
+
+
+@given(get_games(BitboardSnakeyGame), lists(sampled_from(list(GameMove)), max_size=15))
+def test_BitboardSnakeyGame_matches_SnakeyGame(games, moves):
+    assert_plays_alike(games, moves)
+
+
+@given(get_games(BitboardSnakeyGame), integers(min_value=0, max_value=10))
+def test_BitboardSnakeyGame_add_food(games, count):
+    _, bitboard = games
+    bitboard.rng = Random(count)
+    empty = set(bitboard.get_empty_spaces())
+    foods = set(bitboard.foods)
+
+    bitboard.add_food(count)
+
+    added = bitboard.foods - foods
+    assert len(added) == min(count, len(empty))
+    assert added <= empty
+    assert not added & set(bitboard.get_empty_spaces())
+    assert bitboard.count_empty_spaces() == len(empty) - len(added)
+
+
+def test_BitboardSnakeyGame_random_empty_space_on_crowded_board():
+    game = BitboardSnakeyGame(3, 1, snakes=[Snake([(0, 0), (1, 0)])], rng=Random(1))
+    assert game.random_empty_space() == (2, 0)
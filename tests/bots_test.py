@@ -0,0 +1,156 @@
+import sys
+
+sys.path.append("../snakey")
+from random import Random
+from hypothesis import given, strategies as st
+import pytest
+from bots import (
+    FloodFillPlayer,
+    SearchBoard,
+    SearchPlayer,
+    TranspositionTable,
+    flood_fill,
+    voronoi,
+)
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+from tournament import MatchConfig, MatchSpec, play_match
+
+
+def make_game(*snakes, max_x=5, max_y=5, foods=()):
+    game = SnakeyGame(max_x, max_y, foods=set(foods))
+    for positions in snakes:
+        game.add_snake(Snake(positions))
+    return game
+
+
+def test_flood_fill_counts_reachable_cells():
+    game = make_game([(0, 0)], [(1, 0), (1, 1), (0, 1)], max_x=3, max_y=3)
+    board = SearchBoard.from_game(game, game.snakes[0])
+    assert flood_fill(board, board.bodies[0][0]) == 0
+    board = SearchBoard.from_game(game, game.snakes[1])
+    assert flood_fill(board, board.bodies[0][0]) == 5
+
+
+def test_voronoi_splits_open_board():
+    game = make_game([(0, 0)], [(4, 0)], max_x=5, max_y=1)
+    board = SearchBoard.from_game(game, game.snakes[0])
+    assert voronoi(board) == [1, 1]
+
+
+@given(st.lists(st.integers(0, 3), max_size=30), st.integers(0, 1000))
+def test_make_unmake_restores_board(moves, seed):
+    game = make_game([(2, 2), (2, 1)], [(0, 4)], foods=[(3, 3)])
+    board = SearchBoard.from_game(game, game.snakes[0])
+    before = (bytes(board.cells), board.hash, [list(b) for b in board.bodies])
+    rng = Random(seed)
+    undos = []
+    for move in moves:
+        player = rng.randrange(2)
+        if board.alive[player]:
+            undos.append(board.make(player, move))
+    for undo in reversed(undos):
+        board.unmake(undo)
+    assert (bytes(board.cells), board.hash, [list(b) for b in board.bodies]) == before
+    assert board.alive == [True, True]
+
+
+def test_board_hash_depends_only_on_position():
+    game = make_game([(2, 2)], [(0, 4)])
+    board = SearchBoard.from_game(game, game.snakes[0])
+    board.make(0, 3)
+    board.make(0, 2)
+    moved = make_game([(2, 2)], [(0, 4)])
+    moved.move_snake(moved.snakes[0], GameMove.RIGHT)
+    moved.move_snake(moved.snakes[0], GameMove.LEFT)
+    other = SearchBoard.from_game(moved, moved.snakes[0], board.zobrist)
+    assert other.hash == board.hash
+
+
+def test_board_hash_distinguishes_heads():
+    game = make_game([(0, 0), (1, 0)])
+    board = SearchBoard.from_game(game, game.snakes[0])
+    reversed_game = make_game([(1, 0), (0, 0)])
+    other = SearchBoard.from_game(reversed_game, reversed_game.snakes[0], board.zobrist)
+    assert bytes(other.cells) == bytes(board.cells)
+    assert other.hash != board.hash
+
+
+def test_transposition_table_is_bounded():
+    table = TranspositionTable(size=8)
+    for key in range(100):
+        table.put(key, 1, 0.0, 0, 0)
+    assert len(table) <= 8
+    assert table.get(99) is not None
+    assert table.get(3) is None
+
+
+def test_transposition_table_prefers_deeper_entries():
+    table = TranspositionTable(size=8)
+    table.put(5, 4, 1.0, 0, 2)
+    table.put(5, 2, 9.0, 0, 1)
+    assert table.get(5).value == 1.0
+
+
+@pytest.mark.parametrize("player_class", [FloodFillPlayer, SearchPlayer])
+def test_bots_take_only_safe_move(player_class):
+    game = make_game([(0, 0)], [(1, 0), (1, 1)], max_x=3, max_y=3)
+    assert player_class().move(game, game.snakes[0]) == GameMove.RIGHT
+
+
+@given(st.lists(st.integers(0, 3), max_size=30), st.integers(0, 1000))
+def test_safe_moves_match_valid_moves(moves, seed):
+    game = make_game([(2, 2), (2, 1), (1, 1)], [(0, 4), (1, 4)], foods=[(3, 3)])
+    rng = Random(seed)
+    for move in moves:
+        snake = game.snakes[rng.randrange(2)]
+        if not game.get_valid_move_mask(snake) >> move & 1:
+            continue
+        game.move_snake(snake, list(GameMove)[move])
+        if game.get_dead_snakes():
+            break
+        for snake in game.snakes:
+            board = SearchBoard.from_game(game, snake)
+            mask = sum(1 << move for move in board.safe_moves(0))
+            assert mask == game.get_valid_move_mask(snake)
+
+
+def test_search_player_avoids_dead_end():
+    # Going down leads into a two cell pocket walled off by the other snake;
+    # going right doubles back onto its own body, which the engine allows.
+    game = make_game(
+        [(2, 0), (2, 1), (2, 2)],
+        [(0, 4), (0, 3), (0, 2), (0, 1), (1, 1), (1, 2), (1, 3)],
+        max_x=6,
+        max_y=6,
+    )
+    player = SearchPlayer(max_depth=3, time_limit=None)
+    assert player.move(game, game.snakes[0]) in (GameMove.UP, GameMove.RIGHT)
+    assert player.stats.depth == 3
+
+
+def test_search_player_respects_node_budget():
+    game = make_game([(1, 1)], [(4, 4)], max_x=8, max_y=8)
+    player = SearchPlayer(max_depth=20, time_limit=None, max_nodes=500)
+    player.move(game, game.snakes[0])
+    assert player.stats.nodes <= 501
+    assert player.stats.nodes_per_second > 0
+    assert player.total.nodes == player.stats.nodes
+
+
+def test_search_player_beats_reckless():
+    class Reckless:
+        def __init__(self, id=None):
+            self.id = id
+
+        def move(self, game, snake) -> GameMove:
+            return GameMove.DOWN
+
+    config = MatchConfig(
+        {"search": lambda: SearchPlayer(time_limit=0.005), "reckless": Reckless},
+        max_x=6,
+        max_y=6,
+        max_ticks=30,
+    )
+    result = play_match(MatchSpec(0, ("search", "reckless"), seed=3), config)
+    assert result.placements["search"] == 1
@@ -0,0 +1,85 @@
+import sys
+
+sys.path.append("../snakey")
+from hypothesis import given
+from hypothesis.strategies import composite, integers, lists, sampled_from
+from uuid import uuid4
+from compact import CompactGame
+from game_master import GameMaster
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+
+
+@composite
+def get_games(draw):
+    max_x = draw(integers(min_value=2, max_value=8))
+    max_y = draw(integers(min_value=2, max_value=8))
+    game = SnakeyGame(max_x, max_y)
+    for _ in range(draw(integers(min_value=1, max_value=4))):
+        snake = Snake([(draw(integers(0, max_x - 1)), draw(integers(0, max_y - 1)))])
+        for move in draw(lists(sampled_from(list(GameMove)), max_size=12)):
+            snake.move(move)
+            if not game._is_valid_among(snake, []):
+                break
+            snake.add_size()
+        else:
+            game.add_snake(Snake(snake.positions))
+    return game
+
+
+@given(get_games(), lists(sampled_from(list(GameMove)), max_size=20))
+def test_CompactGame_matches_SnakeyGame(game, moves):
+    compact = CompactGame.from_game(game)
+    # Removal reorders game.snakes, so pair each snake with its slot.
+    pairs = list(zip(game.snakes, range(len(game.snakes))))
+    for i, move in enumerate(moves):
+        dead_snakes = {id(snake) for snake in game.get_dead_snakes()}
+        dead = [pair for pair in pairs if id(pair[0]) in dead_snakes]
+        assert compact.get_dead_snakes() == [slot for _, slot in dead]
+        for snake, slot in dead:
+            game.remove_snake(snake)
+            compact.remove_snake(slot)
+        pairs = [pair for pair in pairs if id(pair[0]) not in dead_snakes]
+        assert [s.positions for s in compact.snakes] == [
+            list(snake.positions) for snake, _ in pairs
+        ]
+        if not pairs:
+            break
+        snake, slot = pairs[i % len(pairs)]
+        game.move_snake(snake, move)
+        compact.move_snake(slot, move)
+        if i % 2:
+            game.grow_snake(snake)
+            compact.grow_snake(slot)
+
+
+def test_capacity_grows_and_round_trips():
+    compact = CompactGame(6, 6, capacity=2)
+    slot = compact.add_snake([(0, 0)], "a")
+    other = compact.add_snake([(5, 5), (5, 4)], "b")
+    for move in (GameMove.UP, GameMove.UP, GameMove.RIGHT, GameMove.RIGHT):
+        compact.move_snake(slot, move)
+        compact.grow_snake(slot)
+    assert compact.capacity == 8
+    assert compact.snakes[0].positions == [(2, 2), (2, 1), (2, 0), (1, 0), (0, 0)]
+    assert compact.snakes[1].positions == [(5, 5), (5, 4)]
+    game = compact.to_game()
+    assert [list(s.positions) for s in game.snakes] == [
+        s.positions for s in compact.snakes
+    ]
+    assert compact.slot_of("b") == other
+
+
+def test_from_game_master_uses_dense_slots():
+    game_master = GameMaster(SnakeyGame(5, 5, foods={(4, 4)}))
+    ids = [uuid4(), uuid4()]
+    for i, id in enumerate(ids):
+        player = type("Player", (), {"id": id})()
+        game_master.add_player(player, Snake([(i, 0), (i, 1)]))
+    compact = CompactGame.from_game_master(game_master)
+    assert compact.ids == ids
+    assert [snake.slot for snake in compact.snakes] == [0, 1]
+    snake = compact.snakes[1]
+    assert snake.get_head() == (1, 0) and snake.get_length() == 2
+    assert snake.occupies((1, 1)) and not snake.occupies((0, 1))
+    assert compact.foods == {(4, 4)}
@@ -0,0 +1,104 @@
+import sys
+
+sys.path.append("../snakey")
+from collections import deque
+from random import Random
+from hypothesis import given, settings, strategies as st
+from delta import ClientState, DeltaRecorder, SnakeStep, TickDelta
+from food import FixedCount, FoodManager
+from game_master import GameMaster
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+
+
+class RandomPlayer:
+    def __init__(self, id, seed):
+        self.id = id
+        self.rng = Random(seed)
+
+    def move(self, game, snake) -> GameMove:
+        valid_moves = game.get_valid_moves(snake)
+        if self.rng.random() < 0.05:
+            raise ValueError("flaky bot")
+        return self.rng.choice(valid_moves or list(GameMove))
+
+
+def assert_synced(client: ClientState, game_master: GameMaster, recorder):
+    expected = {
+        recorder.slots[player.id]: list(game_master.players_snakes[player.id].positions)
+        for player in game_master.active_players
+    }
+    assert {slot: list(body) for slot, body in client.bodies.items()} == expected
+    assert client.foods == game_master.game.foods
+
+
+@settings(max_examples=30, deadline=None)
+@given(st.integers(0, 10_000))
+def test_client_follows_game_through_encoded_deltas(seed):
+    game = SnakeyGame(8, 8, rng=Random(seed))
+    game_master = GameMaster(game, food=FoodManager(FixedCount(6)))
+    game.add_food(6)
+    for i in range(3):
+        game_master.add_player(RandomPlayer(i, seed + i))
+    recorder = DeltaRecorder.attach(game_master)
+    client = ClientState(8, 8)
+    client.apply(TickDelta.from_bytes(recorder.keyframe(game_master).to_bytes()))
+    assert_synced(client, game_master, recorder)
+    for tick in range(40):
+        if len(game_master.active_players) <= 1:
+            break
+        if tick == 5:
+            game_master.add_player(RandomPlayer(9, seed))
+        game_master.tick()
+        delta = TickDelta.from_bytes(recorder.last.to_bytes())
+        assert delta == recorder.last
+        client.apply(delta)
+        assert_synced(client, game_master, recorder)
+    game_copy, snakes = client.to_game()
+    assert sorted(list(s.positions) for s in game_copy.snakes) == sorted(
+        list(s.positions) for s in game_master.game.snakes
+    )
+
+
+def test_keyframe_after_mid_game_join_leaves_deltas_intact():
+    game = SnakeyGame(8, 8, rng=Random(1))
+    game_master = GameMaster(game)
+    game_master.add_player(RandomPlayer(0, 0), Snake([(0, 0)]))
+    recorder = DeltaRecorder.attach(game_master)
+    early = ClientState(8, 8)
+    early.apply(recorder.keyframe(game_master))
+    game_master.add_player(RandomPlayer(1, 1), Snake([(5, 5)]))
+    game.foods.add((7, 7))
+    late = ClientState(8, 8)
+    late.apply(recorder.keyframe(game_master))
+    assert recorder.alive == {0} and recorder.foods == set()
+    game_master.tick()
+    assert [joined.id for joined in recorder.last.joined] == ["1"]
+    for client in (early, late):
+        client.apply(recorder.last)
+        assert_synced(client, game_master, recorder)
+
+
+def test_apply_reports_vacated_tails():
+    client = ClientState(5, 5)
+    client.bodies[0] = deque([(1, 1), (1, 2)])
+    vacated = client.apply(TickDelta(1, steps=[SnakeStep(0, (2, 1))]))
+    assert vacated == [(1, 2)]
+    assert client.apply(TickDelta(2, steps=[SnakeStep(0, (3, 1), grew=True)])) == []
+    assert list(client.bodies[0]) == [(3, 1), (2, 1), (1, 1)]
+
+
+def test_delta_size_does_not_depend_on_body_length():
+    def encoded_size(length: int) -> int:
+        game_master = GameMaster(SnakeyGame(40, 40))
+        positions = [(0, y) for y in range(length, 0, -1)]
+        game_master.add_player(RandomPlayer(0, 0), Snake(positions))
+        game_master.add_player(RandomPlayer(1, 1), Snake([(20, 20)]))
+        recorder = DeltaRecorder.attach(game_master)
+        recorder.keyframe(game_master)
+        game_master.players_dict[0].rng.random = lambda: 1.0
+        game_master.players_dict[1].rng.random = lambda: 1.0
+        game_master.tick()
+        return len(recorder.last.to_bytes())
+
+    assert encoded_size(3) == encoded_size(30)
@@ -0,0 +1,96 @@
+import sys
+
+sys.path.append("../snakey")
+from hypothesis import given, strategies as st
+import pytest
+from bitboard import BitboardSnakeyGame
+from food import FixedCount, FoodIndex, FoodManager, MaxDensity, SpawnRate
+from game_master import GameMaster
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+
+positions = st.tuples(st.integers(0, 40), st.integers(0, 40))
+
+
+class SteadyPlayer:
+    def __init__(self, id, move=GameMove.UP):
+        self.id = id
+        self._move = move
+
+    def move(self, game, snake) -> GameMove:
+        return self._move
+
+
+def distance(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+@given(st.sets(positions, max_size=40), positions, st.integers(1, 5))
+def test_nearest_matches_brute_force(foods, position, k):
+    index = FoodIndex(bucket_size=4)
+    for food in foods:
+        index.add(food)
+    found = index.nearest(position, k)
+    expected = sorted(distance(food, position) for food in foods)[:k]
+    assert [distance(food, position) for food in found] == expected
+
+
+@given(st.sets(positions, max_size=40), positions, st.integers(0, 12))
+def test_within_matches_brute_force(foods, position, radius):
+    index = FoodIndex(bucket_size=4)
+    for food in foods:
+        index.add(food)
+    expected = {food for food in foods if distance(food, position) <= radius}
+    assert set(index.within(position, radius)) == expected
+
+
+def test_index_remove():
+    index = FoodIndex()
+    index.add((1, 1))
+    index.add((1, 1))
+    index.remove((1, 1))
+    index.remove((5, 5))
+    assert len(index) == 0
+    assert index.nearest((0, 0)) == []
+
+
+def test_spawn_policies():
+    game = SnakeyGame(10, 10, foods={(0, 0), (1, 1)})
+    assert FixedCount(5).spawn_count(game) == 3
+    rate = SpawnRate(0.5)
+    assert [rate.spawn_count(game) for _ in range(4)] == [0, 1, 0, 1]
+    assert MaxDensity(0.05).spawn_count(game) == 3
+    assert MaxDensity(0.03, FixedCount(10)).spawn_count(game) == 1
+
+
+@pytest.mark.parametrize("game_class", [SnakeyGame, BitboardSnakeyGame])
+def test_consume_and_respawn(game_class):
+    game = game_class(6, 6, foods={(1, 0), (4, 4)})
+    game_master = GameMaster(game, food=FoodManager(FixedCount(2)))
+    game_master.add_player(SteadyPlayer(0), Snake([(0, 0)]))
+    game.seed(3)
+    assert game.nearest_foods((0, 0)) == [(1, 0)]
+    game_master.tick()
+    assert game_master.players_snakes[0].get_length() == 2
+    assert (1, 0) not in game.foods
+    assert len(game.foods) == 2
+    assert set(game.foods_within((0, 0), 20)) == game.foods
+    assert game.count_empty_spaces() == 36 - 2 - 2
+    game.update_empty_spaces()
+    assert game.count_empty_spaces() == 36 - 2 - 2
+
+
+def test_consume_frees_unoccupied_cell():
+    game = SnakeyGame(3, 3, foods={(2, 2)})
+    game.get_empty_spaces()
+    assert game.consume_food((2, 2))
+    assert not game.consume_food((2, 2))
+    assert (2, 2) in game.free_cells
+
+
+def test_food_is_permanent_without_manager():
+    game = SnakeyGame(6, 6, foods={(1, 0)})
+    game_master = GameMaster(game)
+    game_master.add_player(SteadyPlayer(0), Snake([(0, 0)]))
+    game_master.tick()
+    assert game.foods == {(1, 0)}
@@ -0,0 +1,36 @@
+import sys
+
+sys.path.append("../snakey")
+from random import Random
+from free_cells import FreeCells
+from hypothesis import given
+from hypothesis.strategies import lists, sets, tuples, integers, booleans
+
+position_strategy = tuples(integers(min_value=0), integers(min_value=0))
+
+
+@given(sets(position_strategy), lists(tuples(booleans(), position_strategy)))
+def test_FreeCells_add_remove_matches_set(initial, operations):
+    free_cells = FreeCells(list(initial))
+    expected = set(initial)
+    for add, position in operations:
+        if add:
+            free_cells.add(position)
+            expected.add(position)
+        else:
+            free_cells.remove(position)
+            expected.discard(position)
+        assert len(free_cells) == len(expected)
+    assert set(free_cells.cells) == expected
+    for position, index in free_cells.indices.items():
+        assert free_cells.cells[index] == position
+
+
+@given(sets(position_strategy, min_size=1), integers(min_value=0, max_value=10))
+def test_FreeCells_sample_is_distinct_subset(initial, count):
+    free_cells = FreeCells(list(initial))
+    sample = free_cells.sample(count, Random(count))
+    assert len(sample) == min(count, len(initial))
+    assert len(set(sample)) == len(sample)
+    assert set(sample) <= initial
+    assert free_cells.choice(Random(count)) in initial
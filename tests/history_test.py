@@ -0,0 +1,120 @@
+import sys
+
+sys.path.append("../snakey")
+
+import pytest
+from game_master import GameMaster
+from history import (
+    ALIVE,
+    COLLISION,
+    ERROR,
+    NO_MOVE,
+    SURVIVED,
+    WALL,
+    HistoryRecorder,
+    parquet_available,
+    read_parts,
+)
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+from soak import ScriptedPlayer, random_game
+from termination import TickLimit
+
+
+class FailingPlayer:
+    def __init__(self, id):
+        self.id = id
+
+    def move(self, game, snake):
+        raise RuntimeError("no move")
+
+
+def scripted_game() -> GameMaster:
+    game_master = GameMaster(SnakeyGame(5, 5, foods={(0, 2)}))
+    game_master.add_player(ScriptedPlayer("a", [GameMove.RIGHT]), Snake([(0, 0)]))
+    game_master.add_player(ScriptedPlayer("b", [GameMove.DOWN]), Snake([(2, 2)]))
+    game_master.add_player(FailingPlayer("c"), Snake([(4, 4)]))
+    return game_master
+
+
+def test_records_ticks_and_game_summary(tmp_path):
+    game_master = scripted_game()
+    recorder = HistoryRecorder.attach(game_master, tmp_path, format="npz")
+    game_master.play_game()
+    recorder.close()
+    ticks = read_parts(tmp_path, "ticks")
+    games = read_parts(tmp_path, "games")
+    players = read_parts(tmp_path, "players")
+    assert list(players["id"]) == ["a", "b", "c"]
+    # a and b both eat the food at (0, 2) and collide there; c errors at once.
+    assert list(ticks["tick"]) == [1, 1, 1, 2, 2]
+    assert list(ticks["move"][:3]) == [3, 1, NO_MOVE]
+    assert list(ticks["head_y"][ticks["player"] == 0]) == [1, 2]
+    summary = {
+        int(player): (int(rank), int(length), int(ticks), int(eaten), int(cause))
+        for player, rank, length, ticks, eaten, cause in zip(
+            games["player"],
+            games["rank"],
+            games["length"],
+            games["ticks"],
+            games["food_eaten"],
+            games["cause"],
+        )
+    }
+    assert summary[0] == (3, 2, 2, 1, COLLISION)
+    assert summary[1] == (3, 2, 2, 1, COLLISION)
+    assert summary[2] == (4, 1, 1, 0, ERROR)
+
+
+def test_flushes_bounded_parts_and_appends(tmp_path):
+    recorder = HistoryRecorder(tmp_path, format="npz", flush_rows=50)
+    for seed in range(5):
+        game_master = random_game(seed, size=7, players=3)
+        game_master.observers.append(recorder)
+        game_master.play_game()
+        assert recorder.ticks.rows < 50 + 3
+    recorder.close()
+    ticks = read_parts(tmp_path, "ticks")
+    assert len(list(tmp_path.glob("ticks-*.npz"))) > 1
+    assert set(ticks["game"]) == set(range(5))
+
+    resumed = HistoryRecorder(tmp_path, format="npz")
+    assert resumed.game == 5
+    game_master = random_game(9, size=7, players=3)
+    game_master.observers.append(resumed)
+    game_master.play_game()
+    resumed.close()
+    games = read_parts(tmp_path, "games")
+    assert set(games["game"]) == set(range(6))
+    # Each game numbers its players afresh; the players table maps them back.
+    assert sorted(games["player"]) == list(range(18))
+    players = read_parts(tmp_path, "players")
+    ids = dict(zip(players["player"], players["id"]))
+    assert {ids[player] for player in games["player"]} == {"0", "1", "2"}
+    assert len(list(tmp_path.glob("players-*.npz"))) > 1
+    assert not resumed.players
+    assert len(read_parts(tmp_path, "ticks")["tick"]) > len(ticks["tick"])
+
+
+def test_wall_cause_and_survivors(tmp_path):
+    loop = [GameMove.UP, GameMove.RIGHT, GameMove.DOWN, GameMove.LEFT]
+    game_master = GameMaster(SnakeyGame(5, 5), termination=[TickLimit(3)])
+    game_master.add_player(ScriptedPlayer(0, [GameMove.UP]), Snake([(3, 0)]))
+    game_master.add_player(ScriptedPlayer(1, loop), Snake([(0, 2)]))
+    game_master.add_player(ScriptedPlayer(2, loop), Snake([(2, 2)]))
+    recorder = HistoryRecorder.attach(game_master, tmp_path, format="npz")
+    game_master.play_game()
+    recorder.close()
+    games = read_parts(tmp_path, "games")
+    assert list(games["cause"]) == [WALL, ALIVE, ALIVE]
+    assert list(games["rank"]) == [4, SURVIVED, SURVIVED]
+    assert list(games["ticks"]) == [2, 3, 3]
+
+
+@pytest.mark.skipif(not parquet_available(), reason="pyarrow not installed")
+def test_parquet_round_trip(tmp_path):
+    game_master = scripted_game()
+    recorder = HistoryRecorder.attach(game_master, tmp_path, format="parquet")
+    game_master.play_game()
+    recorder.close()
+    assert list(read_parts(tmp_path, "ticks")["tick"]) == [1, 1, 1, 2, 2]
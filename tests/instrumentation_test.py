@@ -0,0 +1,103 @@
+import sys
+
+sys.path.append("../snakey")
+import json
+from game_master import GameMaster
+from instrumentation import BUCKETS, Histogram, Instrumentation
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+
+
+class SteadyPlayer:
+    def __init__(self, id, move=GameMove.RIGHT):
+        self.id = id
+        self._move = move
+
+    def move(self, game, snake) -> GameMove:
+        return self._move
+
+
+class BrokenPlayer:
+    def __init__(self, id):
+        self.id = id
+
+    def move(self, game, snake) -> GameMove:
+        raise ValueError("broken")
+
+
+def instrumented_game(instrumentation: Instrumentation) -> GameMaster:
+    game_master = GameMaster(SnakeyGame(8, 8), instrumentation=instrumentation)
+    game_master.add_player(SteadyPlayer(0), Snake([(0, 0)]))
+    game_master.add_player(SteadyPlayer(1), Snake([(4, 0)]))
+    game_master.add_player(BrokenPlayer(2), Snake([(6, 6)]))
+    return game_master
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram()
+    for value in (1e-7, 3e-6, 3e-6, 1.0, 100.0):
+        histogram.observe(value)
+    assert histogram.count == 5
+    assert histogram.counts[0] == 1
+    assert histogram.counts[2] == 2
+    assert histogram.counts[len(BUCKETS)] == 1
+    assert histogram.quantile(0.5) == BUCKETS[2]
+    assert histogram.quantile(1.0) == 100.0
+
+
+def test_tick_records_phases_players_and_counters():
+    instrumentation = Instrumentation()
+    game_master = instrumented_game(instrumentation)
+    for _ in range(3):
+        game_master.tick()
+    assert instrumentation.ticks == 3
+    for phase in ("move_snakes", "ate_food_check", "clean_kills", "tick"):
+        assert instrumentation.phases[phase].count == 3
+    assert instrumentation.players["0"].count == 3
+    assert instrumentation.players["2"].count == 1
+    assert instrumentation.counters["player_errors"] == 1
+    assert instrumentation.counters["eliminations"] == 1
+    assert instrumentation.counters["moves"] == 3 + 2 + 2
+
+
+def test_free_cell_rebuild_is_timed_only_when_it_happens():
+    instrumentation = Instrumentation()
+    game_master = instrumented_game(instrumentation)
+    game_master.tick()
+    assert "update_empty_spaces" not in instrumentation.phases
+    game_master.game.add_food(1)
+    game_master.game.add_food(1)
+    assert instrumentation.phases["update_empty_spaces"].count == 1
+
+
+def test_profile_and_trace_only_chosen_ticks():
+    instrumentation = Instrumentation(profile_ticks={1}, trace_ticks={2})
+    game_master = instrumented_game(instrumentation)
+    for _ in range(3):
+        game_master.tick()
+    assert list(instrumentation.profiles) == [1]
+    assert "_move_snakes" in instrumentation.profiles[1]
+    assert list(instrumentation.allocations) == [2]
+
+
+def test_export_json_and_prometheus(tmp_path):
+    instrumentation = Instrumentation()
+    game_master = instrumented_game(instrumentation)
+    game_master.tick()
+    instrumentation.export(tmp_path / "metrics.json")
+    instrumentation.export(tmp_path / "metrics.prom")
+    data = json.loads((tmp_path / "metrics.json").read_text())
+    assert data["ticks"] == 1
+    assert data["phases"]["tick"]["count"] == 1
+    text = (tmp_path / "metrics.prom").read_text()
+    assert "snakey_ticks_total 1" in text
+    assert 'snakey_phase_seconds_count{phase="tick"} 1' in text
+    assert 'snakey_player_move_seconds_bucket{player="0",le="+Inf"} 1' in text
+
+
+def test_disabled_instrumentation_leaves_tick_unchanged():
+    plain = GameMaster(SnakeyGame(8, 8))
+    plain.add_player(SteadyPlayer(0), Snake([(0, 0)]))
+    plain.tick()
+    assert plain.instrumentation is None
+    assert plain.players_snakes[0].positions[0] == (0, 1)
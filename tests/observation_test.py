@@ -0,0 +1,132 @@
+import sys
+
+sys.path.append("../snakey")
+from hypothesis import given, strategies as st
+import numpy as np
+import pytest
+from game_master import GameMaster
+from observation import (
+    ENEMY_BODIES,
+    ENEMY_HEADS,
+    FOOD,
+    OWN_BODY,
+    OWN_HEAD,
+    SYMMETRIES,
+    TAIL_DISTANCE,
+    WALLS,
+    ObservationEncoder,
+    augment,
+    transitions,
+)
+from snake import MOVE_DELTAS, GameMove, Snake
+from snakey_game import SnakeyGame
+from views import GameSnapshot, GameView
+
+
+class SteadyPlayer:
+    def __init__(self, id, move):
+        self.id = id
+        self._move = move
+
+    def move(self, game, snake) -> GameMove:
+        return self._move
+
+
+def make_game() -> SnakeyGame:
+    game = SnakeyGame(6, 5, foods={(5, 4), (0, 3)})
+    game.add_snake(Snake([(1, 1), (1, 2), (2, 2)]))
+    game.add_snake(Snake([(4, 0), (3, 0)]))
+    return game
+
+
+def test_encode_full_board_planes():
+    game = make_game()
+    encoder = ObservationEncoder(6, 5)
+    planes = encoder.encode(game, game.snakes[0])
+    assert planes.shape == (7, 6, 5)
+    assert list(zip(*np.nonzero(planes[OWN_HEAD]))) == [(1, 1)]
+    assert set(zip(*np.nonzero(planes[OWN_BODY]))) == {(1, 1), (1, 2), (2, 2)}
+    assert list(zip(*np.nonzero(planes[ENEMY_HEADS]))) == [(4, 0)]
+    assert set(zip(*np.nonzero(planes[ENEMY_BODIES]))) == {(4, 0), (3, 0)}
+    assert set(zip(*np.nonzero(planes[FOOD]))) == {(5, 4), (0, 3)}
+    assert planes[TAIL_DISTANCE, 1, 1] == 1.0
+    assert planes[TAIL_DISTANCE, 2, 2] == pytest.approx(1 / 3)
+    assert planes[TAIL_DISTANCE, 3, 0] == 0.5
+    assert not planes[WALLS].any()
+
+
+def test_encode_reuses_buffers():
+    game = make_game()
+    encoder = ObservationEncoder(6, 5)
+    first = encoder.encode(game, game.snakes[0])
+    second = encoder.encode(game, game.snakes[1])
+    assert first is second
+    assert list(zip(*np.nonzero(second[OWN_HEAD]))) == [(4, 0)]
+
+
+@pytest.mark.parametrize("crop", [None, 2])
+def test_encode_tracks_game_changes(crop):
+    game = make_game()
+    encoder = ObservationEncoder(6, 5, crop)
+    encoder.encode(game, game.snakes[0])
+    game.move_snake(game.snakes[1], GameMove.RIGHT)
+    game.consume_food((0, 3))
+    for snake in game.snakes:
+        fresh = ObservationEncoder(6, 5, crop).encode(game, snake)
+        assert np.array_equal(encoder.encode(game, snake), fresh)
+
+
+@pytest.mark.parametrize("of", [GameView.of, GameSnapshot.of])
+def test_encode_reads_views(of):
+    game = make_game()
+    encoder = ObservationEncoder(6, 5)
+    view = of(game)
+    for snake, seen in zip(game.snakes, view.snakes):
+        fresh = ObservationEncoder(6, 5).encode(game, snake)
+        assert np.array_equal(encoder.encode(view, seen), fresh)
+    game.move_snake(game.snakes[1], GameMove.RIGHT)
+    view = of(game)
+    fresh = ObservationEncoder(6, 5).encode(game, game.snakes[0])
+    assert np.array_equal(encoder.encode(view, view.snakes[0]), fresh)
+
+
+def test_egocentric_crop_marks_walls():
+    game = make_game()
+    encoder = ObservationEncoder(6, 5, crop=2)
+    window = encoder.encode(game, game.snakes[1])
+    assert window.shape == (7, 5, 5)
+    assert window[OWN_HEAD, 2, 2] == 1.0
+    assert window[ENEMY_BODIES, 0, 3] == 0.0
+    assert window[OWN_BODY, 1, 2] == 1.0
+    assert window[WALLS, :, :2].all()
+    assert window[WALLS, 4, :].all()
+    assert not window[WALLS, :4, 2:].any()
+
+
+@given(st.sampled_from(list(GameMove)))
+def test_augment_remaps_moves_with_planes(move):
+    planes = np.zeros((1, 5, 5))
+    dx, dy = MOVE_DELTAS[move]
+    planes[0, 2 + dx, 2 + dy] = 1
+    augmented = list(augment(planes, move))
+    assert len(augmented) == SYMMETRIES
+    for transformed, moved in augmented:
+        dx, dy = MOVE_DELTAS[moved]
+        assert transformed[0, 2 + dx, 2 + dy] == 1
+
+
+def test_transitions_stream_until_game_ends():
+    game_master = GameMaster(SnakeyGame(6, 6))
+    game_master.add_player(SteadyPlayer(0, GameMove.RIGHT), Snake([(0, 0)]))
+    game_master.add_player(SteadyPlayer(1, GameMove.DOWN), Snake([(2, 3)]))
+    stream = list(transitions(game_master, ObservationEncoder(6, 6), copy=True))
+    assert [(t.player, t.action) for t in stream[:2]] == [
+        (0, GameMove.RIGHT),
+        (1, GameMove.DOWN),
+    ]
+    assert stream[1].observation[OWN_HEAD, 2, 3] == 1.0
+    assert stream[2].observation[OWN_HEAD, 0, 1] == 1.0
+    last = {t.player: t for t in stream[-2:]}
+    assert last[0].reward == 1.0 and last[0].done
+    assert last[1].reward == -1.0 and last[1].done
+    assert not any(t.done for t in stream[:-2])
@@ -0,0 +1,120 @@
+import sys
+
+sys.path.append("../snakey")
+import pytest
+from copy import deepcopy
+from occupancy_grid import OccupancyGrid
+from snakey_game import SnakeyGame
+from snake import GameMove, Snake
+from hypothesis import given
+from hypothesis.strategies import lists, integers, composite, sampled_from
+
+
+@composite
+def get_snakey_game(draw):
+    max_x = draw(integers(min_value=1, max_value=8))
+    max_y = draw(integers(min_value=1, max_value=8))
+    snakes = []
+    for _ in range(draw(integers(min_value=0, max_value=6))):
+        position = (
+            draw(integers(min_value=-1, max_value=max_x)),
+            draw(integers(min_value=-1, max_value=max_y)),
+        )
+        positions = [position]
+        for move in draw(lists(sampled_from(list(GameMove)), max_size=5)):
+            snake = Snake(positions=[positions[-1]])
+            snake.move(move)
+            positions.append(snake.get_head())
+        snakes.append(Snake(positions=positions))
+    return SnakeyGame(max_x, max_y, snakes=snakes)
+
+
+def scanned_dead_snakes(game: SnakeyGame) -> list[Snake]:
+    return [snake for snake in game.snakes if not game.is_valid_snake(snake)]
+
+
+@given(get_snakey_game())
+def test_OccupancyGrid_dead_snakes_match_scan(snakey_game: SnakeyGame):
+    expected = scanned_dead_snakes(snakey_game)
+    actual = snakey_game.get_dead_snakes()
+    assert [id(snake) for snake in actual] == [id(snake) for snake in expected]
+
+
+@given(get_snakey_game(), lists(sampled_from(list(GameMove)), max_size=20))
+def test_OccupancyGrid_incremental_updates_match_rebuild(snakey_game, moves):
+    snakey_game.get_occupancy()
+    for i, move in enumerate(moves):
+        if not snakey_game.snakes:
+            break
+        snake = snakey_game.snakes[i % len(snakey_game.snakes)]
+        snakey_game.move_snake(snake, move)
+        if i % 3 == 0:
+            snakey_game.grow_snake(snake)
+        if i % 7 == 6:
+            snakey_game.remove_snake(snake)
+        assert [id(s) for s in snakey_game.get_dead_snakes()] == [
+            id(s) for s in scanned_dead_snakes(snakey_game)
+        ]
+
+    rebuilt = OccupancyGrid(snakey_game.max_x, snakey_game.max_y)
+    for snake in snakey_game.snakes:
+        rebuilt.add_snake(snake)
+    assert snakey_game.occupancy.owners == rebuilt.owners
+    assert snakey_game.occupancy.shared == rebuilt.shared
+
+
+@pytest.mark.parametrize(
+    "snakes, dead",
+    [
+        ([Snake([(0, 0)]), Snake([(0, 0)])], [0, 1]),
+        ([Snake([(0, 0), (0, 1)]), Snake([(0, 1)])], [0, 1]),
+        ([Snake([(0, 0)]), Snake([(2, 2)])], []),
+        ([Snake([(3, 0)]), Snake([(2, 2)])], [0]),
+        ([Snake([(0, 0), (0, 1), (0, 0)]), Snake([(2, 2)])], []),
+        ([Snake([(0, 0), (1, 1)]), Snake([(2, 2)])], [0]),
+    ],
+)
+def test_OccupancyGrid_collisions(snakes: list[Snake], dead: list[int]):
+    game = SnakeyGame(3, 3, snakes=snakes)
+    dead_ids = [id(snake) for snake in game.get_dead_snakes()]
+    assert dead_ids == [id(snakes[i]) for i in dead]
+
+
+def test_OccupancyGrid_add_snake_builds_grid_once():
+    game = SnakeyGame(3, 3)
+    game.add_snake(Snake([(0, 0)]))
+    game.add_snake(Snake([(2, 2)]))
+    assert game.get_dead_snakes() == []
+    assert game.occupancy.shared == set()
+
+
+def test_OccupancyGrid_survives_deepcopy():
+    game = SnakeyGame(3, 3, snakes=[Snake([(0, 0)]), Snake([(3, 0)])])
+    game.get_dead_snakes()
+    copy = deepcopy(game)
+    copy.move_snake(copy.snakes[0], GameMove.UP)
+    assert copy.get_dead_snakes() == [copy.snakes[1]]
+    assert copy.get_dead_snakes()[0] is copy.snakes[1]
+    assert game.snakes[0].get_head() == (0, 0)
+
+
+@pytest.mark.parametrize(
+    "positions, moves, grow, dead",
+    [
+        ([(0, 0), (2, 0)], [GameMove.RIGHT], False, False),
+        ([(0, 0), (2, 0), (2, 1)], [GameMove.RIGHT], False, True),
+        ([(0, 0), (2, 0), (2, 1)], [GameMove.RIGHT, GameMove.RIGHT], False, False),
+        # Growing re-attaches the old tail, which reopens the gap.
+        ([(0, 0), (2, 0)], [GameMove.RIGHT], True, True),
+        ([(1, 0), (0, 1)], [GameMove.RIGHT, GameMove.RIGHT], True, True),
+    ],
+)
+def test_OccupancyGrid_malformed_is_rechecked(positions, moves, grow, dead):
+    snake = Snake(positions=positions)
+    game = SnakeyGame(5, 5, snakes=[snake])
+    assert game.get_dead_snakes() == [snake]
+    for move in moves:
+        game.move_snake(snake, move)
+        if grow:
+            game.grow_snake(snake)
+    assert bool(game.get_dead_snakes()) == dead == (not snake.is_valid())
@@ -0,0 +1,104 @@
+import sys
+
+sys.path.append("../snakey")
+from copy import deepcopy
+from random import Random
+import pytest
+from game_master import GameMaster
+from replay import HEADER, Replay, ReplayRecorder
+from snake import GameMove
+from snakey_game import SnakeyGame
+
+
+class RandomPlayer:
+    def __init__(self, id, seed, raise_at=None):
+        self.id = id
+        self.rng = Random(seed)
+        self.raise_at = raise_at
+        self.calls = 0
+
+    def move(self, game, snake) -> GameMove:
+        self.calls += 1
+        if self.calls == self.raise_at:
+            raise RuntimeError("bot crashed")
+        valid_moves = game.get_valid_moves(snake) or list(GameMove)
+        return self.rng.choice(valid_moves)
+
+
+class FoodSpawner:
+    def on_tick(self, game_master: GameMaster) -> None:
+        game_master.game.add_food(1)
+
+
+class Snapshots:
+    def __init__(self):
+        self.states = []
+
+    def on_tick(self, game_master: GameMaster) -> None:
+        self.states.append(
+            (
+                [list(snake.positions) for snake in game_master.game.snakes],
+                set(game_master.game.foods),
+                dict(game_master.rankings),
+            )
+        )
+
+
+def play_recorded_game(seed: int) -> tuple[GameMaster, ReplayRecorder, Snapshots]:
+    game_master = GameMaster(SnakeyGame(8, 8, rng=Random(seed)))
+    game_master.game.add_food(3)
+    for i in range(4):
+        game_master.add_player(
+            RandomPlayer(i, seed + i, raise_at=5 if i == 3 else None)
+        )
+    snapshots = Snapshots()
+    game_master.observers.append(FoodSpawner())
+    recorder = ReplayRecorder.attach(game_master, seed)
+    game_master.observers.append(snapshots)
+    for _ in range(200):
+        if len(game_master.active_players) <= 1:
+            break
+        game_master.tick()
+    return game_master, recorder, snapshots
+
+
+def replayed_state(game_master: GameMaster):
+    return (
+        [list(snake.positions) for snake in game_master.game.snakes],
+        set(game_master.game.foods),
+        dict(game_master.rankings),
+    )
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_Replay_rebuilds_every_tick(seed):
+    game_master, recorder, snapshots = play_recorded_game(seed)
+    replay = Replay.from_bytes(recorder.to_bytes())
+    replay.setup = lambda game_master: game_master.observers.append(FoodSpawner())
+    replay.checkpoint_interval = 4
+    replay.game_master_at(len(replay))
+
+    assert len(replay) == len(snapshots.states)
+    for tick, state in enumerate(snapshots.states):
+        assert replayed_state(replay.game_master_at(tick + 1)) == state
+    assert replay.game_master_at(len(replay)).rankings == game_master.rankings
+
+
+def test_Replay_is_compact():
+    game_master, recorder, snapshots = play_recorded_game(5)
+    data = recorder.to_bytes()
+    ticks = len(snapshots.states)
+    assert len(data) < HEADER.size + 4 * (ticks + 2) + 8 * 5 + 4 * 200
+    assert len(data) < len(repr(deepcopy(game_master.game))) * max(ticks, 1)
+
+
+def test_Replay_roundtrips_file(tmp_path):
+    _, recorder, _ = play_recorded_game(6)
+    path = tmp_path / "game.snkr"
+    recorder.save(path)
+    assert Replay.load(path).to_bytes() == recorder.to_bytes()
+
+
+def test_Replay_rejects_garbage():
+    with pytest.raises(ValueError):
+        Replay.from_bytes(b"NOPE" + bytes(HEADER.size))
@@ -0,0 +1,130 @@
+import sys
+
+sys.path.append("../snakey")
+import asyncio
+from time import perf_counter, sleep
+import pytest
+from game_master import GameMaster
+from scheduler import LATENCY_WINDOW, MoveScheduler
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+
+
+class SleepyPlayer:
+    def __init__(self, id, delay, move=GameMove.RIGHT):
+        self.id = id
+        self.delay = delay
+        self.next_move = move
+
+    def move(self, game, snake) -> GameMove:
+        sleep(self.delay)
+        return self.next_move
+
+
+class AsyncPlayer:
+    def __init__(self, id, delay):
+        self.id = id
+        self.delay = delay
+
+    async def move(self, game, snake) -> GameMove:
+        await asyncio.sleep(self.delay)
+        return GameMove.RIGHT
+
+
+class CrashingPlayer:
+    def __init__(self, id):
+        self.id = id
+
+    def move(self, game, snake) -> GameMove:
+        raise RuntimeError("crash")
+
+
+def make_game_master(players, scheduler: MoveScheduler) -> GameMaster:
+    game_master = GameMaster(SnakeyGame(10, 10), scheduler=scheduler)
+    for i, player in enumerate(players):
+        game_master.add_player(player, Snake([(i * 2, 0)]))
+    return game_master
+
+
+def test_MoveScheduler_runs_players_concurrently():
+    scheduler = MoveScheduler(time_limit=2)
+    players = [SleepyPlayer(i, 0.2) for i in range(4)]
+    game_master = make_game_master(players, scheduler)
+
+    start = perf_counter()
+    game_master.tick()
+    elapsed = perf_counter() - start
+    scheduler.close()
+
+    assert elapsed < 0.6
+    assert len(game_master.active_players) == 4
+    assert all(snake.get_head()[1] == 1 for snake in game_master.game.snakes)
+    assert all(
+        0.15 < latency < 0.6
+        for samples in scheduler.latencies.values()
+        for latency in samples
+    )
+
+
+def test_MoveScheduler_eliminates_on_timeout():
+    scheduler = MoveScheduler(time_limit=0.05)
+    players = [SleepyPlayer(0, 0), SleepyPlayer(1, 0), SleepyPlayer(2, 0.5)]
+    game_master = make_game_master(players, scheduler)
+
+    game_master.tick()
+    scheduler.close()
+
+    assert [player.id for player in game_master.active_players] == [0, 1]
+    assert game_master.rankings == {2: 4}
+    assert game_master.last_moves[2] is None
+
+
+def test_MoveScheduler_uses_fallback_on_timeout():
+    scheduler = MoveScheduler(time_limit=0.05, fallback=GameMove.UP)
+    players = [SleepyPlayer(0, 0), SleepyPlayer(1, 0.5)]
+    game_master = make_game_master(players, scheduler)
+
+    game_master.tick()
+    scheduler.close()
+
+    assert len(game_master.active_players) == 2
+    assert game_master.last_moves == {0: GameMove.RIGHT, 1: GameMove.UP}
+    assert game_master.players_snakes[1].get_head() == (3, 0)
+
+
+def test_MoveScheduler_supports_async_players_and_errors():
+    scheduler = MoveScheduler(time_limit=1)
+    players = [AsyncPlayer(0, 0.1), AsyncPlayer(1, 0.1), CrashingPlayer(2)]
+    game_master = make_game_master(players, scheduler)
+
+    game_master.tick()
+    scheduler.close()
+
+    assert [player.id for player in game_master.active_players] == [0, 1]
+    assert scheduler.latencies[0][-1] == pytest.approx(0.1, abs=0.09)
+
+
+def test_MoveScheduler_slow_bot_does_not_stall_the_pool():
+    scheduler = MoveScheduler(time_limit=0.05, fallback=GameMove.UP, max_workers=4)
+    players = [SleepyPlayer(0, 0.5), SleepyPlayer(1, 0), SleepyPlayer(2, 0)]
+    game_master = make_game_master(players, scheduler)
+
+    for _ in range(6):
+        game_master.tick()
+        assert game_master.last_moves[1] == game_master.last_moves[2] == GameMove.RIGHT
+    scheduler.close()
+
+    assert len(scheduler.latencies[0]) == len(scheduler.latencies[1]) == 6
+    assert all(latency < 0.05 for latency in scheduler.latencies[1])
+    assert all(latency >= 0.05 for latency in scheduler.latencies[0])
+
+
+def test_MoveScheduler_keeps_a_bounded_latency_window():
+    scheduler = MoveScheduler()
+    players = [SleepyPlayer(0, 0, GameMove.UP)]
+    arguments = [(None, None)]
+    for _ in range(LATENCY_WINDOW + 10):
+        scheduler.decide(players, arguments)
+    scheduler.close()
+
+    assert len(scheduler.latencies[0]) == LATENCY_WINDOW
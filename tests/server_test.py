@@ -0,0 +1,183 @@
+import sys
+
+sys.path.append("../snakey")
+import asyncio
+import time
+from game_master import GameMaster
+from scheduler import LATENCY_WINDOW, MoveScheduler
+from server import (
+    GameHost,
+    RemotePlayer,
+    decode_state,
+    encode_state,
+    load_test,
+    percentile,
+    start_player_server,
+)
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+
+
+class SteadyPlayer:
+    def __init__(self, id=None, move=GameMove.UP):
+        self.id = id
+        self._move = move
+
+    def move(self, game, snake) -> GameMove:
+        return self._move
+
+
+class CarefulPlayer:
+    def __init__(self, id=None):
+        self.id = id
+
+    def move(self, game, snake) -> GameMove:
+        valid_moves = game.get_valid_moves(snake)
+        return valid_moves[0] if valid_moves else GameMove.UP
+
+
+class SlowPlayer:
+    def __init__(self, id=None):
+        self.id = id
+
+    async def move(self, game, snake) -> GameMove:
+        await asyncio.sleep(1)
+        return GameMove.UP
+
+
+class SleepyPlayer:
+    def __init__(self, id=None):
+        self.id = id
+
+    def move(self, game, snake) -> GameMove:
+        time.sleep(0.3)
+        return GameMove.UP
+
+
+class AsyncCarefulPlayer(CarefulPlayer):
+    async def move(self, game, snake) -> GameMove:
+        return super().move(game, snake)
+
+
+def make_game_master(*players) -> GameMaster:
+    game_master = GameMaster(SnakeyGame(8, 8))
+    for i, player in enumerate(players):
+        game_master.add_player(player, Snake([(i, 0)]))
+    return game_master
+
+
+def test_state_round_trip():
+    game = SnakeyGame(5, 4, foods={(1, 1)})
+    game.add_snake(Snake([(0, 0), (0, 1)]))
+    game.add_snake(Snake([(3, 3)]))
+    copy, snake = decode_state(encode_state(game, game.snakes[1]))
+    assert copy.snakes == game.snakes and copy.foods == game.foods
+    assert snake is copy.snakes[1]
+
+
+def test_host_runs_games_to_their_limits():
+    host = GameHost(tick_rate=None)
+    short = host.add_game(make_game_master(CarefulPlayer(0), CarefulPlayer(1)), 5)
+    long = host.add_game(make_game_master(CarefulPlayer(0), CarefulPlayer(1)), 12)
+    over = host.add_game(make_game_master(CarefulPlayer(0), SteadyPlayer(1)), 50)
+    asyncio.run(host.run())
+    host.close()
+    assert (short.ticks, long.ticks) == (5, 12)
+    assert over.ticks < 50 and over.finished
+    assert list(over.game_master.rankings) == [1]
+    assert len(host.latencies()) == 5 + 12 + over.ticks
+
+
+def test_fixed_tick_rate_paces_games():
+    host = GameHost(tick_rate=100)
+    hosted = host.add_game(make_game_master(CarefulPlayer(0), CarefulPlayer(1)), 5)
+
+    async def timed() -> float:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await host.run()
+        return loop.time() - start
+
+    assert asyncio.run(timed()) >= 0.04
+    assert hosted.ticks == 5
+    host.close()
+
+
+def test_slow_bots_fall_back_instead_of_stalling():
+    host = GameHost(tick_rate=None, scheduler=MoveScheduler(0.01, GameMove.RIGHT))
+    hosted = host.add_game(make_game_master(SlowPlayer(0), CarefulPlayer(1)), 3)
+    asyncio.run(host.run())
+    host.close()
+    assert hosted.ticks == 3
+    assert hosted.game_master.last_moves[0] == GameMove.RIGHT
+    assert max(hosted.latencies) < 0.5
+    assert hosted.latencies.maxlen == LATENCY_WINDOW
+
+
+def test_games_do_not_share_player_state():
+    # Both games have a player 0; only game A's is slow.
+    host = GameHost(tick_rate=50, scheduler=MoveScheduler(0.02, GameMove.LEFT))
+    slow = host.add_game(make_game_master(SleepyPlayer(0), CarefulPlayer(1)), 5)
+    fast = host.add_game(make_game_master(SteadyPlayer(0), CarefulPlayer(1)), 5)
+    asyncio.run(host.run())
+    host.close()
+    assert slow.game_master.last_moves[0] == GameMove.LEFT
+    assert fast.game_master.last_moves[0] == GameMove.UP
+    assert fast.ticks == 5
+
+
+def test_remote_players_over_socket():
+    async def scenario():
+        server = await start_player_server(CarefulPlayer)
+        port = server.sockets[0].getsockname()[1]
+        players = [await RemotePlayer.connect(i, "127.0.0.1", port) for i in range(2)]
+        host = GameHost(tick_rate=None)
+        hosted = host.add_game(make_game_master(*players), 10)
+        await host.run()
+        for player in players:
+            await player.close()
+        server.close()
+        await server.wait_closed()
+        host.close()
+        return hosted
+
+    hosted = asyncio.run(scenario())
+    assert hosted.ticks == 10
+    assert set(hosted.game_master.last_moves.values()) <= set(GameMove)
+
+
+def test_player_server_awaits_async_bots_and_threads_sync_ones():
+    async def scenario():
+        servers = [
+            await start_player_server(factory)
+            for factory in (AsyncCarefulPlayer, SleepyPlayer, CarefulPlayer)
+        ]
+        players = [
+            await RemotePlayer.connect(i, "127.0.0.1", s.sockets[0].getsockname()[1])
+            for i, s in enumerate(servers)
+        ]
+        game = SnakeyGame(4, 4)
+        game.add_snake(Snake([(0, 0)]))
+        asleep = asyncio.create_task(players[1].move(game, game.snakes[0]))
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        moves = [await player.move(game, game.snakes[0]) for player in players[::2]]
+        waited = time.perf_counter() - start
+        moves.append(await asleep)
+        for player in players:
+            await player.close()
+        for server in servers:
+            server.close()
+            await server.wait_closed()
+        return moves, waited
+
+    moves, waited = asyncio.run(scenario())
+    assert moves == [GameMove.UP] * 3
+    assert waited < 0.2
+
+
+def test_load_test_reports_per_game_count():
+    results = asyncio.run(load_test([1, 3], CarefulPlayer, 2, 6, 6, ticks=4))
+    assert [result.games for result in results] == [1, 3]
+    assert all(result.ticks_per_second > 0 for result in results)
+    assert percentile([3.0, 1.0, 2.0], 0.99) == 3.0
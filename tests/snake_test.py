@@ -2,6 +2,7 @@ import sys
 
 sys.path.append("../snakey")
 import pytest
+from collections import Counter
 from snake import GameMove, Snake
 from hypothesis import assume, given
 from hypothesis.strategies import lists, sets, tuples, integers, composite, sampled_from
@@ -122,3 +123,31 @@ def test_valid_snake_positions(positions):
 )
 def test_invalid_snake_positions(positions):
     assert not Snake(positions).is_valid()
+
+
+@given(
+    positions_strategy,
+    lists(sampled_from([GameMove.UP, GameMove.DOWN, GameMove.LEFT, GameMove.RIGHT])),
+)
+def test_Snake_cells_track_positions(positions, moves):
+    snake = Snake(positions=positions)
+    for i, move in enumerate(moves):
+        snake.move(move)
+        if i % 2:
+            snake.add_size()
+        assert snake.cells == Counter(snake.positions)
+        assert snake.is_self_colliding() == (
+            len(set(snake.positions)) < len(snake.positions)
+        )
+        assert all(snake.occupies(position) for position in snake.positions)
+
+
+def test_Snake_move_reuses_body():
+    snake = Snake(positions=[(0, 0), (0, 1), (0, 2)])
+    body = snake.positions
+
+    snake.move(GameMove.UP)
+
+    assert snake.positions is body
+    assert snake.get_positions() == [(1, 0), (0, 0), (0, 1)]
+    assert not snake.occupies((0, 2))
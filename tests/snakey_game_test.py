@@ -295,3 +295,59 @@ def test_SnakeyGame_some_valid_moves(snakey_game: SnakeyGame, num_valid_moves: i
 def test_SnakeyGame_no_valid_moves(snakey_game: SnakeyGame):
     valid_moves = snakey_game.get_valid_moves(snakey_game.snakes[0])
     assert len(valid_moves) == 0
+
+
+@given(
+    get_snakey_game(),
+    lists(sampled_from([GameMove.UP, GameMove.DOWN, GameMove.LEFT, GameMove.RIGHT])),
+)
+def test_SnakeyGame_empty_spaces_incremental_matches_rebuild(snakey_game, moves):
+    snakey_game.get_empty_spaces()
+    for i, move in enumerate(moves):
+        if not snakey_game.snakes:
+            break
+        snake = snakey_game.snakes[i % len(snakey_game.snakes)]
+        snakey_game.move_snake(snake, move)
+        if i % 2:
+            snakey_game.grow_snake(snake)
+        if i % 5 == 4:
+            snakey_game.remove_snake(snake)
+    snakey_game.add_food()
+    incremental = set(snakey_game.get_empty_spaces())
+
+    snakey_game.update_empty_spaces()
+
+    assert incremental == set(snakey_game.get_empty_spaces())
+
+
+@composite
+def get_crowded_game(draw):
+    max_x = draw(integers(min_value=1, max_value=6))
+    max_y = draw(integers(min_value=1, max_value=6))
+    snakes = []
+    for _ in range(draw(integers(min_value=1, max_value=6))):
+        positions = [
+            (
+                draw(integers(min_value=-1, max_value=max_x)),
+                draw(integers(min_value=-1, max_value=max_y)),
+            )
+        ]
+        for move in draw(lists(sampled_from(list(GameMove)), max_size=6)):
+            snake = Snake([positions[-1]])
+            snake.move(move)
+            positions.append(snake.get_head())
+        snakes.append(Snake(positions))
+    return SnakeyGame(max_x, max_y, snakes=snakes)
+
+
+@given(get_crowded_game())
+def test_SnakeyGame_fast_valid_moves_match_scan(snakey_game: SnakeyGame):
+    snakes = list(snakey_game.snakes)
+    masks = snakey_game.get_valid_move_masks()
+    for snake, mask in zip(snakes, masks):
+        assert mask == snakey_game._scan_valid_move_mask(snake)
+        assert snakey_game.get_valid_moves(snake) == [
+            move for i, move in enumerate(GameMove) if mask >> i & 1
+        ]
+    assert all(a is b for a, b in zip(snakes, snakey_game.snakes))
+    assert len(snakes) == len(snakey_game.snakes)
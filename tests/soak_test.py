@@ -0,0 +1,62 @@
+import sys
+
+sys.path.append("../snakey")
+
+import pytest
+from game_master import GameMaster
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+from soak import ScriptedPlayer, SoakThresholds, random_game, soak
+
+
+def scripted_game(seed: int) -> GameMaster:
+    game_master = GameMaster(SnakeyGame(6, 6))
+    moves = [GameMove.UP, GameMove.RIGHT, GameMove.DOWN, GameMove.LEFT]
+    for i in range(2):
+        game_master.add_player(ScriptedPlayer(i, moves), Snake([(i * 3, 0)]))
+    return game_master
+
+
+@pytest.mark.parametrize("factory", [random_game, scripted_game])
+def test_soak_samples_and_passes(factory):
+    # Short windows are noisy, so only memory is held to the defaults here.
+    thresholds = SoakThresholds(latency_drift=50.0)
+    report = soak(600, factory, sample_every=200, warmup=50, thresholds=thresholds)
+    assert [sample.tick for sample in report.samples] == [0, 200, 400, 600]
+    assert report.ticks == 600
+    assert all(sample.rss > 0 for sample in report.samples)
+    assert report.passed, report.failures
+
+
+def test_random_games_restart():
+    report = soak(2_000, random_game, sample_every=1_000, trace=False)
+    assert report.games > 0
+    assert report.samples[-1].games == report.games
+    assert not report.top_allocators
+
+
+class LeakyObserver:
+    def __init__(self):
+        self.leaked = []
+
+    def on_tick(self, game_master: GameMaster) -> None:
+        self.leaked.append(bytes(1_000))
+
+
+def test_soak_fails_past_thresholds():
+    observer = LeakyObserver()
+
+    def leaky_game(seed: int) -> GameMaster:
+        game_master = random_game(seed)
+        game_master.observers.append(observer)
+        return game_master
+
+    report = soak(
+        300,
+        leaky_game,
+        sample_every=100,
+        thresholds=SoakThresholds(traced_growth=100_000, latency_drift=0.0),
+    )
+    assert len(report.failures) == 2
+    assert report.failures[0].startswith("Traced memory grew")
+    assert "soak_test.py" in report.top_allocators[0]
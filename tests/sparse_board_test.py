@@ -0,0 +1,67 @@
+import sys
+
+sys.path.append("../snakey")
+from functools import partial
+from hypothesis import given
+from hypothesis.strategies import lists, sampled_from
+import pytest
+from backends import assert_plays_alike, get_games
+from game_master import GameMaster
+from snake import GameMove, Snake
+from sparse_board import ChunkedOwners, SparseSnakeyGame
+
+
+class SteadyPlayer:
+    def __init__(self, id):
+        self.id = id
+
+    def move(self, game, snake) -> GameMove:
+        return GameMove.UP
+
+
+@given(
+    get_games(partial(SparseSnakeyGame, chunk_size=3)),
+    lists(sampled_from(list(GameMove)), max_size=15),
+)
+def test_SparseSnakeyGame_matches_SnakeyGame(games, moves):
+    assert_plays_alike(games, moves)
+
+
+def test_chunks_are_dropped_when_empty():
+    owners = ChunkedOwners(100, 100, chunk_size=10)
+    owners[5050] = 1
+    owners[5051] = 2
+    assert owners[5051] == 2 and owners[0] == 0
+    assert len(owners.chunks) == 1 and owners.occupied() == 2
+    owners[5050] = 0
+    owners[5051] = 0
+    assert not owners.chunks and owners.occupied() == 0
+
+
+def test_random_empty_space_on_nearly_full_board():
+    game = SparseSnakeyGame(5, 4, chunk_size=2)
+    positions = [(x, y) for y in range(4) for x in range(5) if (x, y) != (3, 2)]
+    for position in positions[1:]:
+        game.add_snake(Snake([position]))
+    game.foods.add(positions[0])
+    game.seed(1)
+    assert {game.random_empty_space() for _ in range(5)} == {(3, 2)}
+    game.add_food(3)
+    assert game.count_empty_spaces() == 0
+    with pytest.raises(IndexError):
+        game.random_empty_space()
+
+
+def test_large_board_stores_only_occupied_chunks():
+    game = SparseSnakeyGame(10_000, 10_000)
+    game_master = GameMaster(game)
+    for i in range(200):
+        game_master.add_player(SteadyPlayer(i))
+    game.add_food(100)
+    for _ in range(3):
+        game_master.tick()
+    owners = game.get_occupancy().owners
+    assert len(owners.chunks) <= 200
+    assert owners.occupied() == sum(len(s.cells) for s in game.snakes)
+    covered = sum(any(food in s.cells for s in game.snakes) for food in game.foods)
+    assert game.count_empty_spaces() == 10_000**2 - owners.occupied() - 100 + covered
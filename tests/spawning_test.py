@@ -0,0 +1,70 @@
+import sys
+
+sys.path.append("../snakey")
+from itertools import combinations
+from math import dist
+from random import Random
+import pytest
+from bitboard import BitboardSnakeyGame
+from exceptions import NotEnoughSpaceException
+from game_master import GameMaster
+from snake import Snake
+from snakey_game import SnakeyGame
+from sparse_board import SparseSnakeyGame
+from spawning import PoissonDiscSpawn, SymmetricSpawn, UniformSpawn
+
+
+class Idle:
+    def __init__(self, id=None):
+        self.id = id
+
+
+def heads(game_master: GameMaster) -> list[tuple[int, int]]:
+    return [snake.get_head() for snake in game_master.players_snakes.values()]
+
+
+@pytest.mark.parametrize(
+    "game_class", [SnakeyGame, BitboardSnakeyGame, SparseSnakeyGame]
+)
+@pytest.mark.parametrize(
+    "strategy", [UniformSpawn(), PoissonDiscSpawn(), SymmetricSpawn()]
+)
+def test_add_players_never_overlaps_on_crowded_board(game_class, strategy):
+    game = game_class(12, 12, foods={(0, 0), (5, 5)}, rng=Random(4))
+    game.add_snake(Snake([(1, 1), (1, 2), (1, 3)]))
+    game_master = GameMaster(game)
+    game_master.add_players([Idle(i) for i in range(139)], strategy)
+    assert len(set(heads(game_master))) == 139
+    assert game.is_valid_state()
+    assert game.count_empty_spaces() == 0
+    assert not set(heads(game_master)) & game.foods
+
+
+def test_add_players_rejects_more_players_than_cells():
+    game_master = GameMaster(SnakeyGame(3, 3))
+    with pytest.raises(NotEnoughSpaceException):
+        game_master.add_players([Idle(i) for i in range(10)])
+    assert not game_master.active_players
+
+
+def test_poisson_disc_keeps_minimum_distance():
+    game_master = GameMaster(SnakeyGame(30, 30, rng=Random(1)))
+    game_master.add_players([Idle(i) for i in range(20)], PoissonDiscSpawn(4.0))
+    for a, b in combinations(heads(game_master), 2):
+        assert dist(a, b) >= 4.0
+
+
+def test_symmetric_layout_uses_inset_corners():
+    game_master = GameMaster(SnakeyGame(11, 11))
+    game_master.add_players([Idle(i) for i in range(4)], SymmetricSpawn(margin=1))
+    assert heads(game_master) == [(1, 1), (9, 1), (9, 9), (1, 9)]
+
+
+def test_uniform_spawn_is_seeded():
+    def spawn(seed):
+        game_master = GameMaster(SnakeyGame(20, 20, rng=Random(seed)))
+        game_master.add_players([Idle(i) for i in range(50)])
+        return heads(game_master)
+
+    assert spawn(7) == spawn(7)
+    assert spawn(7) != spawn(8)
@@ -0,0 +1,87 @@
+import sys
+
+sys.path.append("../snakey")
+
+from copy import deepcopy
+import pytest
+from game_master import GameMaster
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+from termination import FoodTimeout, LastStanding, TickLimit
+
+
+class StillPlayer:
+    def __init__(self, id, move=GameMove.RIGHT):
+        self.id = id
+        self._move = move
+
+    def move(self, game, snake):
+        return self._move
+
+
+def build(count: int, size: int = 20) -> GameMaster:
+    gm = GameMaster(SnakeyGame(size, size))
+    for i in range(count):
+        gm.add_player(StillPlayer(i), Snake(positions=[(i, 0)]))
+    return gm
+
+
+@pytest.mark.parametrize("max_ticks", [1, 3, 7])
+def test_tick_limit_stops_game(max_ticks: int):
+    gm = build(3)
+    gm.termination.append(TickLimit(max_ticks))
+    gm.play_game()
+    assert gm.ticks == max_ticks
+    assert len(gm.active_players) == 3
+
+
+def test_food_timeout_resets_on_meal():
+    gm = build(2)
+    gm.game.foods.add((0, 2))
+    gm.termination.append(FoodTimeout(4))
+    gm.play_game()
+    assert gm.last_meal == 2
+    assert gm.ticks == 6
+
+
+def test_last_standing_stops_early():
+    gm = build(4)
+    gm.termination.append(LastStanding(3))
+    gm.active_players[0]._move = GameMove.DOWN
+    gm.play_game()
+    assert gm.ticks == 1
+    assert len(gm.active_players) == 3
+    assert set(gm.rankings) == {0}
+
+
+@pytest.mark.parametrize("dead", [[0], [1, 3], [0, 1, 2], [4, 0, 2, 1]])
+def test_batched_cleanup_ranks_and_removes(dead: list[int]):
+    gm = build(5)
+    gm._clean_out_snakes([gm.players_snakes[i] for i in dead])
+    alive = set(range(5)) - set(dead)
+    assert {player.id for player in gm.active_players} == alive
+    assert {id(snake) for snake in gm.game.snakes} == {
+        id(gm.players_snakes[i]) for i in alive
+    }
+    assert gm.rankings == {i: 6 for i in dead}
+    assert [player.id for player in gm.active_players] == sorted(alive)
+
+
+def test_cleanup_ignores_duplicates_and_survives_deepcopy():
+    gm = deepcopy(build(3))
+    snake = gm.players_snakes[1]
+    gm._clean_out_snakes([snake, snake])
+    assert gm.rankings == {1: 4}
+    assert len(gm.game.snakes) == 2
+    gm._clean_out_snakes([gm.players_snakes[0]])
+    assert [player.id for player in gm.active_players] == [2]
+
+
+def test_reset_clears_tick_counters():
+    gm = build(2)
+    gm.termination.append(TickLimit(2))
+    gm.play_game()
+    gm.reset()
+    assert gm.ticks == gm.last_meal == 0
+    gm.add_player(StillPlayer(0), Snake(positions=[(0, 0)]))
+    assert [player.id for player in gm.active_players] == [0]
@@ -0,0 +1,95 @@
+import sys
+
+sys.path.append("../snakey")
+from concurrent.futures import ThreadPoolExecutor
+from snake import GameMove
+from tournament import MatchConfig, MatchSpec, Tournament, play_match
+
+
+class CarefulPlayer:
+    def __init__(self, id=None):
+        self.id = id
+
+    def move(self, game, snake) -> GameMove:
+        valid_moves = game.get_valid_moves(snake)
+        return valid_moves[0] if valid_moves else GameMove.UP
+
+
+class Reckless:
+    def __init__(self, id=None):
+        self.id = id
+
+    def move(self, game, snake) -> GameMove:
+        return GameMove.DOWN
+
+
+config = MatchConfig(
+    {"careful": CarefulPlayer, "reckless": Reckless, "reckless2": Reckless},
+    max_x=6,
+    max_y=6,
+    max_ticks=50,
+)
+
+
+def test_play_match_is_deterministic_per_seed():
+    spec = MatchSpec(0, ("careful", "reckless"), seed=123)
+    assert play_match(spec, config) == play_match(spec, config)
+
+
+def test_play_match_placements():
+    result = play_match(MatchSpec(0, ("careful", "reckless"), seed=1), config)
+    assert result.placements == {"careful": 1, "reckless": 2}
+
+
+def test_Tournament_round_robin_over_process_pool():
+    tournament = Tournament(config, chunk_size=1, max_workers=2)
+
+    results = list(tournament.run(tournament.round_robin(rounds=2)))
+
+    assert sorted(result.game_id for result in results) == list(range(6))
+    standings = tournament.get_standings()
+    assert standings[0].name == "careful"
+    assert standings[0].win_rate == 1.0
+    assert sum(standing.games for standing in standings) == 12
+
+
+def test_Tournament_swiss_rounds():
+    tournament = Tournament(config, seed=3)
+    with ThreadPoolExecutor(2) as executor:
+        results = list(tournament.run_swiss(3, executor))
+    assert len(results) == 3
+    assert tournament.get_standings()[0].name == "careful"
+
+
+class Pacer:
+    # Steps back and forth, so it only lands on a new cell every other tick.
+    def __init__(self, id=None):
+        self.id = id
+        self.moves = []
+
+    def move(self, game, snake) -> GameMove:
+        if not self.moves:
+            self.moves.append(game.get_valid_moves(snake)[0])
+        else:
+            back = {
+                GameMove.UP: GameMove.DOWN,
+                GameMove.DOWN: GameMove.UP,
+                GameMove.LEFT: GameMove.RIGHT,
+                GameMove.RIGHT: GameMove.LEFT,
+            }
+            self.moves.append(back[self.moves[-1]])
+        return self.moves[-1]
+
+
+def test_play_match_ranks_survivors_by_length_at_max_ticks():
+    # Every free cell but the spawns holds food, so each new cell grows a snake.
+    crowded = MatchConfig(
+        {"careful": CarefulPlayer, "pacer": Pacer, "pacer2": Pacer},
+        max_x=10,
+        max_y=10,
+        foods=97,
+        max_ticks=3,
+    )
+    result = play_match(MatchSpec(0, ("pacer", "careful", "pacer2"), seed=5), crowded)
+    assert result.ticks == 3
+    assert result.placements == {"careful": 1, "pacer": 2, "pacer2": 2}
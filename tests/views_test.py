@@ -0,0 +1,163 @@
+import sys
+
+sys.path.append("../snakey")
+import pytest
+from dataclasses import FrozenInstanceError
+from random import Random
+from game_master import GameMaster
+from scheduler import MoveScheduler
+from snake import GameMove, Snake
+from snakey_game import SnakeyGame
+from views import GameSnapshot, GameView, SnakeSnapshot, SnakeView
+
+
+class RecordingPlayer:
+    def __init__(self, id=None):
+        self.id = id
+        self.seen = []
+
+    def move(self, game, snake) -> GameMove:
+        self.seen.append((game, snake))
+        return GameMove.UP
+
+
+class MutatingPlayer(RecordingPlayer):
+    def move(self, game, snake) -> GameMove:
+        game.foods.add((0, 0))
+        return GameMove.UP
+
+
+@pytest.fixture
+def game() -> SnakeyGame:
+    return SnakeyGame(
+        5, 5, snakes=[Snake([(1, 1), (1, 2)]), Snake([(3, 3)])], foods={(4, 4)}
+    )
+
+
+def test_GameView_reflects_game(game: SnakeyGame):
+    view = GameView.of(game)
+    assert (view.max_x, view.max_y) == (5, 5)
+    assert len(view.snakes) == 2
+    assert view.snakes[0].get_head() == (1, 1)
+    assert view.snakes[0].get_positions() == [(1, 1), (1, 2)]
+    assert (4, 4) in view.foods
+    assert set(view.get_empty_spaces()) == set(game.get_empty_spaces())
+    assert set(view.get_valid_moves(view.snakes[1])) == set(GameMove)
+
+
+def test_GameView_is_live_and_zero_copy(game: SnakeyGame):
+    view = GameView.of(game)
+    snake_view = view.view_of(game.snakes[0])
+    game.move_snake(game.snakes[0], GameMove.UP)
+    game.foods.add((0, 4))
+    assert snake_view is view.snakes[0]
+    assert snake_view.get_head() == (2, 1)
+    assert (0, 4) in view.foods
+
+
+def test_GameView_is_read_only(game: SnakeyGame):
+    view = GameView.of(game)
+    with pytest.raises(FrozenInstanceError):
+        view.snakes = ()
+    with pytest.raises(FrozenInstanceError):
+        view.snakes[0].previous_position = (0, 0)
+    with pytest.raises(AttributeError):
+        view.foods.add((0, 0))
+    with pytest.raises(AttributeError):
+        view.snakes[0].positions.append((0, 0))
+    with pytest.raises(TypeError):
+        view.get_empty_spaces()[0] = (0, 0)
+
+
+def test_GameMaster_shares_one_view_per_tick():
+    game_master = GameMaster(SnakeyGame(5, 5))
+    players = [RecordingPlayer(1), RecordingPlayer(2)]
+    game_master.add_player(players[0], Snake([(0, 0)]))
+    game_master.add_player(players[1], Snake([(0, 3)]))
+
+    game_master.tick()
+
+    (view1, snake1), (view2, snake2) = players[0].seen[0], players[1].seen[0]
+    assert isinstance(view1, GameView) and view1 is view2
+    assert isinstance(snake1, SnakeView) and snake1 is view1.snakes[0]
+    assert snake2 is view1.snakes[1]
+
+
+def test_GameMaster_paranoid_mode_deepcopies():
+    game_master = GameMaster(SnakeyGame(5, 5), paranoid=True)
+    player = RecordingPlayer(1)
+    game_master.add_player(player, Snake([(0, 0)]))
+    game_master.add_player(RecordingPlayer(2), Snake([(0, 3)]))
+
+    game_master.tick()
+
+    game, snake = player.seen[0]
+    assert isinstance(game, SnakeyGame) and game is not game_master.game
+    assert isinstance(snake, Snake) and snake is not game_master.players_snakes[1]
+
+
+def test_GameMaster_eliminates_mutating_player():
+    game_master = GameMaster(SnakeyGame(5, 5))
+    game_master.add_player(MutatingPlayer(1), Snake([(0, 0)]))
+    game_master.add_player(RecordingPlayer(2), Snake([(0, 3)]))
+    game_master.add_player(RecordingPlayer(3), Snake([(4, 3)]))
+
+    game_master.tick()
+
+    assert game_master.game.foods == set()
+    assert 1 in game_master.rankings
+
+
+def random_game(seed: int) -> SnakeyGame:
+    rng = Random(seed)
+    game = SnakeyGame(6, 6, foods={(rng.randrange(6), rng.randrange(6))})
+    for _ in range(3):
+        x, y = rng.randrange(6), rng.randrange(6)
+        positions = [(x, y)]
+        for _ in range(rng.randrange(5)):
+            dx, dy = rng.choice([(0, 1), (1, 0), (0, -1), (-1, 0)])
+            x, y = x + dx, y + dy
+            positions.append((x, y))
+        game.add_snake(Snake(positions))
+    return game
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_GameSnapshot_answers_like_the_game(seed):
+    game = random_game(seed)
+    snapshot = GameSnapshot.of(game)
+    assert snapshot.get_valid_move_masks() == game.get_valid_move_masks()
+    assert [snapshot.snakes.index(s) for s in snapshot.get_dead_snakes()] == [
+        game.snakes.index(s) for s in game.get_dead_snakes()
+    ]
+    assert set(snapshot.get_empty_spaces()) == set(game.get_empty_spaces())
+    assert snapshot.nearest_foods((0, 0)) == game.nearest_foods((0, 0))
+    assert snapshot.analysis().heads == game.analysis().heads
+
+
+def test_GameSnapshot_is_frozen(game: SnakeyGame):
+    snapshot = GameSnapshot.of(game)
+    snake = snapshot.view_of(game.snakes[0])
+    game.move_snake(game.snakes[0], GameMove.UP)
+    game.foods.add((0, 4))
+    assert snake.get_head() == (1, 1) and (0, 4) not in snapshot.foods
+    with pytest.raises(FrozenInstanceError):
+        snake.positions = ()
+    with pytest.raises(AttributeError):
+        snapshot.foods.add((0, 0))
+
+
+def test_GameMaster_gives_scheduled_bots_a_snapshot(monkeypatch):
+    scheduler = MoveScheduler(time_limit=1)
+    game_master = GameMaster(SnakeyGame(5, 5), scheduler=scheduler)
+    player = RecordingPlayer(1)
+    game_master.add_player(player, Snake([(0, 0)]))
+    game_master.add_player(RecordingPlayer(2), Snake([(0, 3)]))
+    monkeypatch.setattr("game_master.deepcopy", None)
+
+    game_master.tick()
+    scheduler.close()
+
+    game, snake = player.seen[0]
+    assert isinstance(game, GameSnapshot) and isinstance(snake, SnakeSnapshot)
+    assert snake is game.snakes[0] and snake.get_head() == (0, 0)
@@ -0,0 +1,171 @@
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import combinations, islice
+from random import Random
+import os
+from game_master import GameMaster
+from player import Player
+from snakey_game import SnakeyGame
+from termination import TickLimit
+
+ELO_START = 1500.0
+ELO_K = 32.0
+
+
+@dataclass(frozen=True)
+class MatchSpec:
+    game_id: int
+    entrants: tuple[str, ...]
+    seed: int
+
+
+@dataclass(frozen=True)
+class MatchConfig:
+    factories: dict[str, Callable[[], Player]]
+    max_x: int = 11
+    max_y: int = 11
+    foods: int = 5
+    max_ticks: int = 1000
+
+
+@dataclass
+class MatchResult:
+    game_id: int
+    entrants: tuple[str, ...]
+    placements: dict[str, int]
+    ticks: int
+
+
+@dataclass
+class Standing:
+    name: str
+    games: int = 0
+    wins: int = 0
+    rating: float = ELO_START
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+
+def play_match(spec: MatchSpec, config: MatchConfig) -> MatchResult:
+    game = SnakeyGame(config.max_x, config.max_y, rng=Random(spec.seed))
+    game_master = GameMaster(game)
+    game_master.game.add_food(config.foods)
+    players = {}
+    for i, name in enumerate(spec.entrants):
+        player = config.factories[name]()
+        player.id = i
+        game_master.add_player(player)
+        players[player.id] = name
+    game_master.termination.append(TickLimit(config.max_ticks))
+    game_master.play_game()
+    # Survivors of a match cut off at max_ticks are ordered by length, and
+    # everyone else by when they died; equal keys share a placement.
+    finish = {
+        id: (
+            (0, -game_master.players_snakes[id].get_length())
+            if id not in game_master.rankings
+            else (1, game_master.rankings[id])
+        )
+        for id in players
+    }
+    placements = {
+        players[id]: 1 + sum(other < key for other in finish.values())
+        for id, key in finish.items()
+    }
+    return MatchResult(spec.game_id, spec.entrants, placements, game_master.ticks)
+
+
+def play_matches(specs: list[MatchSpec], config: MatchConfig) -> list[MatchResult]:
+    return [play_match(spec, config) for spec in specs]
+
+
+@dataclass
+class Tournament:
+    config: MatchConfig
+    players_per_game: int = 2
+    seed: int = 0
+    chunk_size: int = 16
+    max_workers: int | None = None
+    standings: dict[str, Standing] = field(default_factory=dict)
+    games_played: int = 0
+
+    def __post_init__(self) -> None:
+        self._rng = Random(self.seed)
+        for name in self.config.factories:
+            self.standings.setdefault(name, Standing(name))
+
+    def _spec(self, entrants: tuple[str, ...]) -> MatchSpec:
+        spec = MatchSpec(self.games_played, entrants, self._rng.getrandbits(32))
+        self.games_played += 1
+        return spec
+
+    def round_robin(self, rounds: int = 1) -> Iterator[MatchSpec]:
+        names = list(self.config.factories)
+        for _ in range(rounds):
+            for entrants in combinations(names, self.players_per_game):
+                yield self._spec(entrants)
+
+    def swiss_round(self) -> list[MatchSpec]:
+        ranked = [standing.name for standing in self.get_standings()]
+        return [
+            self._spec(tuple(ranked[i : i + self.players_per_game]))
+            for i in range(
+                0, len(ranked) - self.players_per_game + 1, self.players_per_game
+            )
+        ]
+
+    def run(
+        self, specs: Iterable[MatchSpec], executor: Executor | None = None
+    ) -> Iterator[MatchResult]:
+        if executor is None:
+            with ProcessPoolExecutor(self.max_workers) as executor:
+                yield from self.run(specs, executor)
+            return
+        specs = iter(specs)
+        chunks = iter(lambda: list(islice(specs, self.chunk_size)), [])
+        in_flight = set()
+        limit = 2 * (self.max_workers or os.cpu_count() or 1)
+        for chunk in chunks:
+            in_flight.add(executor.submit(play_matches, chunk, self.config))
+            if len(in_flight) >= limit:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                yield from self._collect(done)
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            yield from self._collect(done)
+
+    def run_swiss(
+        self, rounds: int, executor: Executor | None = None
+    ) -> Iterator[MatchResult]:
+        for _ in range(rounds):
+            yield from self.run(self.swiss_round(), executor)
+
+    def _collect(self, futures) -> Iterator[MatchResult]:
+        for future in futures:
+            for result in future.result():
+                self.record(result)
+                yield result
+
+    def record(self, result: MatchResult) -> None:
+        entrants = [self.standings[name] for name in result.entrants]
+        expected = {standing.name: 0.0 for standing in entrants}
+        scores = {standing.name: 0.0 for standing in entrants}
+        for a, b in combinations(entrants, 2):
+            place_a, place_b = result.placements[a.name], result.placements[b.name]
+            score = 1.0 if place_a < place_b else 0.5 if place_a == place_b else 0.0
+            odds = 1 / (1 + 10 ** ((b.rating - a.rating) / 400))
+            expected[a.name] += odds
+            expected[b.name] += 1 - odds
+            scores[a.name] += score
+            scores[b.name] += 1 - score
+        k = ELO_K / max(len(entrants) - 1, 1)
+        for standing in entrants:
+            standing.games += 1
+            standing.wins += result.placements[standing.name] == 1
+            standing.rating += k * (scores[standing.name] - expected[standing.name])
+
+    def get_standings(self) -> list[Standing]:
+        return sorted(self.standings.values(), key=lambda s: s.rating, reverse=True)
@@ -0,0 +1,309 @@
+from collections import Counter
+from collections.abc import Iterator, Sequence, Set
+from dataclasses import dataclass, field
+from functools import cached_property
+from itertools import islice
+from food import FoodIndex
+from snake import MOVE_OFFSETS, MOVES, GameMove, Snake
+from snakey_game import SnakeyGame
+from analysis import BoardAnalysis
+
+
+class SequenceView(Sequence):
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Sequence) -> None:
+        self._items = items
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._items)
+
+    def __contains__(self, item) -> bool:
+        return item in self._items
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"SequenceView({list(self._items)!r})"
+
+
+class SetView(Set):
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Set) -> None:
+        self._items = items
+
+    def __contains__(self, item) -> bool:
+        return item in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._items)
+
+    def __repr__(self) -> str:
+        return f"SetView({set(self._items)!r})"
+
+
+@dataclass(frozen=True)
+class SnakeView:
+    _snake: Snake = field(repr=False)
+
+    @property
+    def positions(self) -> SequenceView:
+        return SequenceView(self._snake.positions)
+
+    @property
+    def previous_position(self) -> tuple[int, int] | None:
+        return self._snake.previous_position
+
+    def get_length(self) -> int:
+        return self._snake.get_length()
+
+    def get_head(self) -> tuple[int, int]:
+        return self._snake.get_head()
+
+    def get_positions(self) -> SequenceView:
+        return self.positions
+
+    def occupies(self, position: tuple[int, int]) -> bool:
+        return self._snake.occupies(position)
+
+    def is_valid(self) -> bool:
+        return self._snake.is_valid()
+
+
+@dataclass(frozen=True)
+class GameView:
+    _game: SnakeyGame = field(repr=False)
+    snakes: tuple[SnakeView, ...] = ()
+    _views: dict[int, SnakeView] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def of(cls, game: SnakeyGame) -> "GameView":
+        snakes = tuple(SnakeView(snake) for snake in game.snakes)
+        views = {id(view._snake): view for view in snakes}
+        return cls(game, snakes, views)
+
+    @property
+    def max_x(self) -> int:
+        return self._game.max_x
+
+    @property
+    def max_y(self) -> int:
+        return self._game.max_y
+
+    @property
+    def version(self) -> int:
+        return self._game.version
+
+    @property
+    def foods(self) -> SetView:
+        return SetView(self._game.foods)
+
+    def nearest_foods(
+        self, position: tuple[int, int], k: int = 1
+    ) -> list[tuple[int, int]]:
+        return self._game.nearest_foods(position, k)
+
+    def foods_within(
+        self, position: tuple[int, int], radius: int
+    ) -> list[tuple[int, int]]:
+        return self._game.foods_within(position, radius)
+
+    def analysis(self) -> BoardAnalysis:
+        # Built on first use and describes the live board, like self.snakes:
+        # players that move later in a tick see the earlier moves. Bots run by
+        # a scheduler get a GameSnapshot, whose analysis is shared instead.
+        return self._game.analysis()
+
+    def view_of(self, snake: Snake) -> SnakeView:
+        return self._views.get(id(snake)) or SnakeView(snake)
+
+    def get_empty_spaces(self) -> SequenceView:
+        return SequenceView(self._game.get_empty_spaces())
+
+    def get_dead_snakes(self) -> list[SnakeView]:
+        return [self.view_of(snake) for snake in self._game.get_dead_snakes()]
+
+    def is_valid_state(self) -> bool:
+        return self._game.is_valid_state()
+
+    def get_valid_moves(self, snake: SnakeView) -> list[GameMove]:
+        return self._game.get_valid_moves(snake._snake)
+
+    def get_valid_move_mask(self, snake: SnakeView) -> int:
+        return self._game.get_valid_move_mask(snake._snake)
+
+    def get_valid_move_masks(self) -> list[int]:
+        return self._game.get_valid_move_masks()
+
+
+@dataclass(frozen=True)
+class SnakeSnapshot:
+    positions: tuple[tuple[int, int], ...]
+    previous_position: tuple[int, int] | None = None
+
+    @cached_property
+    def cells(self) -> frozenset[tuple[int, int]]:
+        return frozenset(self.positions)
+
+    def get_length(self) -> int:
+        return len(self.positions)
+
+    def get_head(self) -> tuple[int, int]:
+        return self.positions[0]
+
+    def get_positions(self) -> SequenceView:
+        return SequenceView(self.positions)
+
+    def occupies(self, position: tuple[int, int]) -> bool:
+        return position in self.cells
+
+    def is_valid(self) -> bool:
+        return all(
+            abs(x1 - x2) + abs(y1 - y2) == 1
+            for (x1, y1), (x2, y2) in zip(
+                self.positions, islice(self.positions, 1, None)
+            )
+        )
+
+
+@dataclass(frozen=True)
+class GameSnapshot:
+    # An immutable copy of what bots read, for threads that may outlive the
+    # tick. Copying costs O(body cells); everything else is derived lazily.
+    max_x: int
+    max_y: int
+    snakes: tuple[SnakeSnapshot, ...]
+    foods: frozenset[tuple[int, int]]
+    version: int = 0
+    _views: dict[int, SnakeSnapshot] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def of(cls, game: SnakeyGame) -> "GameSnapshot":
+        snakes, views = [], {}
+        for snake in game.snakes:
+            snapshot = SnakeSnapshot(tuple(snake.positions), snake.previous_position)
+            snakes.append(snapshot)
+            views[id(snake)] = snapshot
+        return cls(
+            game.max_x,
+            game.max_y,
+            tuple(snakes),
+            frozenset(game.foods),
+            game.version,
+            views,
+        )
+
+    def view_of(self, snake) -> SnakeSnapshot:
+        if isinstance(snake, SnakeSnapshot):
+            return snake
+        view = self._views.get(id(snake))
+        if view is None:
+            return SnakeSnapshot(tuple(snake.positions), snake.previous_position)
+        return view
+
+    @cached_property
+    def _owners(self) -> Counter:
+        # How many snakes cover each cell, as OccupancyGrid counts them.
+        owners = Counter()
+        for snake in self.snakes:
+            owners.update(snake.cells)
+        return owners
+
+    @cached_property
+    def _food_index(self) -> FoodIndex:
+        index = FoodIndex()
+        for food in self.foods:
+            index.add(food)
+        return index
+
+    def _inside(self, position: tuple[int, int]) -> bool:
+        return 0 <= position[0] < self.max_x and 0 <= position[1] < self.max_y
+
+    def _is_dead(self, snake: SnakeSnapshot) -> bool:
+        owners = self._owners
+        return (
+            not snake.is_valid()
+            or not all(self._inside(cell) for cell in snake.cells)
+            or any(owners[cell] > 1 for cell in snake.cells)
+        )
+
+    def nearest_foods(
+        self, position: tuple[int, int], k: int = 1
+    ) -> list[tuple[int, int]]:
+        return self._food_index.nearest(position, k)
+
+    def foods_within(
+        self, position: tuple[int, int], radius: int
+    ) -> list[tuple[int, int]]:
+        return self._food_index.within(position, radius)
+
+    @cached_property
+    def _analysis(self) -> BoardAnalysis:
+        return BoardAnalysis.of(self, self.version)
+
+    def analysis(self) -> BoardAnalysis:
+        return self._analysis
+
+    def get_empty_spaces(self) -> SequenceView:
+        owners, foods = self._owners, self.foods
+        return SequenceView(
+            [
+                (x, y)
+                for x in range(self.max_x)
+                for y in range(self.max_y)
+                if (x, y) not in owners and (x, y) not in foods
+            ]
+        )
+
+    def get_dead_snakes(self) -> list[SnakeSnapshot]:
+        return [snake for snake in self.snakes if self._is_dead(snake)]
+
+    def is_valid_state(self) -> bool:
+        return not self.get_dead_snakes()
+
+    def get_valid_moves(self, snake: SnakeSnapshot) -> list[GameMove]:
+        mask = self.get_valid_move_mask(snake)
+        return [move for i, move in enumerate(MOVES) if mask >> i & 1]
+
+    def get_valid_move_masks(self) -> list[int]:
+        return [self.get_valid_move_mask(snake) for snake in self.snakes]
+
+    def get_valid_move_mask(self, snake: SnakeSnapshot) -> int:
+        snake = self.view_of(snake)
+        owners = self._owners
+        x, y = snake.get_head()
+        mask = 0
+        if not self._is_dead(snake):
+            for i, (dx, dy) in enumerate(MOVE_OFFSETS):
+                target = x + dx, y + dy
+                taken = owners[target]
+                if self._inside(target) and (
+                    not taken or (taken == 1 and target in snake.cells)
+                ):
+                    mask |= 1 << i
+            return mask
+        # Mirrors SnakeyGame's scan for snakes that are already colliding.
+        for i, (dx, dy) in enumerate(MOVE_OFFSETS):
+            moved = SnakeSnapshot(((x + dx, y + dy),) + snake.positions[:-1])
+            if (
+                moved.is_valid()
+                and all(self._inside(cell) for cell in moved.cells)
+                and not any(
+                    owners[cell] - (cell in snake.cells) for cell in moved.cells
+                )
+            ):
+                mask |= 1 << i
+        return mask